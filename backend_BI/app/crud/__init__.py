@@ -4,4 +4,9 @@ This package handles all CRUD operations related to 'commande'and 'production.
 - crud_commande: Defines the CRUD operations CommandeModel
 - crud_production: Defines the CRUD operations for ProductionModel
 - crud_common: Defines the CRUD operations that span multiple models
+- crud_kpi: Defines the SQL aggregations backing the KPI endpoints
+- crud_summary: Maintains the summary tables the KPIs are read from
+- crud_timeseries: Defines the day/week/month bucketed aggregations backing the time series endpoints
+- crud_export: Defines the batched table reads backing the Arrow/Parquet exports
+- crud_*_async: Async counterparts of the CRUD modules, for use with an AsyncSession
 """
\ No newline at end of file
@@ -6,12 +6,25 @@ Includes:
 - Reading and filtering Commande records.
 - Updating existing Commande records.
 - Deleting Commande records, with optional cascading behavior.
+
+Deletions are issued as set-based DELETE statements in a single transaction
+rather than loading and deleting each ORM object.
+Every write refreshes the summary groups it touches (see `crud_summary`) before committing.
 """
 
+from sqlalchemy import select, insert, update, delete
 from sqlalchemy.orm import Session
 from app.models.models_production import ProductionModel
 from app.models.model_commande import  CommandeModel
-from app.crud.crud_production  import get_productions_by_commande_id, get_productions_flat_by_commande_id
+from app.utils.pagination import keyset_page, STREAM_BATCH_SIZE
+from app.utils.serialization import model_columns, rows_to_dicts
+from app.utils.cache import invalidate
+from app.utils.filters import CommandeFilters, in_condition, order_by_sort, range_conditions
+from app.crud.crud_summary import COMMANDE_SUMMARY, PRODUCTION_SUMMARY, changes_group, group_key, group_keys, refresh_groups, rebuild
+
+# Cached read responses made stale by the writes of this module
+# (Commande writes also change nested/cascaded productions and the KPIs)
+_CACHED_NAMESPACES = ("commandes", "productions", "kpis")
 
 #----------------------------- CREATE ---------------------------------
 def create_commande(db: Session, commande: CommandeModel):
@@ -24,24 +37,136 @@ def create_commande(db: Session, commande: CommandeModel):
 
     Returns:
         CommandeModel: The created Commande record.
+
+    Raises:
+        Exception: Re-raises any exception encountered after rolling back the transaction.
     """
-    db.add(commande)
-    db.commit()
+    try:
+        db.add(commande)
+        db.flush()
+        refresh_groups(db, COMMANDE_SUMMARY, {group_key(COMMANDE_SUMMARY, commande)})
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise e
+    invalidate(*_CACHED_NAMESPACES)
     db.refresh(commande)
     return commande
 
+def bulk_upsert_commandes(db: Session, commandes: list[dict]):
+    """
+    Insert or update many Commande records in a single transaction.
+
+    Records without `id_commande` are inserted, the others update the existing row with that ID.
+    Both sets are sent as executemany batches rather than one statement per ORM object.
+
+    Args:
+        db (Session): Database session.
+        commandes (list[dict]): Commande fields keyed by model attribute name.
+
+    Returns:
+        dict: Number of `created` and `updated` records.
+
+    Raises:
+        Exception: Re-raises any exception encountered after rolling back the transaction.
+
+    Note:
+        ID existence validation should be done before calling this method.
+    """
+    to_insert = [{k: v for k, v in cmd.items() if k != "id_commande"} for cmd in commandes if cmd.get("id_commande") is None]
+    to_update = [cmd for cmd in commandes if cmd.get("id_commande") is not None]
+    groups = {group_key(COMMANDE_SUMMARY, cmd) for cmd in to_insert + to_update}
+    try:
+        if to_update:
+            updated_ids = CommandeModel.id_commande.in_({cmd["id_commande"] for cmd in to_update})
+            groups |= group_keys(db, COMMANDE_SUMMARY, updated_ids)
+        if to_insert:
+            db.execute(insert(CommandeModel), to_insert)
+        if to_update:
+            db.execute(update(CommandeModel), to_update)
+        refresh_groups(db, COMMANDE_SUMMARY, groups)
+        db.commit()
+        invalidate(*_CACHED_NAMESPACES)
+    except Exception as e:
+        db.rollback()
+        raise e
+    return {"created": len(to_insert), "updated": len(to_update)}
+
 #----------------------------- READ ---------------------------------
-def get_all_commandes(db: Session):
+def filter_commandes(query, filters: CommandeFilters | None):
     """
-    Retrieve all Commande records.
+    Apply the list filters and sort order to a Commande query, in SQL.
+
+    Works with both legacy `Query` objects (sync CRUD) and `select()` statements (async CRUD).
+
+    Args:
+        query (Query | Select): Query selecting Commande records or columns.
+        filters (CommandeFilters | None): The filters, the query is returned unchanged if None.
+
+    Returns:
+        Query | Select: The filtered and ordered query.
+    """
+    if filters is None:
+        return query
+    conditions = [
+        *range_conditions(CommandeModel.date_commande, filters.date_from, filters.date_to),
+        *range_conditions(CommandeModel.quantite, filters.quantite_min, filters.quantite_max),
+        *in_condition(CommandeModel.statut, filters.statut),
+        *in_condition(CommandeModel.produit_commande, filters.produit),
+        *in_condition(CommandeModel.client, filters.client),
+    ]
+    if conditions:
+        query = query.filter(*conditions)
+    return order_by_sort(query, CommandeModel, filters.sort)
+
+def get_all_commandes(db: Session, limit: int | None = None, after: int | None = None, filters: CommandeFilters | None = None):
+    """
+    Retrieve Commande records ordered by ID, optionally restricted to a keyset page.
 
     Args:
         db (Session): Database session.
+        limit (int | None): Maximum number of records, all records if None.
+        after (int | None): Only return records whose ID is greater than this cursor.
+        filters (CommandeFilters | None): Optional WHERE / ORDER BY parameters (see `filter_commandes`).
 
     Returns:
-        List[CommandeModel]: All Commande records.
+        List[CommandeModel]: The requested Commande records.
     """
-    return db.query(CommandeModel).all()
+    return keyset_page(filter_commandes(db.query(CommandeModel), filters), CommandeModel.id_commande, limit, after).all()
+
+def get_all_commandes_rows(db: Session, limit: int | None = None, after: int | None = None, filters: CommandeFilters | None = None):
+    """
+    Fast path: retrieve Commande records as plain dictionaries, ordered by ID.
+
+    Only the columns are selected, no ORM entity is built.
+
+    Args:
+        db (Session): Database session.
+        limit (int | None): Maximum number of records, all records if None.
+        after (int | None): Only return records whose ID is greater than this cursor.
+        filters (CommandeFilters | None): Optional WHERE / ORDER BY parameters (see `filter_commandes`).
+
+    Returns:
+        List[dict]: The requested Commande records, keyed by attribute name.
+    """
+    query = filter_commandes(db.query(*model_columns(CommandeModel)), filters)
+    return rows_to_dicts(keyset_page(query, CommandeModel.id_commande, limit, after))
+
+def stream_commandes(db: Session, limit: int | None = None, after: int | None = None, filters: CommandeFilters | None = None):
+    """
+    Iterate over Commande records through a server-side cursor.
+
+    Args:
+        db (Session): Database session, must stay open while iterating.
+        limit (int | None): Maximum number of records, all records if None.
+        after (int | None): Only return records whose ID is greater than this cursor.
+        filters (CommandeFilters | None): Optional WHERE / ORDER BY parameters (see `filter_commandes`).
+
+    Returns:
+        Iterable[CommandeModel]: Commande records fetched in batches.
+    """
+    query = filter_commandes(db.query(CommandeModel), filters)
+    return keyset_page(query, CommandeModel.id_commande, limit, after).yield_per(STREAM_BATCH_SIZE)
 
 def get_commande_by_id(db: Session, commande_id: int):
     """
@@ -56,6 +181,22 @@ def get_commande_by_id(db: Session, commande_id: int):
     """
     return db.query(CommandeModel).filter(CommandeModel.id_commande == commande_id).first()
 
+def get_existing_commande_ids(db: Session, commande_ids: list[int]):
+    """
+    Find which of the given Commande IDs exist, in a single IN query.
+
+    Args:
+        db (Session): Database session.
+        commande_ids (list[int]): Commande IDs to check.
+
+    Returns:
+        set[int]: The IDs that match an existing Commande record.
+    """
+    if not commande_ids:
+        return set()
+    rows = db.query(CommandeModel.id_commande).filter(CommandeModel.id_commande.in_(set(commande_ids))).all()
+    return {row.id_commande for row in rows}
+
 def get_commandes_without_production(db: Session):
     """
     Fetch all Commande records that have no associated Production.
@@ -66,7 +207,6 @@ def get_commandes_without_production(db: Session):
     Returns:
         List[CommandeModel]: Commandes with no production records.
     """
-    print("hello")
     return (
         db.query(CommandeModel)
         .outerjoin(ProductionModel, CommandeModel.id_commande == ProductionModel.id_commande)
@@ -75,47 +215,87 @@ def get_commandes_without_production(db: Session):
     )
 
 #----------------------------- UPDATE ---------------------------------
-def update_commande(db: Session, commande: CommandeModel, updates: dict):
+def update_commande(db: Session, commande_id: int, updates: dict):
     """
-    Update an existing Commande record with new values.
+    Update a Commande record with a single `UPDATE ... RETURNING` statement.
+
+    The previous summary group is only read when the update changes a group column.
 
     Args:
         db (Session): Database session.
-        commande (CommandeModel): The existing record to update.
+        commande_id (int): ID of the Commande to update.
         updates (dict): Dictionary of updated field values.
 
     Returns:
-        CommandeModel: The updated record.
-    
-    Note:
-        Record existence should be verified before calling this method.
+        dict | None: The updated Commande keyed by attribute name, or None if no Commande has this ID.
+
+    Raises:
+        Exception: Re-raises any exception encountered after rolling back the transaction.
     """
-    for key, value in updates.items():
-        setattr(commande, key, value)
-    db.commit()
-    db.refresh(commande)
+    by_id = CommandeModel.id_commande == commande_id
+    if not updates:
+        record = db.execute(select(*model_columns(CommandeModel)).where(by_id)).first()
+        return record._asdict() if record is not None else None
+    try:
+        groups = group_keys(db, COMMANDE_SUMMARY, by_id) if changes_group(COMMANDE_SUMMARY, updates) else set()
+        record = db.execute(
+            update(CommandeModel).where(by_id).values(**updates).returning(*model_columns(CommandeModel)),
+            execution_options={"synchronize_session": False},
+        ).first()
+        if record is None:
+            db.rollback()
+            return None
+        commande = record._asdict()
+        groups.add(group_key(COMMANDE_SUMMARY, commande))
+        refresh_groups(db, COMMANDE_SUMMARY, groups)
+        db.commit()
+        invalidate(*_CACHED_NAMESPACES)
+    except Exception as e:
+        db.rollback()
+        raise e
     return commande
 
 #----------------------------- DELETE ---------------------------------
-def delete_commande(db: Session, commande: CommandeModel):
+def delete_commande(db: Session, commande_id: int):
     """
     Delete a Commande and all related Production records.
 
+    Both deletions are `DELETE ... RETURNING` statements: the returned group columns give the
+    summary groups to refresh, no prior SELECT is needed.
+
     Args:
         db (Session): Database session.
-        commande (CommandeModel): The Commande to delete.
-    """
+        commande_id (int): ID of the Commande to delete.
 
-    # Retrieve all related productions via helper method
-    related_productions= get_productions_by_commande_id(db, commande.id_commande)
-    
-    # Delete each production explicitly
-    for prod in related_productions:
-        db.delete(prod)
+    Returns:
+        dict | None: Number of deleted rows per table (`commandes`, `productions`),
+        or None if no Commande has this ID.
 
-    # Then delete the commande itself
-    db.delete(commande)
-    db.commit()
+    Raises:
+        Exception: Re-raises any exception encountered after rolling back the transaction.
+    """
+    production_groups = [source for _, source in PRODUCTION_SUMMARY.groups]
+    commande_groups = [source for _, source in COMMANDE_SUMMARY.groups]
+    try:
+        deleted_productions = db.execute(
+            delete(ProductionModel).where(ProductionModel.id_commande == commande_id).returning(*production_groups),
+            execution_options={"synchronize_session": False},
+        ).all()
+        deleted_commandes = db.execute(
+            delete(CommandeModel).where(CommandeModel.id_commande == commande_id).returning(*commande_groups),
+            execution_options={"synchronize_session": False},
+        ).all()
+        if not deleted_commandes:
+            db.rollback()
+            return None
+        refresh_groups(db, PRODUCTION_SUMMARY, {tuple(row) for row in deleted_productions})
+        refresh_groups(db, COMMANDE_SUMMARY, {tuple(row) for row in deleted_commandes})
+        db.commit()
+        invalidate(*_CACHED_NAMESPACES)
+    except Exception as e:
+        db.rollback()
+        raise e
+    return {"commandes": len(deleted_commandes), "productions": len(deleted_productions)}
 
 def delete_commandes_without_production(db: Session):
     """
@@ -123,11 +303,30 @@ def delete_commandes_without_production(db: Session):
 
     Args:
         db (Session): Database session.
+
+    Returns:
+        dict: Number of deleted rows per table (`commandes`, `productions`).
+
+    Raises:
+        Exception: Re-raises any exception encountered after rolling back the transaction.
     """
-    commande_without_production= get_commandes_without_production(db)
-    for cmd_without_prod in commande_without_production:
-        db.delete(cmd_without_prod)
-    db.commit()
+    # IDs of commandes referenced by at least one production (NULL FKs excluded to keep NOT IN meaningful)
+    referenced_ids = select(ProductionModel.id_commande).where(ProductionModel.id_commande.is_not(None))
+    unreferenced = CommandeModel.id_commande.not_in(referenced_ids)
+    try:
+        groups = group_keys(db, COMMANDE_SUMMARY, unreferenced)
+        deleted_commandes = (
+            db.query(CommandeModel)
+            .filter(unreferenced)
+            .delete(synchronize_session=False)
+        )
+        refresh_groups(db, COMMANDE_SUMMARY, groups)
+        db.commit()
+        invalidate(*_CACHED_NAMESPACES)
+    except Exception as e:
+        db.rollback()
+        raise e
+    return {"commandes": deleted_commandes, "productions": 0}
 
 def delete_all_commandes(db: Session):
     """
@@ -135,14 +334,25 @@ def delete_all_commandes(db: Session):
 
     Args:
         db (Session): Database session.
-    """
-    all_commandes= get_all_commandes(db)
 
-    for cmd in all_commandes:
-        related_productions= get_productions_flat_by_commande_id(db, cmd.id_commande)
+    Returns:
+        dict: Number of deleted rows per table (`commandes`, `productions`).
 
-        for prod in related_productions:
-            db.delete(prod)
-            
-        db.delete(cmd) 
-    db.commit()
\ No newline at end of file
+    Raises:
+        Exception: Re-raises any exception encountered after rolling back the transaction.
+    """
+    try:
+        deleted_productions = (
+            db.query(ProductionModel)
+            .filter(ProductionModel.id_commande.in_(select(CommandeModel.id_commande)))
+            .delete(synchronize_session=False)
+        )
+        deleted_commandes = db.query(CommandeModel).delete(synchronize_session=False)
+        rebuild(db, PRODUCTION_SUMMARY)
+        rebuild(db, COMMANDE_SUMMARY)
+        db.commit()
+        invalidate(*_CACHED_NAMESPACES)
+    except Exception as e:
+        db.rollback()
+        raise e
+    return {"commandes": deleted_commandes, "productions": deleted_productions}
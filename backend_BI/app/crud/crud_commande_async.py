@@ -0,0 +1,233 @@
+"""
+Async CRUD operations related to Commande records.
+
+Mirrors `crud_commande` for `AsyncSession` (see `database.async_database.get_async_db`).
+
+Includes:
+- Creating new Commande records.
+- Reading and filtering Commande records.
+- Updating existing Commande records.
+- Deleting Commande records, with their related Production records.
+"""
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models_production import ProductionModel
+from app.models.model_commande import CommandeModel
+from app.utils.pagination import keyset_page
+from app.utils.serialization import model_columns
+from app.utils.cache import invalidate
+from app.utils.filters import CommandeFilters
+from app.crud.crud_commande import filter_commandes
+from app.crud.crud_summary import COMMANDE_SUMMARY, PRODUCTION_SUMMARY, changes_group, group_key, group_keys, refresh_groups, rebuild
+
+# Cached read responses made stale by the writes of this module
+# (Commande writes also change nested/cascaded productions and the KPIs)
+_CACHED_NAMESPACES = ("commandes", "productions", "kpis")
+
+#----------------------------- CREATE ---------------------------------
+async def create_commande(db: AsyncSession, commande: CommandeModel):
+    """
+    Create a new Commande record in the database.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+        commande (CommandeModel): The Commande instance to persist.
+
+    Returns:
+        CommandeModel: The created Commande record.
+    """
+    try:
+        db.add(commande)
+        await db.flush()
+        await db.run_sync(refresh_groups, COMMANDE_SUMMARY, {group_key(COMMANDE_SUMMARY, commande)})
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise e
+    invalidate(*_CACHED_NAMESPACES)
+    await db.refresh(commande)
+    return commande
+
+#----------------------------- READ ---------------------------------
+async def get_all_commandes(db: AsyncSession, limit: int | None = None, after: int | None = None, filters: CommandeFilters | None = None):
+    """
+    Retrieve Commande records ordered by ID, optionally restricted to a keyset page.
+
+    Args:
+        db (AsyncSession): Async database session.
+        limit (int | None): Maximum number of records, all records if None.
+        after (int | None): Only return records whose ID is greater than this cursor.
+        filters (CommandeFilters | None): Optional WHERE / ORDER BY parameters (see `crud_commande.filter_commandes`).
+
+    Returns:
+        List[CommandeModel]: The requested Commande records.
+    """
+    query = filter_commandes(select(CommandeModel), filters)
+    result = await db.scalars(keyset_page(query, CommandeModel.id_commande, limit, after))
+    return result.all()
+
+async def get_commande_by_id(db: AsyncSession, commande_id: int):
+    """
+    Retrieve a single Commande by its ID.
+
+    Args:
+        db (AsyncSession): Async database session.
+        commande_id (int): Commande ID.
+
+    Returns:
+        CommandeModel | None: Found record or None if not found.
+    """
+    return await db.get(CommandeModel, commande_id)
+
+async def get_commandes_without_production(db: AsyncSession):
+    """
+    Fetch all Commande records that have no associated Production.
+
+    Args:
+        db (AsyncSession): Async database session.
+
+    Returns:
+        List[CommandeModel]: Commandes with no production records.
+    """
+    result = await db.scalars(
+        select(CommandeModel)
+        .outerjoin(ProductionModel, CommandeModel.id_commande == ProductionModel.id_commande)
+        .where(ProductionModel.id_commande.is_(None)) # No matching production
+    )
+    return result.all()
+
+#----------------------------- UPDATE ---------------------------------
+async def update_commande(db: AsyncSession, commande_id: int, updates: dict):
+    """
+    Update a Commande record with a single `UPDATE ... RETURNING` statement.
+
+    Args:
+        db (AsyncSession): Async database session.
+        commande_id (int): ID of the Commande to update.
+        updates (dict): Dictionary of updated field values.
+
+    Returns:
+        dict | None: The updated Commande keyed by attribute name, or None if no Commande has this ID.
+
+    Raises:
+        Exception: Re-raises any exception encountered after rolling back the transaction.
+    """
+    by_id = CommandeModel.id_commande == commande_id
+    if not updates:
+        record = (await db.execute(select(*model_columns(CommandeModel)).where(by_id))).first()
+        return record._asdict() if record is not None else None
+    try:
+        groups = await db.run_sync(group_keys, COMMANDE_SUMMARY, by_id) if changes_group(COMMANDE_SUMMARY, updates) else set()
+        record = (await db.execute(
+            update(CommandeModel).where(by_id).values(**updates).returning(*model_columns(CommandeModel)),
+            execution_options={"synchronize_session": False},
+        )).first()
+        if record is None:
+            await db.rollback()
+            return None
+        commande = record._asdict()
+        groups.add(group_key(COMMANDE_SUMMARY, commande))
+        await db.run_sync(refresh_groups, COMMANDE_SUMMARY, groups)
+        await db.commit()
+        invalidate(*_CACHED_NAMESPACES)
+    except Exception as e:
+        await db.rollback()
+        raise e
+    return commande
+
+#----------------------------- DELETE ---------------------------------
+async def delete_commande(db: AsyncSession, commande_id: int):
+    """
+    Delete a Commande and all related Production records, with `DELETE ... RETURNING` statements.
+
+    Args:
+        db (AsyncSession): Async database session.
+        commande_id (int): ID of the Commande to delete.
+
+    Returns:
+        dict | None: Number of deleted rows per table (`commandes`, `productions`),
+        or None if no Commande has this ID.
+
+    Raises:
+        Exception: Re-raises any exception encountered after rolling back the transaction.
+    """
+    production_groups = [source for _, source in PRODUCTION_SUMMARY.groups]
+    commande_groups = [source for _, source in COMMANDE_SUMMARY.groups]
+    try:
+        deleted_productions = (await db.execute(
+            delete(ProductionModel).where(ProductionModel.id_commande == commande_id).returning(*production_groups),
+            execution_options={"synchronize_session": False},
+        )).all()
+        deleted_commandes = (await db.execute(
+            delete(CommandeModel).where(CommandeModel.id_commande == commande_id).returning(*commande_groups),
+            execution_options={"synchronize_session": False},
+        )).all()
+        if not deleted_commandes:
+            await db.rollback()
+            return None
+        await db.run_sync(refresh_groups, PRODUCTION_SUMMARY, {tuple(row) for row in deleted_productions})
+        await db.run_sync(refresh_groups, COMMANDE_SUMMARY, {tuple(row) for row in deleted_commandes})
+        await db.commit()
+        invalidate(*_CACHED_NAMESPACES)
+    except Exception as e:
+        await db.rollback()
+        raise e
+    return {"commandes": len(deleted_commandes), "productions": len(deleted_productions)}
+
+async def delete_commandes_without_production(db: AsyncSession):
+    """
+    Delete all Commande records that do not have associated Production records.
+
+    Args:
+        db (AsyncSession): Async database session.
+
+    Returns:
+        dict: Number of deleted rows per table (`commandes`, `productions`).
+
+    Raises:
+        Exception: Re-raises any exception encountered after rolling back the transaction.
+    """
+    referenced_ids = select(ProductionModel.id_commande).where(ProductionModel.id_commande.is_not(None))
+    unreferenced = CommandeModel.id_commande.not_in(referenced_ids)
+    try:
+        groups = await db.run_sync(group_keys, COMMANDE_SUMMARY, unreferenced)
+        deleted_commandes = await db.execute(
+            delete(CommandeModel).where(unreferenced),
+            execution_options={"synchronize_session": False},
+        )
+        await db.run_sync(refresh_groups, COMMANDE_SUMMARY, groups)
+        await db.commit()
+        invalidate(*_CACHED_NAMESPACES)
+    except Exception as e:
+        await db.rollback()
+        raise e
+    return {"commandes": deleted_commandes.rowcount, "productions": 0}
+
+async def delete_all_commandes(db: AsyncSession):
+    """
+    Delete all Commande records and their associated Productions.
+
+    Args:
+        db (AsyncSession): Async database session.
+
+    Returns:
+        dict: Number of deleted rows per table (`commandes`, `productions`).
+
+    Raises:
+        Exception: Re-raises any exception encountered after rolling back the transaction.
+    """
+    try:
+        deleted_productions = await db.execute(
+            delete(ProductionModel).where(ProductionModel.id_commande.in_(select(CommandeModel.id_commande))),
+            execution_options={"synchronize_session": False},
+        )
+        deleted_commandes = await db.execute(delete(CommandeModel), execution_options={"synchronize_session": False})
+        await db.run_sync(rebuild, PRODUCTION_SUMMARY)
+        await db.run_sync(rebuild, COMMANDE_SUMMARY)
+        await db.commit()
+        invalidate(*_CACHED_NAMESPACES)
+    except Exception as e:
+        await db.rollback()
+        raise e
+    return {"commandes": deleted_commandes.rowcount, "productions": deleted_productions.rowcount}
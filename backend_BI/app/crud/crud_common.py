@@ -10,6 +10,8 @@ from app.models.models_production import ProductionModel
 from app.models.model_commande import  CommandeModel
 from app.models.model_equipe import ÉquipeModel
 from app.models.model_stock import StockModel
+from app.utils.cache import clear_cache
+from app.crud.crud_summary import SUMMARIES, rebuild
 
 def delete_all(db: Session):
     """
@@ -34,7 +36,10 @@ def delete_all(db: Session):
         db.query(CommandeModel).delete()
         db.query(ÉquipeModel).delete()
         db.query(StockModel).delete()
+        for spec in SUMMARIES:
+            rebuild(db, spec)
         db.commit()
+        clear_cache()
     except Exception as e:
         db.rollback() # undoes all changes above
         raise e
\ No newline at end of file
@@ -1,18 +1,51 @@
 from sqlalchemy.orm import Session
 from app.models.model_equipe import ÉquipeModel
+from app.utils.pagination import keyset_page, STREAM_BATCH_SIZE
+from app.utils.serialization import model_columns, rows_to_dicts
 
 #----------------------------- READ ---------------------------------
-def get_all_equipes(db: Session):
+def get_all_equipes(db: Session, limit: int | None = None, after: int | None = None):
     """
-    Retrieve all Equipe records.
+    Retrieve Equipe records ordered by ID, optionally restricted to a keyset page.
 
     Args:
         db (Session): Database session.
+        limit (int | None): Maximum number of records, all records if None.
+        after (int | None): Only return records whose ID is greater than this cursor.
 
     Returns:
-        List[EquipeModel]: All Equipe records.
+        List[EquipeModel]: The requested Equipe records.
     """
-    return db.query(ÉquipeModel).all()
+    return keyset_page(db.query(ÉquipeModel), ÉquipeModel.ID_Équipe, limit, after).all()
+
+def get_all_equipes_rows(db: Session, limit: int | None = None, after: int | None = None):
+    """
+    Fast path: retrieve Equipe records as plain dictionaries, ordered by ID.
+
+    Args:
+        db (Session): Database session.
+        limit (int | None): Maximum number of records, all records if None.
+        after (int | None): Only return records whose ID is greater than this cursor.
+
+    Returns:
+        List[dict]: The requested Equipe records, keyed by attribute name.
+    """
+    query = db.query(*model_columns(ÉquipeModel))
+    return rows_to_dicts(keyset_page(query, ÉquipeModel.ID_Équipe, limit, after))
+
+def stream_equipes(db: Session, limit: int | None = None, after: int | None = None):
+    """
+    Iterate over Equipe records through a server-side cursor.
+
+    Args:
+        db (Session): Database session, must stay open while iterating.
+        limit (int | None): Maximum number of records, all records if None.
+        after (int | None): Only return records whose ID is greater than this cursor.
+
+    Returns:
+        Iterable[EquipeModel]: Equipe records fetched in batches.
+    """
+    return keyset_page(db.query(ÉquipeModel), ÉquipeModel.ID_Équipe, limit, after).yield_per(STREAM_BATCH_SIZE)
 
 def get_equipe_by_id(db: Session, equipe_id: int):
     """
@@ -0,0 +1,38 @@
+"""
+Async read operations related to Equipe records.
+
+Mirrors `crud_equipe` for `AsyncSession` (see `database.async_database.get_async_db`).
+"""
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.model_equipe import ÉquipeModel
+from app.utils.pagination import keyset_page
+
+#----------------------------- READ ---------------------------------
+async def get_all_equipes(db: AsyncSession, limit: int | None = None, after: int | None = None):
+    """
+    Retrieve Equipe records ordered by ID, optionally restricted to a keyset page.
+
+    Args:
+        db (AsyncSession): Async database session.
+        limit (int | None): Maximum number of records, all records if None.
+        after (int | None): Only return records whose ID is greater than this cursor.
+
+    Returns:
+        List[EquipeModel]: The requested Equipe records.
+    """
+    result = await db.scalars(keyset_page(select(ÉquipeModel), ÉquipeModel.ID_Équipe, limit, after))
+    return result.all()
+
+async def get_equipe_by_id(db: AsyncSession, equipe_id: int):
+    """
+    Retrieve a single Equipe by its ID.
+
+    Args:
+        db (AsyncSession): Async database session.
+        equipe_id (int): Equipe ID.
+
+    Returns:
+        EquipeModel | None: Found record or None if not found.
+    """
+    return await db.get(ÉquipeModel, equipe_id)
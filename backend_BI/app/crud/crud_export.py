@@ -0,0 +1,62 @@
+"""
+Read operations backing the columnar export endpoints.
+
+Rows are selected as plain column tuples straight from the tables (no ORM entity)
+and fetched from a server-side cursor in fixed-size partitions, so an export never
+holds more than one batch in memory.
+"""
+
+from datetime import date
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.models_production import ProductionModel
+from app.models.model_commande import CommandeModel
+from app.models.model_stock import StockModel
+from app.models.model_equipe import ÉquipeModel
+
+# Exportable tables: name used in the URL -> (ORM model, date column used by the date range filter)
+EXPORT_TABLES = {
+    "production": (ProductionModel, ProductionModel.date_production),
+    "commande": (CommandeModel, CommandeModel.date_commande),
+    "stock": (StockModel, StockModel.Mise_à_Jour),
+    "equipe": (ÉquipeModel, None),
+}
+
+#----------------------------- READ ---------------------------------
+def get_export_columns(table: str):
+    """
+    List the table columns of an exportable table, in declaration order.
+
+    Args:
+        table (str): Name of the exportable table (key of `EXPORT_TABLES`).
+
+    Returns:
+        List[Column]: The table columns, named as in the database.
+    """
+    model, _ = EXPORT_TABLES[table]
+    return list(model.__table__.columns)
+
+def iter_export_batches(db: Session, table: str, date_from: date | None = None, date_to: date | None = None, batch_size: int = 10_000):
+    """
+    Iterate over the rows of an exportable table in batches, ordered by primary key.
+
+    Args:
+        db (Session): Database session, must stay open while iterating.
+        table (str): Name of the exportable table (key of `EXPORT_TABLES`).
+        date_from (date | None): Keep rows dated on or after this day.
+        date_to (date | None): Keep rows dated on or before this day.
+        batch_size (int): Number of rows fetched per round trip.
+
+    Returns:
+        Iterable[List[Row]]: Lists of at most `batch_size` column tuples.
+
+    Note:
+        Date filters must only be given for tables that have a date column (see `EXPORT_TABLES`).
+    """
+    model, date_column = EXPORT_TABLES[table]
+    query = select(*get_export_columns(table)).order_by(*model.__table__.primary_key.columns)
+    if date_from is not None:
+        query = query.where(date_column >= date_from)
+    if date_to is not None:
+        query = query.where(date_column <= date_to)
+    return db.execute(query.execution_options(yield_per=batch_size)).partitions()
@@ -0,0 +1,245 @@
+"""
+KPI aggregation queries computed directly in the database.
+
+Includes:
+- Global production totals and averages.
+- Production record counts per status.
+- Per-product quantity, cost, revenue and gain.
+- Per-client and status commande counts and quantities.
+- Per-location and material stock counts and quantities.
+- Team heatmaps (availability, work hours, staff) pivoted as team x day matrices.
+
+The KPIs are read from the summary tables (see `crud_summary`), which hold one row per
+group (product/status, client/status, location/material) kept up to date by the writes,
+so each query reads O(groups) rows instead of scanning the Production and Commande tables.
+The team heatmaps read five columns of the (small) Équipe table (ID, name, availability, hours,
+staff) and pivot them in a single pass.
+"""
+
+import math
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.models_production import ProductionModel
+from app.models.model_summary import ProductionSummaryModel, CommandeSummaryModel, StockSummaryModel
+from app.models.model_equipe import ÉquipeModel
+
+# Score of each team availability on the availability heatmap (other values count as 0)
+AVAILABILITY_SCORES = {"Occupée": 0, "Partielle": 1, "Disponible": 2}
+
+# Maximum number of buckets in the legend of the work hours and staff heatmaps
+HEATMAP_LEGEND_BUCKETS = 10
+
+# Revenue of a production record: unit price times produced quantity (NULLs count as 0)
+revenue = func.coalesce(ProductionModel.prix_unitaire, 0) * func.coalesce(ProductionModel.quantite, 0)
+
+#----------------------------- READ ---------------------------------
+def get_production_summary(db: Session):
+    """
+    Compute the global production totals and averages.
+
+    Args:
+        db (Session): Database session.
+
+    Returns:
+        dict: Totals (count, quantity, cost, revenue, time), unit averages and the most produced product.
+    """
+    summary = ProductionSummaryModel
+    totals = db.query(
+        func.coalesce(func.sum(summary.count), 0).label("prod_count"),
+        func.coalesce(func.sum(summary.quantite), 0).label("total_quantite"),
+        func.coalesce(func.sum(summary.cout), 0).label("total_cout"),
+        func.coalesce(func.sum(summary.revenu), 0).label("total_revenu"),
+        func.coalesce(func.sum(summary.temps), 0).label("total_temps"),
+        func.coalesce(func.sum(summary.prix_total), 0).label("prix_total"),
+        func.coalesce(func.sum(summary.prix_count), 0).label("prix_count"),
+    ).one()
+
+    total_quantite = totals.total_quantite
+    most_produced = (
+        db.query(summary.produit)
+        .group_by(summary.produit)
+        .order_by(func.sum(summary.quantite).desc())
+        .limit(1)
+        .scalar()
+    )
+
+    return {
+        "prod_count": totals.prod_count,
+        "total_quantite": total_quantite,
+        "total_cout": totals.total_cout,
+        "total_revenu": totals.total_revenu,
+        "total_temps": totals.total_temps,
+        "prix_unitaire_moyen": totals.prix_total / totals.prix_count if totals.prix_count else 0,
+        "temps_moyen_par_unite": totals.total_temps / total_quantite if total_quantite else 0,
+        "cout_moyen_par_unite": totals.total_cout / total_quantite if total_quantite else 0,
+        "produit_plus_produit": most_produced,
+    }
+
+def get_production_status_counts(db: Session):
+    """
+    Count production records per status.
+
+    Args:
+        db (Session): Database session.
+
+    Returns:
+        List[Row]: One row per status with `statut` and `count`.
+    """
+    summary = ProductionSummaryModel
+    return (
+        db.query(
+            summary.statut.label("statut"),
+            func.sum(summary.count).label("count"),
+        )
+        .group_by(summary.statut)
+        .order_by(summary.statut)
+        .all()
+    )
+
+def get_production_totals_per_product(db: Session):
+    """
+    Aggregate quantity, cost, revenue and gain for each produced product.
+
+    Args:
+        db (Session): Database session.
+
+    Returns:
+        List[Row]: One row per product with `produit`, `quantite`, `cout`, `revenu` and `gain`.
+    """
+    summary = ProductionSummaryModel
+    total_cout = func.sum(summary.cout)
+    total_revenu = func.sum(summary.revenu)
+    return (
+        db.query(
+            summary.produit.label("produit"),
+            func.sum(summary.quantite).label("quantite"),
+            total_cout.label("cout"),
+            total_revenu.label("revenu"),
+            (total_revenu - total_cout).label("gain"),
+        )
+        .group_by(summary.produit)
+        .order_by(summary.produit)
+        .all()
+    )
+
+def get_commande_totals_per_client(db: Session):
+    """
+    Count commandes and sum the ordered quantities for each client and status.
+
+    Args:
+        db (Session): Database session.
+
+    Returns:
+        List[CommandeSummaryModel]: One row per client and status with `client`, `statut`, `count` and `quantite`.
+    """
+    return (
+        db.query(CommandeSummaryModel)
+        .order_by(CommandeSummaryModel.client, CommandeSummaryModel.statut)
+        .all()
+    )
+
+def get_stock_totals_per_location(db: Session):
+    """
+    Count stock records and sum the available quantities for each storage location and material type.
+
+    Args:
+        db (Session): Database session.
+
+    Returns:
+        List[StockSummaryModel]: One row per location and material with `lieu_stockage`, `type_matiere`,
+        `count` and `quantite_disponible`.
+    """
+    return (
+        db.query(StockSummaryModel)
+        .order_by(StockSummaryModel.lieu_stockage, StockSummaryModel.type_matiere)
+        .all()
+    )
+
+#----------------------------- HEATMAPS ---------------------------------
+def rounded_range(min_value: int, max_value: int) -> tuple[int, int, int]:
+    """
+    Round a value range outwards to a step chosen from its width, for the color scale of a heatmap.
+
+    The step is 5 below a width of 50, 10 below 200, 50 below 1000 and 100 above.
+
+    Returns:
+        tuple[int, int, int]: (rounded min, rounded max, step).
+    """
+    width = max_value - min_value
+    if width < 50:
+        step = 5
+    elif width < 200:
+        step = 10
+    elif width < 1000:
+        step = 50
+    else:
+        step = 100
+    return math.floor(min_value / step) * step, math.ceil(max_value / step) * step, step
+
+def _legend_buckets(range_min: int, range_max: int, step: int) -> list[dict]:
+    # Buckets aligned on the step, merged so there are at most HEATMAP_LEGEND_BUCKETS of them
+    width = step * max(1, math.ceil((range_max - range_min) / step / HEATMAP_LEGEND_BUCKETS))
+    buckets = []
+    lower = range_min
+    while lower < range_max:
+        upper = min(lower + width, range_max)
+        buckets.append({"label": f"{lower}–{upper}", "lower": lower, "upper": upper})
+        lower = upper
+    return buckets or [{"label": str(range_min), "lower": range_min, "upper": range_max}]
+
+def _matrix(values: list[list], discrete: bool) -> dict:
+    present = [value for row in values for value in row if value is not None]
+    min_value, max_value = (min(present), max(present)) if present else (None, None)
+    if discrete:
+        scores = sorted(AVAILABILITY_SCORES.items(), key=lambda item: item[1])
+        range_min, range_max = scores[0][1], scores[-1][1]
+        legend = [{"label": label, "lower": score, "upper": score} for label, score in scores]
+    else:
+        range_min, range_max, step = rounded_range(min_value or 0, max_value or 0)
+        legend = _legend_buckets(range_min, range_max, step)
+    return {"values": values, "min": min_value, "max": max_value,
+            "range_min": range_min, "range_max": range_max, "legend": legend}
+
+def get_team_heatmap(db: Session):
+    """
+    Pivot the team records into availability, work hours and staff heatmaps (team x day).
+
+    The team records are numbered day after day: with N distinct team names, the record with
+    ID `i` belongs to day `(i - 1) // N + 1`. A later record of the same team and day replaces
+    an earlier one. Missing availability, hours or staff values count as 0.
+
+    Args:
+        db (Session): Database session.
+
+    Returns:
+        dict: Day and team labels, and for each heatmap its matrix, min/max, color scale range and legend buckets.
+    """
+    rows = (
+        db.query(ÉquipeModel.ID_Équipe, ÉquipeModel.Nom_Équipe, ÉquipeModel.Disponibilité,
+                 ÉquipeModel.Nombre_Heures_Travaillées, ÉquipeModel.Effectif)
+        .order_by(ÉquipeModel.ID_Équipe)
+        .all()
+    )
+    team_count = len({row.Nom_Équipe for row in rows})
+
+    # team -> day -> (availability, work hours, staff), teams kept in order of first appearance
+    cells = {}
+    for row in rows:
+        day = (row.ID_Équipe - 1) // team_count + 1
+        cells.setdefault(row.Nom_Équipe, {})[day] = (
+            AVAILABILITY_SCORES.get(row.Disponibilité, 0),
+            row.Nombre_Heures_Travaillées or 0,
+            row.Effectif or 0,
+        )
+    days = sorted({day for team_days in cells.values() for day in team_days})
+
+    def values(index: int) -> list[list]:
+        return [[team_days[day][index] if day in team_days else None for day in days] for team_days in cells.values()]
+
+    return {
+        "days": days,
+        "teams": list(cells),
+        "availability": _matrix(values(0), discrete=True),
+        "work_hours": _matrix(values(1), discrete=False),
+        "staff": _matrix(values(2), discrete=False),
+    }
@@ -7,9 +7,20 @@ Includes:
 - Updating existing production records.
 - Deleting production records, with optional cascading behavior.
 """
+from sqlalchemy import select, insert, update, delete
 from sqlalchemy.orm import Session
 from app.models.models_production import ProductionModel
+from app.models.model_commande import CommandeModel
 from sqlalchemy.orm import joinedload
+from app.utils.pagination import keyset_page, STREAM_BATCH_SIZE
+from app.utils.serialization import model_columns, rows_to_dicts
+from app.utils.cache import invalidate
+from app.utils.filters import ProductionFilters, in_condition, order_by_sort, range_conditions
+from app.crud.crud_summary import PRODUCTION_SUMMARY, changes_group, group_key, group_keys, refresh_groups, rebuild
+
+# Cached read responses made stale by the writes of this module
+# (Production writes change the production lists and the KPIs)
+_CACHED_NAMESPACES = ("productions", "kpis")
 
 #----------------------------- CREATE ---------------------------------
 def create_production(db: Session, production: ProductionModel):
@@ -21,40 +32,191 @@ def create_production(db: Session, production: ProductionModel):
         production (ProductionModel): Instance of the production to be added.
 
     Returns:
-        ProductionModel: The newly created production record.
+        ProductionModel: The newly created production record, with its Commande loaded.
+
+    Raises:
+        IntegrityError: If `id_commande` does not match an existing commande (foreign key constraint).
     """
-    db.add(production)
-    db.commit()
-    db.refresh(production)
-    return production
+    try:
+        db.add(production)
+        db.flush()
+        production_id = production.id_production
+        refresh_groups(db, PRODUCTION_SUMMARY, {group_key(PRODUCTION_SUMMARY, production)})
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise e
+    invalidate(*_CACHED_NAMESPACES)
+    # Reload the expired record and its Commande in one query instead of a refresh plus a lazy load
+    return get_production_by_id(db, production_id)
+
+def bulk_upsert_productions(db: Session, productions: list[dict]):
+    """
+    Insert or update many production records in a single transaction.
+
+    Records without `id_production` are inserted, the others update the existing row with that ID.
+    Both sets are sent as executemany batches rather than one statement per ORM object.
+    The summary groups of the inserted records and of the updated records (before and after
+    the update) are refreshed in the same transaction.
+
+    Args:
+        db (Session): Database session.
+        productions (list[dict]): Production fields keyed by model attribute name.
+
+    Returns:
+        dict: Number of `created` and `updated` records.
+
+    Raises:
+        Exception: Re-raises any exception encountered after rolling back the transaction.
+
+    Note:
+        Foreign key and ID existence validation should be done before calling this method.
+    """
+    to_insert = [{k: v for k, v in prod.items() if k != "id_production"} for prod in productions if prod.get("id_production") is None]
+    to_update = [prod for prod in productions if prod.get("id_production") is not None]
+    groups = {group_key(PRODUCTION_SUMMARY, prod) for prod in to_insert + to_update}
+    try:
+        if to_update:
+            updated_ids = ProductionModel.id_production.in_({prod["id_production"] for prod in to_update})
+            groups |= group_keys(db, PRODUCTION_SUMMARY, updated_ids)
+        if to_insert:
+            db.execute(insert(ProductionModel), to_insert)
+        if to_update:
+            db.execute(update(ProductionModel), to_update)
+        refresh_groups(db, PRODUCTION_SUMMARY, groups)
+        db.commit()
+        invalidate(*_CACHED_NAMESPACES)
+    except Exception as e:
+        db.rollback()
+        raise e
+    return {"created": len(to_insert), "updated": len(to_update)}
 
 #----------------------------- READ ---------------------------------
-def get_all_productions(db: Session):
+def filter_productions(query, filters: ProductionFilters | None):
     """
-    Retrieve all production records with their related Commande.
+    Apply the list filters and sort order to a production query, in SQL.
+
+    Works with both legacy `Query` objects (sync CRUD) and `select()` statements (async CRUD).
+    The client filter is an EXISTS on the related Commande, so no join is required.
+
+    Args:
+        query (Query | Select): Query selecting production records or columns.
+        filters (ProductionFilters | None): The filters, the query is returned unchanged if None.
+
+    Returns:
+        Query | Select: The filtered and ordered query.
+    """
+    if filters is None:
+        return query
+    conditions = [
+        *range_conditions(ProductionModel.date_production, filters.date_from, filters.date_to),
+        *range_conditions(ProductionModel.quantite, filters.quantite_min, filters.quantite_max),
+        *in_condition(ProductionModel.statut, filters.statut),
+        *in_condition(ProductionModel.produit, filters.produit),
+    ]
+    if filters.client:
+        conditions.append(ProductionModel.commande.has(in_condition(CommandeModel.client, filters.client)[0]))
+    if conditions:
+        query = query.filter(*conditions)
+    return order_by_sort(query, ProductionModel, filters.sort)
+
+def get_all_productions(db: Session, limit: int | None = None, after: int | None = None, filters: ProductionFilters | None = None):
+    """
+    Retrieve production records with their related Commande, ordered by ID.
+
+    Args:
+        limit (int | None): Maximum number of records, all records if None.
+        after (int | None): Only return records whose ID is greater than this cursor.
+        filters (ProductionFilters | None): Optional WHERE / ORDER BY parameters (see `filter_productions`).
 
     Returns:
         List[ProductionModel]: List of production records with joined Commande data.
     """
-    return db.query(ProductionModel).options(joinedload(ProductionModel.commande)).all()
+    query = filter_productions(db.query(ProductionModel).options(joinedload(ProductionModel.commande)), filters)
+    return keyset_page(query, ProductionModel.id_production, limit, after).all()
+
+def get_all_productions_rows(db: Session, limit: int | None = None, after: int | None = None, filters: ProductionFilters | None = None):
+    """
+    Fast path: retrieve production records with their nested Commande as plain dictionaries, ordered by ID.
+
+    Production and Commande columns are selected through a single outer join, no ORM entity is built.
+
+    Args:
+        limit (int | None): Maximum number of records, all records if None.
+        after (int | None): Only return records whose ID is greater than this cursor.
+        filters (ProductionFilters | None): Optional WHERE / ORDER BY parameters (see `filter_productions`).
+
+    Returns:
+        List[dict]: Production records keyed by attribute name, with the Commande under `commande`.
+    """
+    commande_keys = [col.key for col in model_columns(CommandeModel)]
+    commande_columns = [col.label(f"commande_{col.key}") for col in model_columns(CommandeModel)]
+    query = filter_productions(db.query(*model_columns(ProductionModel), *commande_columns).outerjoin(ProductionModel.commande), filters)
+
+    productions = []
+    for record in rows_to_dicts(keyset_page(query, ProductionModel.id_production, limit, after)):
+        commande = {key: record.pop(f"commande_{key}") for key in commande_keys}
+        record["commande"] = commande if commande["id_commande"] is not None else None
+        productions.append(record)
+    return productions
+
+def stream_productions(db: Session, limit: int | None = None, after: int | None = None, filters: ProductionFilters | None = None):
+    """
+    Iterate over production records and their related Commande through a server-side cursor.
+
+    Returns:
+        Iterable[ProductionModel]: Production records fetched in batches.
+    """
+    query = filter_productions(db.query(ProductionModel).options(joinedload(ProductionModel.commande)), filters)
+    return keyset_page(query, ProductionModel.id_production, limit, after).yield_per(STREAM_BATCH_SIZE)
 
-def get_all_productions_flat(db: Session):
+def get_all_productions_flat(db: Session, limit: int | None = None, after: int | None = None, filters: ProductionFilters | None = None):
     """
-    Retrieve all production records without joining related data.
+    Retrieve production records without joining related data, ordered by ID.
+
+    Args:
+        limit (int | None): Maximum number of records, all records if None.
+        after (int | None): Only return records whose ID is greater than this cursor.
+        filters (ProductionFilters | None): Optional WHERE / ORDER BY parameters (see `filter_productions`).
 
     Returns:
         List[ProductionModel]: List of production records.
     """
-    return db.query(ProductionModel).all()
+    return keyset_page(filter_productions(db.query(ProductionModel), filters), ProductionModel.id_production, limit, after).all()
+
+def get_all_productions_flat_rows(db: Session, limit: int | None = None, after: int | None = None, filters: ProductionFilters | None = None):
+    """
+    Fast path: retrieve production records as plain dictionaries, ordered by ID.
+
+    Returns:
+        List[dict]: Production records keyed by attribute name.
+    """
+    query = filter_productions(db.query(*model_columns(ProductionModel)), filters)
+    return rows_to_dicts(keyset_page(query, ProductionModel.id_production, limit, after))
+
+def stream_productions_flat(db: Session, limit: int | None = None, after: int | None = None, filters: ProductionFilters | None = None):
+    """
+    Flat version: iterate over production records through a server-side cursor.
+
+    Returns:
+        Iterable[ProductionModel]: Production records fetched in batches.
+    """
+    query = filter_productions(db.query(ProductionModel), filters)
+    return keyset_page(query, ProductionModel.id_production, limit, after).yield_per(STREAM_BATCH_SIZE)
 
 def get_production_by_id(db: Session, production_id: int):
     """
-    Get a single production record by its ID.
+    Get a single production record by its ID, with its related Commande joined in the same query.
 
     Returns:
         ProductionModel | None: Production record or None if not found.
     """
-    return db.query(ProductionModel).filter(ProductionModel.id_production == production_id).first()
+    return (
+        db.query(ProductionModel)
+        .options(joinedload(ProductionModel.commande))
+        .filter(ProductionModel.id_production == production_id)
+        .first()
+    )
 
 def get_production_flat_by_id(db: Session, production_id: int):
     """
@@ -65,14 +227,31 @@ def get_production_flat_by_id(db: Session, production_id: int):
     """
     return db.query(ProductionModel).filter(ProductionModel.id_production == production_id).first()
 
+def get_existing_production_ids(db: Session, production_ids: list[int]):
+    """
+    Find which of the given production IDs exist, in a single IN query.
+
+    Returns:
+        set[int]: The IDs that match an existing production record.
+    """
+    if not production_ids:
+        return set()
+    rows = db.query(ProductionModel.id_production).filter(ProductionModel.id_production.in_(set(production_ids))).all()
+    return {row.id_production for row in rows}
+
 def get_productions_by_commande_id(db: Session, commande_id: int):
     """
-    Get all production records linked to a specific commande.
+    Get all production records linked to a specific commande, with the Commande joined in the same query.
 
     Returns:
         List[ProductionModel]: Productions linked to the given commande.
     """
-    return db.query(ProductionModel).filter(ProductionModel.id_commande == commande_id).all()
+    return (
+        db.query(ProductionModel)
+        .options(joinedload(ProductionModel.commande))
+        .filter(ProductionModel.id_commande == commande_id)
+        .all()
+    )
 
 def get_productions_flat_by_commande_id(db: Session, commande_id: int):
     """
@@ -84,38 +263,93 @@ def get_productions_flat_by_commande_id(db: Session, commande_id: int):
     return db.query(ProductionModel).filter(ProductionModel.id_commande == commande_id).all()
 
 #----------------------------- UPDATE ---------------------------------
-def update_production(db: Session, production: ProductionModel, updates: dict):
+def update_production(db: Session, production_id: int, updates: dict):
     """
-    Update an existing production record with the given fields.
+    Update a production record with a single `UPDATE ... RETURNING` statement.
+
+    The new `id_commande` is not checked beforehand: the foreign key constraint of the
+    database rejects unknown commandes with an `IntegrityError`.
+    The previous summary group is only read when the update changes a group column.
 
     Args:
         db (Session): Database session.
-        production (ProductionModel): Existing production record (already fetched).
+        production_id (int): ID of the production to update.
         updates (dict): Dictionary of fields and new values.
 
     Returns:
-        ProductionModel: Updated production record.
-    
-    Note:
-        This method assumes existence validation is done at the router level.
+        dict | None: The updated production keyed by attribute name, with its Commande under
+        `commande`, or None if no production has this ID.
+
+    Raises:
+        IntegrityError: If the new `id_commande` does not match an existing commande.
     """
-    for key, value in updates.items():
-        setattr(production, key, value)
-    db.commit()
-    db.refresh(production)
+    by_id = ProductionModel.id_production == production_id
+    if not updates:
+        record = db.execute(select(*model_columns(ProductionModel)).where(by_id)).first()
+        return _with_commande(db, record._asdict()) if record is not None else None
+    try:
+        groups = group_keys(db, PRODUCTION_SUMMARY, by_id) if changes_group(PRODUCTION_SUMMARY, updates) else set()
+        record = db.execute(
+            update(ProductionModel).where(by_id).values(**updates).returning(*model_columns(ProductionModel)),
+            execution_options={"synchronize_session": False},
+        ).first()
+        if record is None:
+            db.rollback()
+            return None
+        production = record._asdict()
+        groups.add(group_key(PRODUCTION_SUMMARY, production))
+        refresh_groups(db, PRODUCTION_SUMMARY, groups)
+        production = _with_commande(db, production)
+        db.commit()
+        invalidate(*_CACHED_NAMESPACES)
+    except Exception as e:
+        db.rollback()
+        raise e
+    return production
+
+def _with_commande(db: Session, production: dict) -> dict:
+    # Nest the related Commande columns, as in the responses built from ORM objects
+    commande = db.execute(
+        select(*model_columns(CommandeModel)).where(CommandeModel.id_commande == production["id_commande"])
+    ).first()
+    production["commande"] = commande._asdict() if commande is not None else None
     return production
 
 #----------------------------- DELETE ---------------------------------
-def delete_production(db: Session, production: ProductionModel):
+def delete_production(db: Session, production_id: int) -> bool:
     """
-    Delete a single production record.
+    Delete a production record with a single `DELETE ... RETURNING` statement.
+
+    The returned group columns give the summary group to refresh, no prior SELECT is needed.
 
     Args:
         db (Session): Database session.
-        production (ProductionModel): Record to delete (should be pre-validated).
+        production_id (int): ID of the production to delete.
+
+    Returns:
+        bool: True if the production was deleted, False if no production has this ID.
+
+    Raises:
+        Exception: Re-raises any exception encountered after rolling back the transaction.
     """
-    db.delete(production)
-    db.commit()
+    group_columns = [source for _, source in PRODUCTION_SUMMARY.groups]
+    try:
+        groups = {
+            tuple(row) for row in db.execute(
+                delete(ProductionModel).where(ProductionModel.id_production == production_id).returning(*group_columns),
+                execution_options={"synchronize_session": False},
+            )
+        }
+        if not groups:
+            db.rollback()
+            return False
+        refresh_groups(db, PRODUCTION_SUMMARY, groups)
+        db.commit()
+        invalidate(*_CACHED_NAMESPACES)
+    except Exception as e:
+        db.rollback()
+        raise e
+    return True
 
 def delete_all_productions(db: Session):
     """
@@ -125,5 +359,7 @@ def delete_all_productions(db: Session):
         db (Session): Database session.
     """
     db.query(ProductionModel).delete()
+    rebuild(db, PRODUCTION_SUMMARY)
     db.commit()
+    invalidate(*_CACHED_NAMESPACES)
 
@@ -0,0 +1,214 @@
+"""
+Async CRUD operations related to production records.
+
+Mirrors `crud_production` for `AsyncSession` (see `database.async_database.get_async_db`).
+Relationships cannot be lazy-loaded from an async session, so every function whose
+result is serialized with the nested `commande` eager-loads it.
+
+Includes:
+- Creating new production records.
+- Reading and filtering production records.
+- Updating existing production records.
+- Deleting production records.
+"""
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.models.models_production import ProductionModel
+from app.models.model_commande import CommandeModel
+from app.utils.serialization import model_columns
+from app.utils.pagination import keyset_page
+from app.utils.cache import invalidate
+from app.utils.filters import ProductionFilters
+from app.crud.crud_production import filter_productions
+from app.crud.crud_summary import PRODUCTION_SUMMARY, changes_group, group_key, group_keys, refresh_groups, rebuild
+
+# Cached read responses made stale by the writes of this module
+# (Production writes change the production lists and the KPIs)
+_CACHED_NAMESPACES = ("productions", "kpis")
+
+#----------------------------- CREATE ---------------------------------
+async def create_production(db: AsyncSession, production: ProductionModel):
+    """
+    Create a new production record.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async database session.
+        production (ProductionModel): Instance of the production to be added.
+
+    Returns:
+        ProductionModel: The newly created production record, with its Commande loaded.
+    """
+    try:
+        db.add(production)
+        await db.flush()
+        await db.run_sync(refresh_groups, PRODUCTION_SUMMARY, {group_key(PRODUCTION_SUMMARY, production)})
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise e
+    invalidate(*_CACHED_NAMESPACES)
+    return await get_production_by_id(db, production.id_production)
+
+#----------------------------- READ ---------------------------------
+async def get_all_productions(db: AsyncSession, limit: int | None = None, after: int | None = None, filters: ProductionFilters | None = None):
+    """
+    Retrieve production records with their related Commande, ordered by ID.
+
+    Returns:
+        List[ProductionModel]: List of production records with joined Commande data.
+    """
+    query = filter_productions(select(ProductionModel).options(joinedload(ProductionModel.commande)), filters)
+    result = await db.scalars(keyset_page(query, ProductionModel.id_production, limit, after))
+    return result.all()
+
+async def get_all_productions_flat(db: AsyncSession, limit: int | None = None, after: int | None = None, filters: ProductionFilters | None = None):
+    """
+    Retrieve production records without joining related data, ordered by ID.
+
+    Returns:
+        List[ProductionModel]: List of production records.
+    """
+    query = filter_productions(select(ProductionModel), filters)
+    result = await db.scalars(keyset_page(query, ProductionModel.id_production, limit, after))
+    return result.all()
+
+async def get_production_by_id(db: AsyncSession, production_id: int):
+    """
+    Get a single production record by its ID, with its related Commande.
+
+    Returns:
+        ProductionModel | None: Production record or None if not found.
+    """
+    result = await db.scalars(
+        select(ProductionModel)
+        .options(joinedload(ProductionModel.commande))
+        .where(ProductionModel.id_production == production_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.first()
+
+async def get_production_flat_by_id(db: AsyncSession, production_id: int):
+    """
+    Get a production record by ID, flat version (no joined relationships).
+
+    Returns:
+        ProductionModel | None: Production record or None if not found.
+    """
+    return await db.get(ProductionModel, production_id)
+
+async def get_productions_by_commande_id(db: AsyncSession, commande_id: int):
+    """
+    Get all production records linked to a specific commande, with the related Commande.
+
+    Returns:
+        List[ProductionModel]: Productions linked to the given commande.
+    """
+    result = await db.scalars(
+        select(ProductionModel)
+        .options(joinedload(ProductionModel.commande))
+        .where(ProductionModel.id_commande == commande_id)
+    )
+    return result.all()
+
+async def get_productions_flat_by_commande_id(db: AsyncSession, commande_id: int):
+    """
+    Flat version: Get all production records linked to a specific commande.
+
+    Returns:
+        List[ProductionModel]: Flat productions linked to the given commande.
+    """
+    result = await db.scalars(select(ProductionModel).where(ProductionModel.id_commande == commande_id))
+    return result.all()
+
+#----------------------------- UPDATE ---------------------------------
+async def update_production(db: AsyncSession, production_id: int, updates: dict):
+    """
+    Update a production record with a single `UPDATE ... RETURNING` statement.
+
+    Args:
+        db (AsyncSession): Async database session.
+        production_id (int): ID of the production to update.
+        updates (dict): Dictionary of fields and new values.
+
+    Returns:
+        dict | None: The updated production keyed by attribute name, with its Commande under
+        `commande`, or None if no production has this ID.
+
+    Raises:
+        IntegrityError: If the new `id_commande` does not match an existing commande.
+    """
+    by_id = ProductionModel.id_production == production_id
+    try:
+        if updates:
+            groups = await db.run_sync(group_keys, PRODUCTION_SUMMARY, by_id) if changes_group(PRODUCTION_SUMMARY, updates) else set()
+            result = await db.execute(
+                update(ProductionModel).where(by_id).values(**updates).returning(*model_columns(ProductionModel)),
+                execution_options={"synchronize_session": False},
+            )
+        else:
+            result = await db.execute(select(*model_columns(ProductionModel)).where(by_id))
+        record = result.first()
+        if record is None:
+            await db.rollback()
+            return None
+        production = record._asdict()
+        if updates:
+            groups.add(group_key(PRODUCTION_SUMMARY, production))
+            await db.run_sync(refresh_groups, PRODUCTION_SUMMARY, groups)
+        commande = (await db.execute(
+            select(*model_columns(CommandeModel)).where(CommandeModel.id_commande == production["id_commande"])
+        )).first()
+        production["commande"] = commande._asdict() if commande is not None else None
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise e
+    if updates:
+        invalidate(*_CACHED_NAMESPACES)
+    return production
+
+#----------------------------- DELETE ---------------------------------
+async def delete_production(db: AsyncSession, production_id: int) -> bool:
+    """
+    Delete a production record with a single `DELETE ... RETURNING` statement.
+
+    Args:
+        db (AsyncSession): Async database session.
+        production_id (int): ID of the production to delete.
+
+    Returns:
+        bool: True if the production was deleted, False if no production has this ID.
+
+    Raises:
+        Exception: Re-raises any exception encountered after rolling back the transaction.
+    """
+    group_columns = [source for _, source in PRODUCTION_SUMMARY.groups]
+    try:
+        result = await db.execute(
+            delete(ProductionModel).where(ProductionModel.id_production == production_id).returning(*group_columns),
+            execution_options={"synchronize_session": False},
+        )
+        groups = {tuple(row) for row in result}
+        if not groups:
+            await db.rollback()
+            return False
+        await db.run_sync(refresh_groups, PRODUCTION_SUMMARY, groups)
+        await db.commit()
+        invalidate(*_CACHED_NAMESPACES)
+    except Exception as e:
+        await db.rollback()
+        raise e
+    return True
+
+async def delete_all_productions(db: AsyncSession):
+    """
+    Delete all production records from the database.
+
+    Args:
+        db (AsyncSession): Async database session.
+    """
+    await db.execute(delete(ProductionModel))
+    await db.run_sync(rebuild, PRODUCTION_SUMMARY)
+    await db.commit()
+    invalidate(*_CACHED_NAMESPACES)
@@ -1,18 +1,51 @@
 from sqlalchemy.orm import Session
 from app.models.model_stock import StockModel
+from app.utils.pagination import keyset_page, STREAM_BATCH_SIZE
+from app.utils.serialization import model_columns, rows_to_dicts
 
 #----------------------------- READ ---------------------------------
-def get_all_stock(db: Session):
+def get_all_stock(db: Session, limit: int | None = None, after: int | None = None):
     """
-    Retrieve all Stock records.
+    Retrieve Stock records ordered by ID, optionally restricted to a keyset page.
 
     Args:
         db (Session): Database session.
+        limit (int | None): Maximum number of records, all records if None.
+        after (int | None): Only return records whose ID is greater than this cursor.
 
     Returns:
-        List[StockModel]: All Stock records.
+        List[StockModel]: The requested Stock records.
     """
-    return db.query(StockModel).all()
+    return keyset_page(db.query(StockModel), StockModel.ID_Stock, limit, after).all()
+
+def get_all_stock_rows(db: Session, limit: int | None = None, after: int | None = None):
+    """
+    Fast path: retrieve Stock records as plain dictionaries, ordered by ID.
+
+    Args:
+        db (Session): Database session.
+        limit (int | None): Maximum number of records, all records if None.
+        after (int | None): Only return records whose ID is greater than this cursor.
+
+    Returns:
+        List[dict]: The requested Stock records, keyed by attribute name.
+    """
+    query = db.query(*model_columns(StockModel))
+    return rows_to_dicts(keyset_page(query, StockModel.ID_Stock, limit, after))
+
+def stream_stock(db: Session, limit: int | None = None, after: int | None = None):
+    """
+    Iterate over Stock records through a server-side cursor.
+
+    Args:
+        db (Session): Database session, must stay open while iterating.
+        limit (int | None): Maximum number of records, all records if None.
+        after (int | None): Only return records whose ID is greater than this cursor.
+
+    Returns:
+        Iterable[StockModel]: Stock records fetched in batches.
+    """
+    return keyset_page(db.query(StockModel), StockModel.ID_Stock, limit, after).yield_per(STREAM_BATCH_SIZE)
 
 def get_stock_by_id(db: Session, stock_id: int):
     """
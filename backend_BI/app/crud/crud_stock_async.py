@@ -0,0 +1,38 @@
+"""
+Async read operations related to Stock records.
+
+Mirrors `crud_stock` for `AsyncSession` (see `database.async_database.get_async_db`).
+"""
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.model_stock import StockModel
+from app.utils.pagination import keyset_page
+
+#----------------------------- READ ---------------------------------
+async def get_all_stock(db: AsyncSession, limit: int | None = None, after: int | None = None):
+    """
+    Retrieve Stock records ordered by ID, optionally restricted to a keyset page.
+
+    Args:
+        db (AsyncSession): Async database session.
+        limit (int | None): Maximum number of records, all records if None.
+        after (int | None): Only return records whose ID is greater than this cursor.
+
+    Returns:
+        List[StockModel]: The requested Stock records.
+    """
+    result = await db.scalars(keyset_page(select(StockModel), StockModel.ID_Stock, limit, after))
+    return result.all()
+
+async def get_stock_by_id(db: AsyncSession, stock_id: int):
+    """
+    Retrieve a single Stock by its ID.
+
+    Args:
+        db (AsyncSession): Async database session.
+        stock_id (int): Stock ID.
+
+    Returns:
+        StockModel | None: Found record or None if not found.
+    """
+    return await db.get(StockModel, stock_id)
@@ -0,0 +1,239 @@
+"""
+Maintenance of the summary tables backing the KPI endpoints.
+
+Each summary table (see `app.models.model_summary`) holds one row per group of source records.
+It is described by a `SummarySpec`: the group columns and the aggregates of each summary column.
+
+- `rebuild_summaries()` recomputes every summary table from scratch. It is called by the loader
+  (`save_sqldb.py`) after each import and recreates the tables, so it is also the migration of a
+  database created before the summary tables existed or before their columns changed:
+
+      python -m app.crud.crud_summary
+
+- `refresh_groups()` recomputes only the given groups. The Production and Commande write paths
+  collect the groups they touch (before and after the change, with `group_key()` / `group_keys()`)
+  and refresh them in the same transaction, so each write costs O(records of the touched groups).
+  The groups are locked first, so concurrent writes to one group refresh it one after the other.
+
+The refresh functions take a sync `Session` (or `Connection`); async CRUD modules call them
+through `AsyncSession.run_sync()`.
+"""
+
+import hashlib
+from typing import Iterable, NamedTuple
+from sqlalchemy import and_, delete, func, insert, or_, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.database.database import Base
+from app.models.models_production import ProductionModel
+from app.models.model_commande import CommandeModel
+from app.models.model_stock import StockModel
+from app.models.model_summary import ProductionSummaryModel, CommandeSummaryModel, StockSummaryModel
+from app.crud.crud_kpi import revenue
+
+# Number of groups refreshed per DELETE / INSERT ... SELECT statement
+REFRESH_BATCH_SIZE = 100
+
+class SummarySpec(NamedTuple):
+    """
+    How a summary table is computed from its source table.
+
+    Attributes:
+    - model: Summary model.
+    - groups: (summary column, source column) pairs of the group columns.
+    - measures: (summary column, SQL aggregate over the source table) pairs.
+    """
+    model: type
+    groups: tuple
+    measures: tuple
+
+PRODUCTION_SUMMARY = SummarySpec(
+    ProductionSummaryModel,
+    groups=(
+        (ProductionSummaryModel.produit, ProductionModel.produit),
+        (ProductionSummaryModel.statut, ProductionModel.statut),
+    ),
+    measures=(
+        (ProductionSummaryModel.count, func.count(ProductionModel.id_production)),
+        (ProductionSummaryModel.quantite, func.coalesce(func.sum(ProductionModel.quantite), 0)),
+        (ProductionSummaryModel.cout, func.coalesce(func.sum(ProductionModel.cout_production), 0)),
+        (ProductionSummaryModel.revenu, func.coalesce(func.sum(revenue), 0)),
+        (ProductionSummaryModel.temps, func.coalesce(func.sum(ProductionModel.temps_production), 0)),
+        (ProductionSummaryModel.prix_total, func.coalesce(func.sum(ProductionModel.prix_unitaire), 0)),
+        (ProductionSummaryModel.prix_count, func.count(ProductionModel.prix_unitaire)),
+    ),
+)
+
+COMMANDE_SUMMARY = SummarySpec(
+    CommandeSummaryModel,
+    groups=(
+        (CommandeSummaryModel.client, CommandeModel.client),
+        (CommandeSummaryModel.statut, CommandeModel.statut),
+    ),
+    measures=(
+        (CommandeSummaryModel.count, func.count(CommandeModel.id_commande)),
+        (CommandeSummaryModel.quantite, func.coalesce(func.sum(CommandeModel.quantite), 0)),
+    ),
+)
+
+STOCK_SUMMARY = SummarySpec(
+    StockSummaryModel,
+    groups=(
+        (StockSummaryModel.lieu_stockage, StockModel.Lieu_Stockage),
+        (StockSummaryModel.type_matiere, StockModel.Type_Matière),
+    ),
+    measures=(
+        (StockSummaryModel.count, func.count(StockModel.ID_Stock)),
+        (StockSummaryModel.quantite_disponible, func.coalesce(func.sum(StockModel.Quantité_Disponible), 0)),
+    ),
+)
+
+SUMMARIES = (PRODUCTION_SUMMARY, COMMANDE_SUMMARY, STOCK_SUMMARY)
+
+#----------------------------- GROUPS ---------------------------------
+def group_key(spec: SummarySpec, record) -> tuple:
+    """
+    Group of a source record, given as an ORM object or a dictionary keyed by attribute name.
+    """
+    if isinstance(record, dict):
+        return tuple(record.get(source.key) for _, source in spec.groups)
+    return tuple(getattr(record, source.key) for _, source in spec.groups)
+
+def changes_group(spec: SummarySpec, updates: dict) -> bool:
+    """
+    Whether an update may move a record to another group, i.e. sets one of the group columns.
+
+    Only such updates need the previous group of the record to be read before the UPDATE.
+    """
+    return any(source.key in updates for _, source in spec.groups)
+
+def group_keys(db: Session, spec: SummarySpec, *conditions) -> set[tuple]:
+    """
+    Groups of the source records matching the conditions, in a single SELECT DISTINCT.
+
+    Used to collect the groups of the records a set-based UPDATE or DELETE is about to change.
+    """
+    sources = [source for _, source in spec.groups]
+    return {tuple(row) for row in db.execute(select(*sources).where(*conditions).distinct())}
+
+def _matching(columns: list, keys: list[tuple]):
+    # NULL group values are matched with IS NULL, as GROUP BY does
+    return or_(*(
+        and_(*(column.is_(None) if value is None else column == value for column, value in zip(columns, key)))
+        for key in keys
+    ))
+
+#----------------------------- LOCKS ---------------------------------
+def _lock_name(spec: SummarySpec, key: tuple) -> str:
+    # Same name for the same group in every process, whatever the types of its values
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+    return f"{spec.model.__tablename__}:{digest}"
+
+def _lock_postgresql(db: Session, names: list[str]):
+    # Transaction-level advisory locks, taken in a fixed order so two writers cannot deadlock on them
+    keys = sorted(int.from_bytes(bytes.fromhex(name.rsplit(":", 1)[1]), "big", signed=True) for name in names)
+    db.execute(
+        text("SELECT pg_advisory_xact_lock(k) FROM (SELECT unnest(CAST(:keys AS BIGINT[])) AS k ORDER BY k) AS locks"),
+        {"keys": keys},
+    )
+
+def _lock_mssql(db: Session, names: list[str]):
+    # Application locks owned by the transaction, taken in a fixed order
+    names = sorted(names)
+    statements = ["DECLARE @result int;"]
+    for i in range(len(names)):
+        statements.append(
+            f"EXEC @result = sp_getapplock @Resource = :name_{i}, @LockMode = 'Exclusive', @LockOwner = 'Transaction'; "
+            f"IF @result < 0 THROW 51000, 'Summary group lock not granted', 1;"
+        )
+    db.execute(text("\n".join(statements)), {f"name_{i}": name for i, name in enumerate(names)})
+
+# SQLite needs no lock: it runs one write transaction at a time
+_GROUP_LOCKS = {"postgresql": _lock_postgresql, "mssql": _lock_mssql}
+
+def lock_groups(db: Session, spec: SummarySpec, keys: Iterable[tuple]):
+    """
+    Lock summary groups until the end of the caller's transaction.
+
+    A group row may not exist yet (or may be deleted by another transaction), so the lock is
+    an advisory lock named after the group rather than a row lock. A transaction refreshing
+    a group waits for the one that locked it to commit, then reads its changes.
+
+    Args:
+        db (Session): Database session (or connection).
+        spec (SummarySpec): The summary table of the groups.
+        keys (Iterable[tuple]): Groups to lock.
+    """
+    dialect = db.dialect if isinstance(db, Connection) else db.get_bind().dialect
+    lock = _GROUP_LOCKS.get(dialect.name)
+    names = {_lock_name(spec, key) for key in keys}
+    if lock is not None and names:
+        lock(db, list(names))
+
+#----------------------------- REFRESH ---------------------------------
+def _insert_groups(db: Session, spec: SummarySpec, *conditions):
+    sources = [source for _, source in spec.groups]
+    source_query = (
+        select(*sources, *(aggregate for _, aggregate in spec.measures))
+        .where(*conditions)
+        .group_by(*sources)
+    )
+    target_columns = [column for column, _ in spec.groups + spec.measures]
+    db.execute(insert(spec.model).from_select(target_columns, source_query))
+
+def refresh_groups(db: Session, spec: SummarySpec, keys: Iterable[tuple]):
+    """
+    Recompute the summary rows of the given groups from the source table.
+
+    The groups are locked (see `lock_groups()`), their rows deleted, then re-inserted with an
+    INSERT ... SELECT ... GROUP BY restricted to the same groups, so groups left without records
+    disappear. Runs in the caller's transaction, nothing is committed.
+
+    Args:
+        db (Session): Database session (or connection).
+        spec (SummarySpec): The summary table to refresh.
+        keys (Iterable[tuple]): Groups to refresh, as returned by `group_key()` / `group_keys()`.
+    """
+    keys = list(set(keys))
+    lock_groups(db, spec, keys)
+    summary_columns = [column for column, _ in spec.groups]
+    source_columns = [source for _, source in spec.groups]
+    for start in range(0, len(keys), REFRESH_BATCH_SIZE):
+        batch = keys[start:start + REFRESH_BATCH_SIZE]
+        db.execute(delete(spec.model).where(_matching(summary_columns, batch)))
+        _insert_groups(db, spec, _matching(source_columns, batch))
+
+def rebuild(db: Session, spec: SummarySpec):
+    """
+    Recompute a whole summary table from the source table, in the caller's transaction.
+    """
+    db.execute(delete(spec.model))
+    _insert_groups(db, spec)
+
+def rebuild_summaries(engine) -> dict:
+    """
+    Recreate the summary tables and recompute all of them in a single transaction.
+
+    The tables only hold derived figures, so they are dropped and created again from the
+    models rather than altered when their columns change.
+
+    Args:
+        engine (Engine): SQLAlchemy engine of the target database.
+
+    Returns:
+        dict[str, int]: Number of summary rows per summary table.
+    """
+    tables = [spec.model.__table__ for spec in SUMMARIES]
+    counts = {}
+    with engine.begin() as connection:
+        Base.metadata.drop_all(connection, tables=tables)
+        Base.metadata.create_all(connection, tables=tables)
+        for spec in SUMMARIES:
+            rebuild(connection, spec)
+            counts[spec.model.__tablename__] = connection.execute(select(func.count()).select_from(spec.model)).scalar()
+    return counts
+
+if __name__ == "__main__":
+    from app.database.database import engine
+    for table, count in rebuild_summaries(engine).items():
+        print(f"{table}: {count} rows")
@@ -0,0 +1,152 @@
+"""
+Time series aggregation queries computed directly in the database.
+
+Includes:
+- Production count, quantity, cost and revenue per day, week or month.
+- Commande count and quantity per day, week or month.
+
+Both can be split by product or status. Dates are truncated to their bucket in SQL
+(`day_bucket`, `week_bucket`, `month_bucket`), so only one row per bucket and group
+leaves the database.
+"""
+
+from datetime import date
+from typing import Optional
+from sqlalchemy import Date, func
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+from app.models.models_production import ProductionModel
+from app.models.model_commande import CommandeModel
+from app.crud.crud_kpi import revenue
+from app.utils.filters import range_conditions
+
+#----------------------------- DATE BUCKETS ---------------------------------
+class day_bucket(FunctionElement):
+    """The date part of a date/datetime column."""
+    type = Date()
+    name = "day_bucket"
+    inherit_cache = True
+
+class week_bucket(FunctionElement):
+    """The Monday of the week containing a date."""
+    type = Date()
+    name = "week_bucket"
+    inherit_cache = True
+
+class month_bucket(FunctionElement):
+    """The first day of the month containing a date."""
+    type = Date()
+    name = "month_bucket"
+    inherit_cache = True
+
+BUCKETS = {"day": day_bucket, "week": week_bucket, "month": month_bucket}
+
+@compiles(day_bucket)
+def _day_bucket_default(element, compiler, **kw):
+    return f"CAST({compiler.process(element.clauses, **kw)} AS DATE)"
+
+@compiles(day_bucket, "sqlite")
+def _day_bucket_sqlite(element, compiler, **kw):
+    return f"date({compiler.process(element.clauses, **kw)})"
+
+@compiles(week_bucket)
+def _week_bucket_default(element, compiler, **kw):
+    raise CompileError(f"week buckets are not supported on {compiler.dialect.name}")
+
+@compiles(week_bucket, "mssql")
+def _week_bucket_mssql(element, compiler, **kw):
+    # Independent of the SET DATEFIRST setting: Monday -> 0, ..., Sunday -> 6
+    column = compiler.process(element.clauses, **kw)
+    return f"DATEADD(day, -((DATEPART(weekday, {column}) + @@DATEFIRST + 5) % 7), CAST({column} AS DATE))"
+
+@compiles(week_bucket, "sqlite")
+def _week_bucket_sqlite(element, compiler, **kw):
+    return f"date({compiler.process(element.clauses, **kw)}, '-6 days', 'weekday 1')"
+
+@compiles(week_bucket, "postgresql")
+def _week_bucket_postgresql(element, compiler, **kw):
+    return f"CAST(date_trunc('week', {compiler.process(element.clauses, **kw)}) AS DATE)"
+
+@compiles(month_bucket)
+def _month_bucket_default(element, compiler, **kw):
+    raise CompileError(f"month buckets are not supported on {compiler.dialect.name}")
+
+@compiles(month_bucket, "mssql")
+def _month_bucket_mssql(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    return f"DATEFROMPARTS(YEAR({column}), MONTH({column}), 1)"
+
+@compiles(month_bucket, "sqlite")
+def _month_bucket_sqlite(element, compiler, **kw):
+    return f"date({compiler.process(element.clauses, **kw)}, 'start of month')"
+
+@compiles(month_bucket, "postgresql")
+def _month_bucket_postgresql(element, compiler, **kw):
+    return f"CAST(date_trunc('month', {compiler.process(element.clauses, **kw)}) AS DATE)"
+
+#----------------------------- READ ---------------------------------
+def _bucketed(db: Session, date_column, interval: str, group_column, measures: list,
+              date_from: Optional[date], date_to: Optional[date]):
+    bucket = BUCKETS[interval](date_column)
+    group = group_column.label("group") if group_column is not None else None
+    query = (
+        db.query(bucket.label("bucket"), *([group] if group is not None else []), *measures)
+        .filter(date_column.isnot(None), *range_conditions(date_column, date_from, date_to))
+    )
+    group_by = [bucket, group_column] if group_column is not None else [bucket]
+    return query.group_by(*group_by).order_by(*group_by).all()
+
+def get_production_timeseries(db: Session, interval: str = "day", split: Optional[str] = None,
+                              date_from: Optional[date] = None, date_to: Optional[date] = None):
+    """
+    Aggregate production records per time bucket.
+
+    Args:
+        db (Session): Database session.
+        interval (str): Bucket size, one of `day`, `week` (starting on Monday) or `month`.
+        split (Optional[str]): `produit` or `statut` to get one series per value, a single series if None.
+        date_from (Optional[date]): Only productions on or after this date.
+        date_to (Optional[date]): Only productions on or before this date.
+
+    Returns:
+        List[Row]: One row per bucket (and group) with `bucket`, `group`, `count`, `quantite`, `cout` and `revenu`,
+        ordered by bucket.
+    """
+    split_columns = {"produit": ProductionModel.produit, "statut": ProductionModel.statut}
+    return _bucketed(
+        db, ProductionModel.date_production, interval, split_columns.get(split),
+        [
+            func.count(ProductionModel.id_production).label("count"),
+            func.coalesce(func.sum(ProductionModel.quantite), 0).label("quantite"),
+            func.coalesce(func.sum(ProductionModel.cout_production), 0).label("cout"),
+            func.coalesce(func.sum(revenue), 0).label("revenu"),
+        ],
+        date_from, date_to,
+    )
+
+def get_commande_timeseries(db: Session, interval: str = "day", split: Optional[str] = None,
+                            date_from: Optional[date] = None, date_to: Optional[date] = None):
+    """
+    Aggregate Commande records per time bucket.
+
+    Args:
+        db (Session): Database session.
+        interval (str): Bucket size, one of `day`, `week` (starting on Monday) or `month`.
+        split (Optional[str]): `produit` or `statut` to get one series per value, a single series if None.
+        date_from (Optional[date]): Only commandes placed on or after this date.
+        date_to (Optional[date]): Only commandes placed on or before this date.
+
+    Returns:
+        List[Row]: One row per bucket (and group) with `bucket`, `group`, `count` and `quantite`, ordered by bucket.
+    """
+    split_columns = {"produit": CommandeModel.produit_commande, "statut": CommandeModel.statut}
+    return _bucketed(
+        db, CommandeModel.date_commande, interval, split_columns.get(split),
+        [
+            func.count(CommandeModel.id_commande).label("count"),
+            func.coalesce(func.sum(CommandeModel.quantite), 0).label("quantite"),
+        ],
+        date_from, date_to,
+    )
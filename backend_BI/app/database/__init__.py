@@ -2,4 +2,9 @@
 Database Package Initialization
 
 This module makes key components of the database layer accessible at the package level.
+
+- database: `make_engine()` for any dialect, sync engine (`get_engine()`, created on first use), `SessionLocal` and the `get_db()` dependency.
+- async_database: Async engine, `AsyncSessionLocal` and the `get_async_db()` dependency.
+- indexes: `ensure_indexes()`, creating the secondary indexes declared on the models (also a migration script).
+- schema: Dialect-agnostic table creation and identity handling used by the loaders.
 """
\ No newline at end of file
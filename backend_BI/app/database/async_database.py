@@ -0,0 +1,68 @@
+"""
+Async Database Configuration
+
+Responsibilities:
+- Create the SQLAlchemy async engine and async sessionmaker
+- Provide `get_async_db()` dependency for `async def` FastAPI routes
+
+The async engine talks to the same database as `database.engine` through the async driver
+of its dialect (`mssql+aioodbc`, `postgresql+asyncpg` or `sqlite+aiosqlite`). Set `DB_ASYNC_URL`
+in .env to override the URL, e.g. `sqlite+aiosqlite:///./test.db` as a local stand-in for tests.
+
+Models are shared with the sync layer: they keep using `database.Base`.
+"""
+
+import os
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.database.database import pool_options, connection_url
+
+# ----------------------------- Database URL Construction -----------------------------
+
+_DB_ASYNC_URL= 'DB_ASYNC_URL'
+
+# Async driver used for each dialect of the sync URL
+_ASYNC_DRIVERS = {"mssql": "aioodbc", "postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+def _async_url(url: str) -> str:
+    # Same server and credentials as the sync engine, through the async driver of the dialect
+    url = make_url(url)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        return url.render_as_string(hide_password=False)
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+async_connection_url = os.getenv(_DB_ASYNC_URL) or _async_url(connection_url)
+
+# SQLite pools (used as test stand-in) do not accept the sizing options
+_async_pool_options = {} if async_connection_url.startswith("sqlite") else pool_options
+
+# Establishing async database connection, the driver is only required when this path is used
+async_engine = None
+try:
+    async_engine = create_async_engine(async_connection_url, **_async_pool_options)
+except Exception as e:
+    print(f"Async database engine unavailable: {e}")
+
+# Session factory for async DB interactions; expire_on_commit=False keeps returned objects readable after commit
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False, autoflush=False)
+
+# ----------------------------- Dependency Function -----------------------------
+
+async def get_async_db():
+    """
+    Dependency to get an async database session.
+
+    Usage in FastAPI routes:
+        db: AsyncSession = Depends(get_async_db)
+
+    Yields:
+        AsyncSession: a SQLAlchemy async database session.
+
+    Raises:
+        RuntimeError: If the async engine could not be created (missing async driver).
+    """
+    if async_engine is None:
+        raise RuntimeError(f"Async database engine is not configured: install the async driver or set {_DB_ASYNC_URL}")
+    async with AsyncSessionLocal() as db:
+        yield db
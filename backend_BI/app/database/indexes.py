@@ -0,0 +1,50 @@
+"""
+Secondary indexes declared on the ORM models.
+
+The indexes are declared in the `__table_args__` of each model. `ensure_indexes()` creates
+the ones missing from an existing database, so it is both called by the loader
+(`save_sqldb.py`) after each import and usable as a migration on a database created before
+the indexes were declared:
+
+    python -m app.database.indexes
+
+Indexes only covering the primary key are skipped, the primary key constraint already indexes it.
+"""
+
+from sqlalchemy import inspect
+from app.database.database import Base
+# Imported so every model is registered on `Base.metadata`
+from app.models import model_commande, models_production, model_stock, model_equipe, model_summary
+
+def ensure_indexes(engine, metadata=Base.metadata) -> list[str]:
+    """
+    Create the model indexes that do not exist yet in the database.
+
+    Tables that do not exist are skipped.
+
+    Args:
+        engine (Engine): SQLAlchemy engine of the target database.
+        metadata (MetaData): Metadata holding the index definitions.
+
+    Returns:
+        list[str]: Names of the created indexes.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        primary_key = [column.name for column in table.primary_key.columns]
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name in existing_indexes or [column.name for column in index.columns] == primary_key:
+                continue
+            index.create(engine)
+            created.append(index.name)
+    return created
+
+if __name__ == "__main__":
+    from app.database.database import engine
+    created = ensure_indexes(engine)
+    print(f"Created indexes: {', '.join(created)}" if created else "All indexes already exist.")
@@ -0,0 +1,111 @@
+"""
+Dialect-agnostic schema helpers used by the loaders.
+
+The tables are created from the ORM models (`app.models`), so the same loader runs on
+SQL Server, PostgreSQL and SQLite:
+- `create_table()` emits the CREATE TABLE of a model table, with its primary and foreign keys
+  but without its secondary indexes, which `ensure_indexes()` builds once the rows are loaded.
+- `drop_tables()` drops model tables, children first.
+- `identity_insert()` allows explicit values in the identity primary key of a table for the
+  duration of a block, as each dialect requires.
+- `align_frame()` renames DataFrame columns to the table's column names and converts
+  timestamps stored in DATE columns, before a DataFrame is written with `to_sql`.
+"""
+
+from contextlib import contextmanager
+import pandas as pd
+from sqlalchemy import Date, DateTime, Table, inspect, text
+from sqlalchemy.schema import CreateTable
+from app.database.database import Base
+# Imported so every model is registered on `Base.metadata`
+from app.models import model_commande, models_production, model_stock, model_equipe, model_summary
+
+def model_table(name: str) -> Table:
+    """
+    The table of a model, by table name (e.g. "Commande").
+
+    Raises:
+        KeyError: If no model maps this table.
+    """
+    return Base.metadata.tables[name]
+
+def create_table(connection, table: Table):
+    """
+    Create a table with its primary and foreign keys; the secondary indexes are left out.
+    """
+    connection.execute(CreateTable(table))
+
+def drop_tables(connection, tables: list[Table]) -> list[str]:
+    """
+    Drop the given tables that exist, in reverse foreign key order (children first).
+
+    Returns:
+        list[str]: Names of the dropped tables.
+    """
+    existing = set(inspect(connection).get_table_names())
+    names = {table.name for table in tables}
+    dropped = []
+    for table in reversed(Base.metadata.sorted_tables):
+        if table.name in names and table.name in existing:
+            table.drop(connection)
+            dropped.append(table.name)
+    return dropped
+
+@contextmanager
+def identity_insert(connection, table: str):
+    """
+    Allow explicit values in the identity primary key of a table while the block runs.
+
+    - SQL Server: `SET IDENTITY_INSERT ... ON/OFF`, when the table has an IDENTITY column.
+    - PostgreSQL: the sequence of the primary key is moved past the largest value afterwards,
+      so rows created later by the API do not collide with the loaded IDs.
+    - SQLite: nothing to do, an INTEGER PRIMARY KEY accepts explicit values and continues after the largest.
+
+    Args:
+        connection (Connection): Open connection, inside the loading transaction.
+        table (str): Table name.
+    """
+    quoted = connection.dialect.identifier_preparer.quote(table)
+    dialect = connection.dialect.name
+    has_identity = False
+    if dialect == "mssql":
+        has_identity = bool(connection.execute(
+            text("SELECT OBJECTPROPERTY(OBJECT_ID(:name), 'TableHasIdentity')"), {"name": table}
+        ).scalar())
+    if has_identity:
+        connection.execute(text(f"SET IDENTITY_INSERT {quoted} ON"))
+    try:
+        yield
+    finally:
+        if has_identity:
+            connection.execute(text(f"SET IDENTITY_INSERT {quoted} OFF"))
+    if dialect == "postgresql":
+        for column in inspect(connection).get_pk_constraint(table)["constrained_columns"]:
+            quoted_column = connection.dialect.identifier_preparer.quote(column)
+            # setval() on a NULL sequence (no serial/identity column) is a no-op
+            connection.execute(text(
+                f"SELECT setval(pg_get_serial_sequence(:table, :column), "
+                f"COALESCE((SELECT MAX({quoted_column}) FROM {quoted}), 0) + 1, false)"
+            ), {"table": quoted, "column": column})
+
+def align_frame(table: Table, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rename the columns of a DataFrame to the column names of a table, case-insensitively,
+    and convert the timestamps of its DATE columns to dates.
+
+    Sheet headers may differ from the model columns by case only (e.g. "Produit_Commandé"),
+    which SQL Server and SQLite ignore but PostgreSQL does not. Unknown columns are kept as is.
+    """
+    columns = {column.name.lower(): column for column in table.columns}
+    renames = {name: columns[name.lower()].name for name in df.columns
+               if name.lower() in columns and columns[name.lower()].name != name}
+    df = df.rename(columns=renames) if renames else df
+    dates = [name for name in df.columns
+             if isinstance(getattr(columns.get(name.lower()), "type", None), Date)
+             and not isinstance(columns[name.lower()].type, DateTime)
+             and pd.api.types.is_datetime64_any_dtype(df[name])]
+    if dates:
+        df = df.copy()
+        for name in dates:
+            df[name] = df[name].dt.date
+    return df
@@ -3,10 +3,13 @@ Main application entry point for backend side.
 
 This module initializes the FastAPI application with metadata and
 registers all defined API routes using the routes_main.include_routes() function.
+Requests and SQL statements are measured by the metrics middleware (see `app.utils.metrics`).
 """
 
 from fastapi import FastAPI
 from app.routes import routes_main
+from app.database import database
+from app.utils.metrics import MetricsMiddleware, instrument_engine
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import os 
@@ -39,7 +42,6 @@ for _var in _required_vars:
 # Reconstruct the full URL
 _frontend_url = f"{_protocol}://{_host}:{_port}"
 
-print("____", _frontend_url)
 # Update this with your frontend's URL (React usually runs on port 5173)
 _origins = [
     _frontend_url,
@@ -52,7 +54,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],                # Allow all HTTP methods (GET, POST, etc.)
     allow_headers=["*"],                # Allow all headers
+    expose_headers=["X-Next-Cursor"],   # Let the frontend read the keyset pagination cursor
 )
+# Time every request and count its SQL statements (exposed at GET /metrics)
+app.add_middleware(MetricsMiddleware)
+instrument_engine(database.engine)
+if database.read_engine is not None:
+    instrument_engine(database.read_engine)
+
 # Register all routes through the centralized router function
 routes_main.include_routes(app)
 
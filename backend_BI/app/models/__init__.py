@@ -3,6 +3,7 @@ This package contains the SQLAlchemy ORM models for the application.
 
 - CommandeModel: Defines the structure of the Commande table and its relationships.
 - ProductionModel: Defines the structure of the Production table and its relationships.
+- ProductionSummaryModel, CommandeSummaryModel, StockSummaryModel: Define the pre-aggregated summary tables read by the KPIs.
 
 These models interact with the database and serve as the foundation for CRUD operations and API routes.
 """
\ No newline at end of file
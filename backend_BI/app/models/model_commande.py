@@ -4,27 +4,34 @@ CommandeModel defines the ORM mapping for the 'Commande' table.
 This model represents customer orders, with fields such as client name,
 ordered product, quantity, status, and date of the order.
 """
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey
+from sqlalchemy import Column, Integer, Unicode, Float, Date, ForeignKey, Index
 from app.database.database import Base 
 from sqlalchemy.orm import relationship
 
 class CommandeModel(Base):
     __tablename__ = "Commande"
 
+    # Secondary indexes on the columns the dashboards group and filter by
+    __table_args__ = (
+        Index("ix_commande_client", "Client"),
+        Index("ix_commande_statut", "Statut"),
+        Index("ix_commande_date_commande", "Date_Commande"),
+    )
+
     # Primary key: Unique identifier for each commande
     id_commande = Column("ID_Commande", Integer, primary_key=True, index=True)
 
     # Name of the client who placed the order
-    client = Column("Client", String)
+    client = Column("Client", Unicode(255))
 
     # Quantity of the product ordered
-    produit_commande = Column("Produit_commandé", String)
+    produit_commande = Column("Produit_commandé", Unicode(255))
     
     # Quantity of the product ordered
     quantite = Column("Quantité", Integer)
     
     # Status of the order (e.g., En cours, Livrée)
-    statut = Column("Statut", String)
+    statut = Column("Statut", Unicode(255))
     
     # Date when the order was placed
     date_commande = Column("Date_Commande", Date)
\ No newline at end of file
@@ -1,12 +1,18 @@
-from sqlalchemy import Column, Integer, String, Date, Float, ForeignKey
+from sqlalchemy import Column, Integer, Unicode, Date, Float, ForeignKey, Index
 from app.database.database import Base 
 
 class StockModel(Base):
     __tablename__ = "Stock"
 
+    # Secondary indexes on the columns the dashboards group and filter by
+    __table_args__ = (
+        Index("ix_stock_produit", "Produit"),
+        Index("ix_stock_lieu_stockage", "Lieu_Stockage"),
+    )
+
     ID_Stock = Column("ID_Stock", Integer, primary_key=True, autoincrement=True, index= True)
-    Produit = Column("Produit", String)
+    Produit = Column("Produit", Unicode(255))
     Quantité_Disponible = Column("Quantité_Disponible", Integer)
-    Lieu_Stockage = Column("Lieu_Stockage", String)
-    Type_Matière = Column("Type_Matière", String)
+    Lieu_Stockage = Column("Lieu_Stockage", Unicode(255))
+    Type_Matière = Column("Type_Matière", Unicode(255))
     Mise_à_Jour = Column("Mise_à_Jour", Date)
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Summary table models, holding pre-aggregated figures per group for the KPI endpoints.
+
+Each row aggregates the source records sharing the same group columns:
+- ProductionSummaryModel: Production records per product and status.
+- CommandeSummaryModel: Commande records per client and status.
+- StockSummaryModel: Stock records per storage location and material type.
+
+The tables are rebuilt by the loader (`save_sqldb.py`) and kept up to date by the
+Production and Commande write paths (see `app.crud.crud_summary`).
+The group columns are NVARCHAR(255) like their source columns, so they can be indexed.
+"""
+
+from sqlalchemy import Column, Integer, Unicode, Float, Index
+from app.database.database import Base
+
+class ProductionSummaryModel(Base):
+    __tablename__ = "Production_Summary"
+
+    # One row per group, the refresh deletes and re-inserts whole groups
+    __table_args__ = (
+        Index("ux_production_summary_group", "Produit", "Statut", unique=True),
+    )
+
+    id_summary = Column("ID_Summary", Integer, primary_key=True, autoincrement=True)
+
+    # Group columns
+    produit = Column("Produit", Unicode(255))
+    statut = Column("Statut", Unicode(255))
+
+    # Number of production records in the group
+    count = Column("Nombre", Integer, nullable=False)
+
+    # Totals of the group (NULLs count as 0)
+    quantite = Column("Quantité", Integer, nullable=False)
+    cout = Column("Coût_Production", Float, nullable=False)
+    revenu = Column("Revenu", Float, nullable=False)
+    temps = Column("Temps_Production", Float, nullable=False)
+
+    # Sum and number of the non-NULL unit prices, to average them over several groups
+    prix_total = Column("Prix_Unitaire_Total", Float, nullable=False)
+    prix_count = Column("Prix_Unitaire_Nombre", Integer, nullable=False)
+
+class CommandeSummaryModel(Base):
+    __tablename__ = "Commande_Summary"
+
+    __table_args__ = (
+        Index("ux_commande_summary_group", "Client", "Statut", unique=True),
+    )
+
+    id_summary = Column("ID_Summary", Integer, primary_key=True, autoincrement=True)
+
+    # Group columns
+    client = Column("Client", Unicode(255))
+    statut = Column("Statut", Unicode(255))
+
+    # Number of commandes and total ordered quantity of the group
+    count = Column("Nombre", Integer, nullable=False)
+    quantite = Column("Quantité", Integer, nullable=False)
+
+class StockSummaryModel(Base):
+    __tablename__ = "Stock_Summary"
+
+    __table_args__ = (
+        Index("ux_stock_summary_group", "Lieu_Stockage", "Type_Matière", unique=True),
+    )
+
+    id_summary = Column("ID_Summary", Integer, primary_key=True, autoincrement=True)
+
+    # Group columns
+    lieu_stockage = Column("Lieu_Stockage", Unicode(255))
+    type_matiere = Column("Type_Matière", Unicode(255))
+
+    # Number of stock records and total available quantity of the group
+    count = Column("Nombre", Integer, nullable=False)
+    quantite_disponible = Column("Quantité_Disponible", Integer, nullable=False)
@@ -6,13 +6,21 @@ Each production record includes details about the product, quantities, costs, an
 It also has a foreign key linking to the corresponding Commande record.
 """
 
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey
+from sqlalchemy import Column, Integer, Unicode, Float, Date, ForeignKey, Index
 from app.database.database import Base 
 from sqlalchemy.orm import relationship
 
 class ProductionModel(Base):
     __tablename__ = "Production"
 
+    # Secondary indexes: per-commande lookups/joins and the columns the dashboards group and filter by
+    __table_args__ = (
+        Index("ix_production_id_commande", "ID_Commande"),
+        Index("ix_production_produit", "Produit"),
+        Index("ix_production_statut", "Statut"),
+        Index("ix_production_date_production", "Date_Production"),
+    )
+
     # Primary key for the production record
     # This is a unique identifier for each production entry
     id_production = Column("ID_Production", Integer, primary_key=True, autoincrement=True, index=True)
@@ -21,13 +29,13 @@ class ProductionModel(Base):
     date_production = Column("Date_Production", Date)
     
     # The name of the produced product (e.g., "Câblage Boeing 737")
-    produit = Column("Produit", String)
+    produit = Column("Produit", Unicode(255))
     
     # The quantity of the product produced
     quantite = Column("Quantité", Integer)
     
     # The current status of the production (e.g., "In progress", "Completed")
-    statut = Column("Statut", String)
+    statut = Column("Statut", Unicode(255))
     
     # The price per unit of the product
     prix_unitaire = Column("Prix_Unitaire", Float)
@@ -6,4 +6,6 @@ Modules:
 - `routes_commande`: Handles API endpoints related to customer orders (commandes).
 - `routes_production`: Handles API endpoints related to production records.
 - `routes_common`: Contains general utility endpoints (e.g., full data deletion).
+- `routes_kpi`: Serves pre-aggregated dashboard KPIs computed in SQL.
+- `routes_export`: Streams whole tables as Arrow IPC or Parquet for BI tools.
 """
@@ -4,40 +4,69 @@ It provides endpoints for performing CRUD (Create, Read, Update, Delete) operati
 
 Each route interacts with the Commande model via the corresponding CRUD functions from the `crud_commande` module.
 
-- **GET /commandes**: Fetch all commandes (orders).
+- **GET /commandes**: Fetch all commandes (orders), with optional filters, sorting, keyset pagination or NDJSON streaming.
 - **GET /commandes/{commande_id}**: Fetch a specific commande by ID.
 - **GET /commandes/filter/without-production**: Fetch commandes that do not have an associated production.
 - **POST /commandes**: Create a new commande.
+- **POST /commandes/bulk**: Create or update many commandes in one transaction.
 - **PUT /commande/{commande_id}**: Update an existing commande by its ID.
 - **DELETE /commande/{commande_id}**: Delete a specific commande by its ID.
 - **DELETE /commandes/without-production**: Delete commandes that have no corresponding production, requires confirmation.
 - **DELETE /commandes**: Delete all commandes, requires confirmation.
+
+The deletion endpoints return the number of deleted commandes and productions.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from app.schemas import schema_commande as cmdSchema
+from app.schemas import schema_common as commonSchema
 from app.crud import crud_commande as crudCmd
 from app.database import database
 from app.models.model_commande import CommandeModel 
+from app.utils.pagination import PageParams, next_cursor_headers, ndjson_response
+from app.utils.cache import cached_json_response
+from app.utils.filters import CommandeFilters
+from pydantic import TypeAdapter
 
 # Create an instance of APIRouter to handle routes for Commande (Order)
 router = APIRouter()
 
+# Response model adapters used to serialize cached list responses
+_commandes_adapter = TypeAdapter(list[cmdSchema.CommandeOut])
+
 #--------------------------- Getting
 @router.get("/commandes", response_model=list[cmdSchema.CommandeOut], summary="(READ) Get all commandes records")
-def read_commandes(db: Session = Depends(database.get_db)):
+def read_commandes(request: Request, page: PageParams = Depends(), filters: CommandeFilters = Depends(), db: Session = Depends(database.get_read_db)):
     """
     Endpoint to fetch all commandes (orders) from the database.
 
+    - **limit** / **after**: Optional keyset pagination, the next cursor is returned in the `X-Next-Cursor` header.
+    - **format**: Set to `ndjson` to stream the records line by line.
+    - **fast**: Set to `true` to serialize plain column rows directly (same JSON shape, no per-record validation).
+    - **date_from** / **date_to**: Optional inclusive range on the commande date.
+    - **statut** / **produit** / **client**: Optional exact values, repeat the parameter to match several.
+    - **quantite_min** / **quantite_max**: Optional inclusive quantity range.
+    - **sort**: Optional field to sort by (`-` prefix for descending), cannot be combined with `after`.
     - **db**: Session dependency to interact with the database.
 
-    Returns a list of all commandes.
+    Raises HTTP 400 if `after` is combined with `sort`.
+
+    Returns the matching commandes, ordered by ID unless `sort` is given.
     """
-    return crudCmd.get_all_commandes(db)
+    if filters.sort is not None and page.after is not None:
+        raise HTTPException(status_code=400, detail="(READ) 'after' cannot be combined with 'sort', the cursor follows the ID order")
+    if page.stream:
+        return ndjson_response(lambda session: crudCmd.stream_commandes(session, page.limit, page.after, filters), cmdSchema.CommandeOut)
+    return cached_json_response(
+        request, "commandes",
+        lambda: (crudCmd.get_all_commandes_rows if page.fast else crudCmd.get_all_commandes)(db, page.limit, page.after, filters),
+        None if page.fast else _commandes_adapter,
+        lambda cmds: {} if filters.sort else next_cursor_headers(cmds, "id_commande", page.limit),
+    )
 
 @router.get("/commandes/{commande_id}", response_model=cmdSchema.CommandeOut, summary="(READ) Get commande record by id")
-def read_commande(commande_id: int, db: Session = Depends(database.get_db)):
+def read_commande(commande_id: int, db: Session = Depends(database.get_read_db)):
     """
     Endpoint to fetch a specific commande by its ID.
 
@@ -54,7 +83,7 @@ def read_commande(commande_id: int, db: Session = Depends(database.get_db)):
     return cmd
 
 @router.get("/commandes/filter/without-production", response_model=list[cmdSchema.CommandeOut], summary="(READ) Get commandes without production")
-def get_commandes_without_production(db: Session = Depends(database.get_db)):
+def get_commandes_without_production(db: Session = Depends(database.get_read_db)):
     """
     Endpoint to fetch all commandes that do not have an associated production record.
 
@@ -79,6 +108,26 @@ def create_commande(commande: cmdSchema.CommandeCreate, db: Session = Depends(da
     new_cmd = CommandeModel(**commande.model_dump())
     return crudCmd.create_commande(db, new_cmd)
 
+@router.post("/commandes/bulk", response_model=commonSchema.BulkWriteOut, summary="(CREATE) create or update many commande records")
+def bulk_upsert_commandes(commandes: list[cmdSchema.CommandeBulkItem], db: Session = Depends(database.get_db)):
+    """
+    Endpoint to create or update many commande records in a single transaction.
+
+    - **commandes**: List of commande records; records with an `id_commande` update the existing one.
+    - **db**: Session dependency to interact with the database.
+
+    Raises HTTP 404 if any provided `id_commande` does not exist.
+    Returns the number of created and updated commandes.
+    """
+    records = [cmd.model_dump() for cmd in commandes]
+
+    commande_ids = {rec["id_commande"] for rec in records if rec["id_commande"] is not None}
+    missing_ids = commande_ids - crudCmd.get_existing_commande_ids(db, list(commande_ids))
+    if missing_ids:
+        raise HTTPException(status_code=404, detail= f"Commande records can not be updated as their IDs {sorted(missing_ids)} were not found")
+
+    return crudCmd.bulk_upsert_commandes(db, records)
+
 # ----------------------------------- Updating
 @router.put("/commande/{commande_id}", response_model=cmdSchema.CommandeOut, summary="(UPDATE) update a commande record")
 def update_commande(commande_id: int, commande_update: cmdSchema.CommandeUpdate, db: Session= Depends(database.get_db)):
@@ -89,20 +138,19 @@ def update_commande(commande_id: int, commande_update: cmdSchema.CommandeUpdate,
     - **commande_update**: The data to update (from CommandeUpdate schema).
     - **db**: Session dependency to interact with the database.
 
-    Raises HTTP 404 if the commande with the provided ID does not exist.
+    Raises HTTP 404 if the commande with the provided ID does not exist (no row updated).
     Returns the updated commande.
     """
-    existing_cmd= crudCmd.get_commande_by_id(db, commande_id)
-    if not existing_cmd:
-        raise HTTPException(status_code=404, detail= f"Commande record can not be updated as its ID {commande_id} was not not found")
-    
     # Convert the update payload into a dictionary, excluding unset fields (so we only update what was sent)
     updates= commande_update.model_dump(exclude_unset= True)
-    
-    return crudCmd.update_commande(db, existing_cmd, updates)
+
+    updated_cmd= crudCmd.update_commande(db, commande_id, updates)
+    if updated_cmd is None:
+        raise HTTPException(status_code=404, detail= f"Commande record can not be updated as its ID {commande_id} was not not found")
+    return updated_cmd
 
 #------------------------------------- Deletion
-@router.delete("/commande/{commande_id}", status_code= 204, summary= "delete a commande record")
+@router.delete("/commande/{commande_id}", response_model= cmdSchema.CommandeDeleteOut, summary= "delete a commande record")
 def delete_commande(commande_id: int, db: Session= Depends(database.get_db)):
     """
     Endpoint to delete a specific commande by its ID.
@@ -110,17 +158,15 @@ def delete_commande(commande_id: int, db: Session= Depends(database.get_db)):
     - **commande_id**: The ID of the commande to delete.
     - **db**: Session dependency to interact with the database.
 
-    Raises HTTP 404 if the commande with the provided ID does not exist.
-    Returns HTTP 204 status on successful deletion.
+    Raises HTTP 404 if the commande with the provided ID does not exist (no row deleted).
+    Returns the number of deleted commandes and productions on successful deletion.
     """
-    existing_cmd= crudCmd.get_commande_by_id(db, commande_id)
-    if not existing_cmd:
+    deleted = crudCmd.delete_commande(db, commande_id)
+    if deleted is None:
         raise HTTPException(status_code= 404, detail= f"(DELETE) commande record with ID {commande_id} was not found")
-    
-    crudCmd.delete_commande(db, existing_cmd)
-    return
+    return deleted
 
-@router.delete("/commandes/without-production", status_code=204, summary="(DEMETE) Delete commandes without production")
+@router.delete("/commandes/without-production", response_model=cmdSchema.CommandeDeleteOut, summary="(DEMETE) Delete commandes without production")
 def delete_commandes_without_production(
     confirm_deletion: str = Query(None, alias="confirm", description="Set to 'true' to confirm deletion"),
     db: Session = Depends(database.get_db)
@@ -132,14 +178,13 @@ def delete_commandes_without_production(
     - **db**: Session dependency to interact with the database.
 
     Returns HTTP 400 if confirmation is not provided.
-    Returns HTTP 204 status on successful deletion.
+    Returns the number of deleted commandes (and no productions) on successful deletion.
     """
     if confirm_deletion != "true":
         raise HTTPException(status_code=400, detail=f"(DELETE) commande records without corresponding production records deletion require Confirmation: set confirm=true.")
-    crudCmd.delete_commandes_without_production(db)
-    return
+    return crudCmd.delete_commandes_without_production(db)
 
-@router.delete("/commandes", status_code= 204, summary= "(DELETE) delete all commandes")
+@router.delete("/commandes", response_model= cmdSchema.CommandeDeleteOut, summary= "(DELETE) delete all commandes")
 def delete_all_commandes(
     confirm_deletion: str =  Query(None, alias="confirm", description= "set to true to confirm deletion"),
     db: Session= Depends(database.get_db)):
@@ -150,9 +195,8 @@ def delete_all_commandes(
     - **db**: Session dependency to interact with the database.
 
     Returns HTTP 400 if confirmation is not provided.
-    Returns HTTP 204 status on successful deletion.
+    Returns the number of deleted commandes and productions on successful deletion.
     """
     if confirm_deletion !="true":
         raise HTTPException(status_code= 400, detail= f"(RECORD) commandes records deletion require Confirmation: set confirm=true.")
-    crudCmd.delete_all_commandes(db)
-    return
+    return crudCmd.delete_all_commandes(db)
@@ -3,14 +3,21 @@ This module defines a single administrative endpoint used for full data deletion
 
 **Use with extreme caution.**
 
-Endpoint:
+Endpoints:
 - DELETE /everything: Deletes all records from all database tables (requires confirmation).
+- GET /database/pool: Reports the connection pool statistics.
+- DELETE /cache: Drops every cached read response (e.g. after reloading the database with `save_sqldb.py`).
+- GET /metrics: Request latency, response size and SQL metrics in the Prometheus text format.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from app.crud import crud_common as crudCommon
 from app.database import database 
+from app.schemas import schema_common as commonSchema
+from app.utils.cache import clear_cache
+from app.utils.metrics import CONTENT_TYPE, render_metrics
 
 router = APIRouter()
 
@@ -38,4 +45,46 @@ def delete_everything(
         crudCommon.delete_all(db)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"(DELETE) All data deletion raised an Internal error during full wipe: {str(e)}")
-    return
\ No newline at end of file
+    return
+
+@router.get("/database/pool", response_model=commonSchema.PoolStatusOut, summary="(READ) Get connection pool statistics")
+def read_pool_status():
+    """
+    Report the configuration and current usage of the database connection pool.
+
+    Useful to spot pool exhaustion (`checked_out` close to `size` + `max_overflow`) under load.
+    """
+    return database.get_pool_status()
+
+@router.delete("/cache", status_code=204, summary="(DELETE) Clear the read response cache")
+def delete_cache():
+    """
+    Drop every cached read response.
+
+    Writes made through the API invalidate the cache on their own; call this endpoint
+    after loading data from outside the API (e.g. `save_sqldb.py`) to serve it immediately.
+    """
+    clear_cache()
+    return
+
+@router.get("/metrics", response_class=PlainTextResponse, summary="(READ) Get the Prometheus metrics")
+def read_metrics():
+    """
+    Expose the request and database metrics in the Prometheus text format.
+
+    Per route: latency, response size, number of SQL statements and SQL time histograms
+    (see `app.utils.metrics`), followed by the connection pool gauges and, when a read
+    replica is configured, whether it is in use and its replication lag.
+    """
+    pool = database.get_pool_status()
+    gauges = {
+        "db_pool_size": ("Number of connections kept open in the pool.", pool["size"]),
+        "db_pool_checked_out": ("Number of connections currently in use.", pool["checked_out"]),
+        "db_pool_checked_in": ("Number of idle connections in the pool.", pool["checked_in"]),
+        "db_pool_overflow": ("Number of overflow connections currently open.", pool["overflow"]),
+    }
+    replica = database.get_replica_status()
+    if replica["configured"]:
+        gauges["db_read_replica_in_use"] = ("1 when read-only routes use the read replica, 0 when they use the primary.", int(replica["in_use"]))
+        gauges["db_read_replica_lag_seconds"] = ("Last measured replication lag of the read replica.", replica["lag_seconds"])
+    return PlainTextResponse(render_metrics(gauges), media_type=CONTENT_TYPE)
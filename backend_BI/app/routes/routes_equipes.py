@@ -1,26 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from app.schemas import schema_equipe as equipeSchema
 from app.crud import crud_equipe as crudEquipe
 from app.database import database
+from app.utils.pagination import PageParams, next_cursor_headers, ndjson_response
+from app.utils.cache import cached_json_response
+from pydantic import TypeAdapter
 
 # Create an instance of APIRouter to handle routes for Equipe
 router = APIRouter()
 
+# Response model adapters used to serialize cached list responses
+_equipes_adapter = TypeAdapter(list[equipeSchema.EquipeOut])
+
 # ---------------------------------- Getting
 @router.get("/equipes", response_model=list[equipeSchema.EquipeOut], summary="(READ) Get all equipe records")
-def read_equipes(db: Session = Depends(database.get_db)):
+def read_equipes(request: Request, page: PageParams = Depends(), db: Session = Depends(database.get_read_db)):
     """
     Retrieve all equipe records from the database.
 
+    - **limit** / **after**: Optional keyset pagination, the next cursor is returned in the `X-Next-Cursor` header.
+    - **format**: Set to `ndjson` to stream the records line by line.
+    - **fast**: Set to `true` to serialize plain column rows directly (same JSON shape, no per-record validation).
     - **db**: Database session dependency.
 
-    Returns a list of all `Equipe` records.
+    Returns a list of all `Equipe` records, ordered by ID.
     """
-    return crudEquipe.get_all_equipes(db)
+    if page.stream:
+        return ndjson_response(lambda session: crudEquipe.stream_equipes(session, page.limit, page.after), equipeSchema.EquipeOut)
+    return cached_json_response(
+        request, "equipes",
+        lambda: (crudEquipe.get_all_equipes_rows if page.fast else crudEquipe.get_all_equipes)(db, page.limit, page.after),
+        None if page.fast else _equipes_adapter,
+        lambda equipes: next_cursor_headers(equipes, "ID_Équipe", page.limit),
+    )
 
 @router.get("/equipes/{equipe_id}", response_model=equipeSchema.EquipeOut, summary="(READ) Get equipe record by id")
-def read_equipe(equipe_id: int, db: Session = Depends(database.get_db)):
+def read_equipe(equipe_id: int, db: Session = Depends(database.get_read_db)):
     """
     Retrieve a specific equipe record by ID.
 
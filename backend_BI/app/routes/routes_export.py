@@ -0,0 +1,81 @@
+"""
+This module defines the FastAPI routes exporting whole tables in columnar formats for BI tools.
+
+Tables are streamed batch by batch, so large extracts never have to fit in memory
+and clients (Power BI, notebooks) load typed columns without parsing JSON.
+
+Endpoints:
+- GET /export/{table}.arrow: Stream a table as Arrow IPC record batches.
+- GET /export/{table}.parquet: Stream a table as a Parquet file.
+
+Available tables: `production`, `commande`, `stock`, `equipe`.
+`date_from` / `date_to` filter on `Date_Production`, `Date_Commande` or `Mise_à_Jour` (not available for `equipe`).
+"""
+
+from datetime import date
+from enum import Enum
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.crud import crud_export as crudExport
+from app.utils.arrow_export import stream_table, ARROW_MEDIA_TYPE, PARQUET_MEDIA_TYPE
+
+# Create an instance of APIRouter to handle export routes
+router = APIRouter()
+
+# Table names accepted in the URL (restricts the path parameter and documents it in OpenAPI)
+ExportTable = Enum("ExportTable", {name: name for name in crudExport.EXPORT_TABLES}, type=str)
+
+def _export(table: ExportTable, file_format: str, media_type: str, date_from: Optional[date], date_to: Optional[date]):
+    """
+    Build the streaming response shared by both export formats.
+
+    Raises 400 if a date filter is requested on a table without date column.
+    """
+    _, date_column = crudExport.EXPORT_TABLES[table.value]
+    if date_column is None and (date_from is not None or date_to is not None):
+        raise HTTPException(status_code=400, detail=f"(EXPORT) table '{table.value}' has no date column: date_from/date_to are not supported")
+
+    chunks = stream_table(
+        lambda session: crudExport.iter_export_batches(session, table.value, date_from, date_to),
+        crudExport.get_export_columns(table.value),
+        file_format,
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{table.value}.{file_format}"'},
+    )
+
+# ---------------------------------- Getting
+@router.get("/export/{table}.arrow", response_class=StreamingResponse, summary="(READ) Export a table as an Arrow IPC stream")
+def export_arrow(
+    table: ExportTable,
+    date_from: Optional[date] = Query(None, description="Keep rows dated on or after this day"),
+    date_to: Optional[date] = Query(None, description="Keep rows dated on or before this day"),
+):
+    """
+    Stream a whole table as Arrow IPC record batches.
+
+    - **table**: The table to export.
+    - **date_from** / **date_to**: Optional inclusive date range.
+
+    Raises 400 if a date range is requested for a table without date column.
+    """
+    return _export(table, "arrow", ARROW_MEDIA_TYPE, date_from, date_to)
+
+@router.get("/export/{table}.parquet", response_class=StreamingResponse, summary="(READ) Export a table as a Parquet file")
+def export_parquet(
+    table: ExportTable,
+    date_from: Optional[date] = Query(None, description="Keep rows dated on or after this day"),
+    date_to: Optional[date] = Query(None, description="Keep rows dated on or before this day"),
+):
+    """
+    Stream a whole table as a Parquet file (one row group per batch).
+
+    - **table**: The table to export.
+    - **date_from** / **date_to**: Optional inclusive date range.
+
+    Raises 400 if a date range is requested for a table without date column.
+    """
+    return _export(table, "parquet", PARQUET_MEDIA_TYPE, date_from, date_to)
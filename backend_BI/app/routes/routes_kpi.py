@@ -0,0 +1,95 @@
+"""
+This module defines the FastAPI routes serving pre-aggregated KPIs for the dashboard.
+
+The aggregates are read from the summary tables by the `crud_kpi` module, so each response
+stays a few hundred bytes regardless of the number of stored records.
+Responses are cached (namespace "kpis") until a production or commande write invalidates them;
+the team heatmaps are cached with the team records (namespace "equipes").
+
+Endpoints:
+- GET /kpis/production: Global production totals and averages.
+- GET /kpis/production/status: Number of production records per status.
+- GET /kpis/production/products: Quantity, cost, revenue and gain per product.
+- GET /kpis/commandes/clients: Number of commandes and ordered quantity per client and status.
+- GET /kpis/stock/locations: Number of stock records and available quantity per location and material.
+- GET /kpis/equipes/heatmap: Availability, work hours and staff heatmaps of the teams (team x day).
+"""
+
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+from app.schemas import schema_kpi as kpiSchema
+from app.crud import crud_kpi as crudKpi
+from app.database import database
+from app.utils.cache import cached_json_response
+from pydantic import TypeAdapter
+
+# Create an instance of APIRouter to handle KPI routes
+router = APIRouter()
+
+# Response model adapters used to serialize cached responses
+_summary_adapter = TypeAdapter(kpiSchema.ProductionSummaryOut)
+_status_counts_adapter = TypeAdapter(list[kpiSchema.ProductionStatusCountOut])
+_product_totals_adapter = TypeAdapter(list[kpiSchema.ProductionProductTotalsOut])
+_client_totals_adapter = TypeAdapter(list[kpiSchema.CommandeClientTotalsOut])
+_stock_totals_adapter = TypeAdapter(list[kpiSchema.StockLocationTotalsOut])
+_team_heatmap_adapter = TypeAdapter(kpiSchema.TeamHeatmapOut)
+
+# ---------------------------------- Getting
+@router.get("/kpis/production", response_model=kpiSchema.ProductionSummaryOut, summary="(READ) Get production summary KPIs")
+def read_production_summary(request: Request, db: Session = Depends(database.get_read_db)):
+    """
+    Retrieve global production totals and averages computed in the database.
+
+    - **db**: Database session dependency.
+
+    Returns totals (count, quantity, cost, revenue, time), unit averages and the most produced product.
+    """
+    return cached_json_response(request, "kpis", lambda: crudKpi.get_production_summary(db), _summary_adapter)
+
+@router.get("/kpis/production/status", response_model=list[kpiSchema.ProductionStatusCountOut], summary="(READ) Get production counts per status")
+def read_production_status_counts(request: Request, db: Session = Depends(database.get_read_db)):
+    """
+    Retrieve the number of production records per status.
+
+    - **db**: Database session dependency.
+    """
+    return cached_json_response(request, "kpis", lambda: crudKpi.get_production_status_counts(db), _status_counts_adapter)
+
+@router.get("/kpis/production/products", response_model=list[kpiSchema.ProductionProductTotalsOut], summary="(READ) Get production totals per product")
+def read_production_totals_per_product(request: Request, db: Session = Depends(database.get_read_db)):
+    """
+    Retrieve quantity, cost, revenue and gain aggregated per product.
+
+    - **db**: Database session dependency.
+    """
+    return cached_json_response(request, "kpis", lambda: crudKpi.get_production_totals_per_product(db), _product_totals_adapter)
+
+@router.get("/kpis/commandes/clients", response_model=list[kpiSchema.CommandeClientTotalsOut], summary="(READ) Get commande totals per client and status")
+def read_commande_totals_per_client(request: Request, db: Session = Depends(database.get_read_db)):
+    """
+    Retrieve the number of commandes and ordered quantity per client and status.
+
+    - **db**: Database session dependency.
+    """
+    return cached_json_response(request, "kpis", lambda: crudKpi.get_commande_totals_per_client(db), _client_totals_adapter)
+
+@router.get("/kpis/stock/locations", response_model=list[kpiSchema.StockLocationTotalsOut], summary="(READ) Get stock totals per location and material")
+def read_stock_totals_per_location(request: Request, db: Session = Depends(database.get_read_db)):
+    """
+    Retrieve the number of stock records and available quantity per storage location and material type.
+
+    - **db**: Database session dependency.
+    """
+    return cached_json_response(request, "kpis", lambda: crudKpi.get_stock_totals_per_location(db), _stock_totals_adapter)
+
+@router.get("/kpis/equipes/heatmap", response_model=kpiSchema.TeamHeatmapOut, summary="(READ) Get the team heatmaps")
+def read_team_heatmap(request: Request, db: Session = Depends(database.get_read_db)):
+    """
+    Retrieve the availability, work hours and staff heatmaps of the teams, pivoted on the server.
+
+    - **db**: Database session dependency.
+
+    Returns the day and team labels and, for each heatmap, a team x day matrix with its min/max,
+    color scale range and legend buckets.
+    """
+    return cached_json_response(request, "equipes", lambda: crudKpi.get_team_heatmap(db), _team_heatmap_adapter)
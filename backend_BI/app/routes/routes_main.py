@@ -5,7 +5,7 @@ Each router is grouped under a specific tag for better organization in API docum
 """
 
 from fastapi import FastAPI
-from app.routes import routes_production, routes_commande, routes_common, routes_equipes, routes_stock
+from app.routes import routes_production, routes_commande, routes_common, routes_equipes, routes_stock, routes_kpi, routes_export, routes_timeseries
 
 def include_routes(app: FastAPI):
     """
@@ -16,6 +16,9 @@ def include_routes(app: FastAPI):
     - **Production**: Endpoints related to production records.
     - **Commande**: Endpoints related to customer orders (commandes).
     - **Common**: General or utility endpoints (e.g., global data deletion).
+    - **KPIs**: Pre-aggregated dashboard indicators computed in the database.
+    - **Export**: Columnar (Arrow / Parquet) table exports for BI tools.
+    - **Time series**: Production and commande figures bucketed by day, week or month.
 
     Args:
         app (FastAPI): The FastAPI application instance.
@@ -24,4 +27,7 @@ def include_routes(app: FastAPI):
     app.include_router(routes_commande.router, tags=["Commande"])
     app.include_router(routes_common.router, tags=["Common"])
     app.include_router(routes_equipes.router, tags=["Equipes"])
-    app.include_router(routes_stock.router, tags=["Stocks"])
\ No newline at end of file
+    app.include_router(routes_stock.router, tags=["Stocks"])
+    app.include_router(routes_kpi.router, tags=["KPIs"])
+    app.include_router(routes_export.router, tags=["Export"])
+    app.include_router(routes_timeseries.router, tags=["Time series"])
\ No newline at end of file
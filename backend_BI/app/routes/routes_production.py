@@ -4,54 +4,103 @@ It includes endpoints for listing, retrieving, creating, updating, and deleting
 as well as retrieving production data in a flattened schema format and by related `Commande` ID.
 
 Endpoints:
-- GET /productions: List all production records.
-- GET /productions/flat: List all production records (flattened format).
+- GET /productions: List production records (filters, sorting, keyset pagination and NDJSON streaming supported).
+- GET /productions/flat: List all production records (flattened format, same options).
 - GET /productions/{id}: Get a specific production by ID.
 - GET /productions/flat/{id}: Get a specific flat production by ID.
 - GET /productions/by_command_id/{commande_id}: Get productions by associated commande ID.
 - GET /productions/by_command_id/flat/{commande_id}: Same as above, flattened.
 - POST /productions: Create a new production.
+- POST /productions/bulk: Create or update many productions in one transaction.
 - PUT /production/{id}: Update an existing production.
 - DELETE /production/{id}: Delete a specific production.
 - DELETE /productions: Delete all productions (requires confirmation).
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.schemas import schema_production as prodSchema
+from app.schemas import schema_common as commonSchema
 from app.crud import crud_production as crudProd
 from app.crud import crud_commande as crudCmd
 from app.database import database
 from app.models.models_production import ProductionModel
+from app.utils.pagination import PageParams, next_cursor_headers, ndjson_response
+from app.utils.cache import cached_json_response
+from app.utils.filters import ProductionFilters
+from pydantic import TypeAdapter
 
 # Create an instance of APIRouter to handle routes for Commande (Order)
 router = APIRouter()
 
+# Response model adapters used to serialize cached list responses
+_productions_adapter = TypeAdapter(list[prodSchema.ProductionOut])
+_productions_flat_adapter = TypeAdapter(list[prodSchema.ProductionFlatOut])
+
 # ---------------------------------- Getting
 @router.get("/productions", response_model=list[prodSchema.ProductionOut], summary="(READ) Get all production records")
-def read_productions(db: Session = Depends(database.get_db)):
+def read_productions(request: Request, page: PageParams = Depends(), filters: ProductionFilters = Depends(), db: Session = Depends(database.get_read_db)):
     """
     Retrieve all production records from the database.
 
+    - **limit** / **after**: Optional keyset pagination, the next cursor is returned in the `X-Next-Cursor` header.
+    - **format**: Set to `ndjson` to stream the records line by line.
+    - **fast**: Set to `true` to serialize plain column rows directly (same JSON shape, no per-record validation).
+    - **date_from** / **date_to**: Optional inclusive range on the production date.
+    - **statut** / **produit**: Optional exact values, repeat the parameter to match several.
+    - **client**: Optional client of the related commande, repeat the parameter to match several.
+    - **quantite_min** / **quantite_max**: Optional inclusive quantity range.
+    - **sort**: Optional field to sort by (`-` prefix for descending), cannot be combined with `after`.
     - **db**: Database session dependency.
 
-    Returns a list of all `Production` records.
+    Raises 400 if `after` is combined with `sort`.
+
+    Returns the matching `Production` records, ordered by ID unless `sort` is given.
     """
-    return crudProd.get_all_productions(db)
+    if filters.sort is not None and page.after is not None:
+        raise HTTPException(status_code=400, detail="(READ) 'after' cannot be combined with 'sort', the cursor follows the ID order")
+    if page.stream:
+        return ndjson_response(lambda session: crudProd.stream_productions(session, page.limit, page.after, filters), prodSchema.ProductionOut)
+    return cached_json_response(
+        request, "productions",
+        lambda: (crudProd.get_all_productions_rows if page.fast else crudProd.get_all_productions)(db, page.limit, page.after, filters),
+        None if page.fast else _productions_adapter,
+        lambda prods: {} if filters.sort else next_cursor_headers(prods, "id_production", page.limit),
+    )
 
 @router.get("/productions/flat", response_model= list[prodSchema.ProductionFlatOut], summary="(READ) Get all production flat records")
-def read_productions_flat(db: Session= Depends(database.get_db)):
+def read_productions_flat(request: Request, page: PageParams = Depends(), filters: ProductionFilters = Depends(), db: Session= Depends(database.get_read_db)):
     """
     Retrieve all production records in a flat schema format.
 
+    - **limit** / **after**: Optional keyset pagination, the next cursor is returned in the `X-Next-Cursor` header.
+    - **format**: Set to `ndjson` to stream the records line by line.
+    - **fast**: Set to `true` to serialize plain column rows directly (same JSON shape, no per-record validation).
+    - **date_from** / **date_to**: Optional inclusive range on the production date.
+    - **statut** / **produit**: Optional exact values, repeat the parameter to match several.
+    - **client**: Optional client of the related commande, repeat the parameter to match several.
+    - **quantite_min** / **quantite_max**: Optional inclusive quantity range.
+    - **sort**: Optional field to sort by (`-` prefix for descending), cannot be combined with `after`.
     - **db**: Database session dependency.
 
-    Returns a list of flattened `Production` records.
+    Raises 400 if `after` is combined with `sort`.
+
+    Returns the matching flattened `Production` records, ordered by ID unless `sort` is given.
     """
-    return crudProd.get_all_productions_flat(db)
+    if filters.sort is not None and page.after is not None:
+        raise HTTPException(status_code=400, detail="(READ) 'after' cannot be combined with 'sort', the cursor follows the ID order")
+    if page.stream:
+        return ndjson_response(lambda session: crudProd.stream_productions_flat(session, page.limit, page.after, filters), prodSchema.ProductionFlatOut)
+    return cached_json_response(
+        request, "productions",
+        lambda: (crudProd.get_all_productions_flat_rows if page.fast else crudProd.get_all_productions_flat)(db, page.limit, page.after, filters),
+        None if page.fast else _productions_flat_adapter,
+        lambda prods_flat: {} if filters.sort else next_cursor_headers(prods_flat, "id_production", page.limit),
+    )
 
 @router.get("/productions/{production_id}", response_model=prodSchema.ProductionOut, summary="(READ) Get production record by id")
-def read_production(production_id: int, db: Session = Depends(database.get_db)):
+def read_production(production_id: int, db: Session = Depends(database.get_read_db)):
     """
     Retrieve a specific production record by ID.
 
@@ -66,7 +115,7 @@ def read_production(production_id: int, db: Session = Depends(database.get_db)):
     return prod
 
 @router.get("/productions/flat/{production_id}", response_model= prodSchema.ProductionFlatOut, summary= "(READ) Get flat production by id")
-def read_production_flat(production_id: int, db: Session= Depends(database.get_db)):
+def read_production_flat(production_id: int, db: Session= Depends(database.get_read_db)):
     """
     Retrieve a specific production record by ID in flat format.
 
@@ -82,7 +131,7 @@ def read_production_flat(production_id: int, db: Session= Depends(database.get_d
 
 # related_productions= get_productions_by_commande_id(db, cmd.id_commande)
 @router.get("/productions/by_command_id/{commande_id}", response_model= list[prodSchema.ProductionOut], summary= "(READ) Get productions records by commande id")
-def read_production_by_commande_id(commande_id: int, db: Session= Depends(database.get_db)):
+def read_production_by_commande_id(commande_id: int, db: Session= Depends(database.get_read_db)):
     """
     Retrieve production records associated with a specific `Commande` ID.
 
@@ -93,7 +142,7 @@ def read_production_by_commande_id(commande_id: int, db: Session= Depends(databa
 
 # related_productions= get_productions_by_commande_id(db, cmd.id_commande)
 @router.get("/productions/by_command_id/flat/{commande_id}", response_model= list[prodSchema.ProductionFlatOut], summary= "(READ) Get productions flat records by commande id")
-def read_productions_flat_by_commande_id(commande_id: int, db: Session= Depends(database.get_db)):
+def read_productions_flat_by_commande_id(commande_id: int, db: Session= Depends(database.get_read_db)):
     """
     Retrieve flat-format production records associated with a specific `Commande` ID.
 
@@ -102,6 +151,13 @@ def read_productions_flat_by_commande_id(commande_id: int, db: Session= Depends(
     """
     return crudProd.get_productions_flat_by_commande_id(db, commande_id)
 
+def _is_foreign_key_violation(error: IntegrityError) -> bool:
+    # SQLSTATE 23503 (PostgreSQL drivers), message otherwise (SQLite, SQL Server error 547)
+    orig = error.orig
+    if getattr(orig, "pgcode", None) == "23503" or getattr(orig, "sqlstate", None) == "23503":
+        return True
+    return "FOREIGN KEY" in str(orig).upper()
+
 # ------------------------------ Creation
 @router.post("/productions", response_model=prodSchema.ProductionOut, summary="(CREATE) Create a new production record")
 def create_production(production: prodSchema.ProductionCreate, db: Session = Depends(database.get_db)):
@@ -111,15 +167,47 @@ def create_production(production: prodSchema.ProductionCreate, db: Session = Dep
     - **production**: Input schema for creating a production.
     - **db**: Database session dependency.
 
-    Raises 400 if the associated `Commande` ID does not exist.
+    Raises 400 if the associated `Commande` ID does not exist (enforced by the foreign key constraint).
     """
-    if not crudCmd.get_commande_by_id(db, production.id_commande):
+    new_prod = ProductionModel(**production.model_dump())
+    try:
+        return crudProd.create_production(db, new_prod)
+    except IntegrityError as e:
+        if not _is_foreign_key_violation(e):
+            raise
         raise HTTPException(
             status_code=400,
             detail= f"(CREATE) new production record can not be created as the corresponding commande record with requested ID {production.id_commande} does not exist."
         )
-    new_prod = ProductionModel(**production.model_dump())
-    return crudProd.create_production(db, new_prod)
+
+@router.post("/productions/bulk", response_model=commonSchema.BulkWriteOut, summary="(CREATE) Create or update many production records")
+def bulk_upsert_productions(productions: list[prodSchema.ProductionBulkItem], db: Session = Depends(database.get_db)):
+    """
+    Create or update many production records in a single transaction.
+
+    - **productions**: List of production records; records with an `id_production` update the existing one.
+    - **db**: Database session dependency.
+
+    Raises 400 if any referenced `Commande` ID does not exist.
+    Raises 404 if any provided `id_production` does not exist.
+    """
+    records = [prod.model_dump() for prod in productions]
+
+    # Validate all foreign keys with a single IN query
+    commande_ids = {rec["id_commande"] for rec in records}
+    missing_cmd_ids = commande_ids - crudCmd.get_existing_commande_ids(db, list(commande_ids))
+    if missing_cmd_ids:
+        raise HTTPException(
+            status_code=400,
+            detail= f"(CREATE) production records can not be created as the corresponding commande records with requested IDs {sorted(missing_cmd_ids)} do not exist."
+        )
+
+    production_ids = {rec["id_production"] for rec in records if rec["id_production"] is not None}
+    missing_prod_ids = production_ids - crudProd.get_existing_production_ids(db, list(production_ids))
+    if missing_prod_ids:
+        raise HTTPException(status_code=404, detail= f"(UPDATE) Production records with IDs {sorted(missing_prod_ids)} to be updated were not found")
+
+    return crudProd.bulk_upsert_productions(db, records)
 
 # -------------------------- Updating
 @router.put("/production/{production_id}", response_model=prodSchema.ProductionOut, summary="(UPDATE) Update a production record")
@@ -131,22 +219,21 @@ def update_production(production_id: int, production_update: prodSchema.Producti
     - **production_update**: Partial update schema.
     - **db**: Database session dependency.
 
-    Raises 404 if production is not found.
-    Raises 400 if the new `Commande` ID (if provided) does not exist.
+    Raises 404 if production is not found (no row updated).
+    Raises 400 if the new `Commande` ID (if provided) does not exist (enforced by the foreign key constraint).
     """
-    existing_prod= crudProd.get_production_flat_by_id(db, production_id)
-    if not existing_prod:
-        raise HTTPException(status_code=404, detail= f"(UPDATE) Production record with ID {production_id} to be updated was not found")
-    
     # Convert the update payload into a dictionary, excluding unset fields (so we only update what was sent)
     updates= production_update.model_dump(exclude_unset= True)
 
-    # if the foreign key of the corresponding commande record is to be updared, verify its existing 
-    if 'id_commande' in updates and updates['id_commande'] is not None:
-        if not crudCmd.get_commande_by_id(db, updates['id_commande']):
-            raise HTTPException(status_code= 400, detail= f"(UPDATE) existing production record can not be updated as the the requested commande record with ID {updates['id_commande']} does not exist")
-        
-    return crudProd.update_production(db, existing_prod, updates)
+    try:
+        updated_prod= crudProd.update_production(db, production_id, updates)
+    except IntegrityError as e:
+        if "id_commande" not in updates or not _is_foreign_key_violation(e):
+            raise
+        raise HTTPException(status_code= 400, detail= f"(UPDATE) existing production record can not be updated as the the requested commande record with ID {updates.get('id_commande')} does not exist")
+    if updated_prod is None:
+        raise HTTPException(status_code=404, detail= f"(UPDATE) Production record with ID {production_id} to be updated was not found")
+    return updated_prod
 
 # --------------------------------- Deletion
 @router.delete("/production/{production_id}", status_code= 204, summary="(DELETE) delete a production record")
@@ -157,13 +244,10 @@ def delete_production(production_id: int, db: Session= Depends(database.get_db))
     - **production_id**: The ID of the production to delete.
     - **db**: Database session dependency.
 
-    Raises 404 if the record does not exist.
+    Raises 404 if the record does not exist (no row deleted).
     """
-    existing_prod= crudProd.get_production_by_id(db, production_id)
-    if not existing_prod:
+    if not crudProd.delete_production(db, production_id):
         raise HTTPException(status_code=404, detail= f"(DELETE) Production record with ID {production_id} was not found")
-    
-    crudProd.delete_production(db, existing_prod)
     return 
 
 @router.delete("/productions", status_code= 204, summary= "(DELETE) Delete all production records")
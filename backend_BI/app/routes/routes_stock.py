@@ -1,26 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from app.schemas import schema_stock as stockSchema
 from app.crud import crud_stock as crudStock
 from app.database import database
+from app.utils.pagination import PageParams, next_cursor_headers, ndjson_response
+from app.utils.cache import cached_json_response
+from pydantic import TypeAdapter
 
 # Create an instance of APIRouter to handle routes for Stock
 router = APIRouter()
 
+# Response model adapters used to serialize cached list responses
+_stock_adapter = TypeAdapter(list[stockSchema.StockOut])
+
 # ---------------------------------- Getting
 @router.get("/stocks", response_model=list[stockSchema.StockOut], summary="(READ) Get all stock records")
-def read_stocks(db: Session = Depends(database.get_db)):
+def read_stocks(request: Request, page: PageParams = Depends(), db: Session = Depends(database.get_read_db)):
     """
     Retrieve all stock records from the database.
 
+    - **limit** / **after**: Optional keyset pagination, the next cursor is returned in the `X-Next-Cursor` header.
+    - **format**: Set to `ndjson` to stream the records line by line.
+    - **fast**: Set to `true` to serialize plain column rows directly (same JSON shape, no per-record validation).
     - **db**: Database session dependency.
 
-    Returns a list of all `Stock` records.
+    Returns a list of all `Stock` records, ordered by ID.
     """
-    return crudStock.get_all_stock(db)
+    if page.stream:
+        return ndjson_response(lambda session: crudStock.stream_stock(session, page.limit, page.after), stockSchema.StockOut)
+    return cached_json_response(
+        request, "stocks",
+        lambda: (crudStock.get_all_stock_rows if page.fast else crudStock.get_all_stock)(db, page.limit, page.after),
+        None if page.fast else _stock_adapter,
+        lambda stocks: next_cursor_headers(stocks, "ID_Stock", page.limit),
+    )
 
 @router.get("/stocks/{stock_id}", response_model=stockSchema.StockOut, summary="(READ) Get stock record by id")
-def read_stock(stock_id: int, db: Session = Depends(database.get_db)):
+def read_stock(stock_id: int, db: Session = Depends(database.get_read_db)):
     """
     Retrieve a specific stock record by ID.
 
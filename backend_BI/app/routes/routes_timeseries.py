@@ -0,0 +1,83 @@
+"""
+This module defines the FastAPI routes serving time-bucketed series for the dashboard charts.
+
+The buckets are computed in SQL by the `crud_timeseries` module, so each response holds one
+record per bucket (and group) regardless of the number of stored records.
+Responses are cached with the lists they are computed from (namespaces "productions" and
+"commandes"), so any write to these tables invalidates them.
+
+Endpoints:
+- GET /timeseries/productions: Production count, quantity, cost and revenue per day, week or month.
+- GET /timeseries/commandes: Commande count and quantity per day, week or month.
+"""
+
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+from app.schemas import schema_timeseries as tsSchema
+from app.crud import crud_timeseries as crudTs
+from app.database import database
+from app.utils.cache import cached_json_response
+from pydantic import TypeAdapter
+
+# Create an instance of APIRouter to handle time series routes
+router = APIRouter()
+
+# Response model adapters used to serialize cached responses
+_production_buckets_adapter = TypeAdapter(list[tsSchema.ProductionBucketOut])
+_commande_buckets_adapter = TypeAdapter(list[tsSchema.CommandeBucketOut])
+
+_INTERVAL_PATTERN = "^(day|week|month)$"
+_SPLIT_PATTERN = "^(produit|statut)$"
+
+# ---------------------------------- Getting
+@router.get("/timeseries/productions", response_model=list[tsSchema.ProductionBucketOut], summary="(READ) Get production time series")
+def read_production_timeseries(
+    request: Request,
+    interval: str = Query("day", pattern=_INTERVAL_PATTERN, description="Bucket size: day, week (starting on Monday) or month"),
+    split: Optional[str] = Query(None, pattern=_SPLIT_PATTERN, description="Split the series by 'produit' or 'statut'"),
+    date_from: Optional[date] = Query(None, description="Only productions on or after this date"),
+    date_to: Optional[date] = Query(None, description="Only productions on or before this date"),
+    db: Session = Depends(database.get_read_db),
+):
+    """
+    Retrieve production count, quantity, cost and revenue per time bucket.
+
+    - **interval**: `day` (default), `week` or `month`.
+    - **split**: Optional `produit` or `statut`, one series per value (in the `group` field).
+    - **date_from** / **date_to**: Optional inclusive range on the production date.
+    - **db**: Database session dependency.
+
+    Returns one record per bucket (and group), ordered by bucket.
+    """
+    return cached_json_response(
+        request, "productions",
+        lambda: crudTs.get_production_timeseries(db, interval, split, date_from, date_to),
+        _production_buckets_adapter,
+    )
+
+@router.get("/timeseries/commandes", response_model=list[tsSchema.CommandeBucketOut], summary="(READ) Get commande time series")
+def read_commande_timeseries(
+    request: Request,
+    interval: str = Query("day", pattern=_INTERVAL_PATTERN, description="Bucket size: day, week (starting on Monday) or month"),
+    split: Optional[str] = Query(None, pattern=_SPLIT_PATTERN, description="Split the series by 'produit' or 'statut'"),
+    date_from: Optional[date] = Query(None, description="Only commandes placed on or after this date"),
+    date_to: Optional[date] = Query(None, description="Only commandes placed on or before this date"),
+    db: Session = Depends(database.get_read_db),
+):
+    """
+    Retrieve commande count and quantity per time bucket.
+
+    - **interval**: `day` (default), `week` or `month`.
+    - **split**: Optional `produit` or `statut`, one series per value (in the `group` field).
+    - **date_from** / **date_to**: Optional inclusive range on the commande date.
+    - **db**: Database session dependency.
+
+    Returns one record per bucket (and group), ordered by bucket.
+    """
+    return cached_json_response(
+        request, "commandes",
+        lambda: crudTs.get_commande_timeseries(db, interval, split, date_from, date_to),
+        _commande_buckets_adapter,
+    )
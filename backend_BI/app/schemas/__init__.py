@@ -5,4 +5,7 @@ Schemas are designed to interact with FastAPI endpoints to provide data validati
 Schemas are categorized by domain models:
 - schema_Commande: Represents schema classes for "Commande" (Order) entities.
 - schema_Production: Represents schema classes for "Production" entities.
+- schema_kpi: Represents schema classes for the pre-aggregated KPI results.
+- schema_timeseries: Represents schema classes for the time series buckets.
+- schema_common: Represents schema classes shared by several resources (e.g., bulk write summaries).
 """
\ No newline at end of file
@@ -6,6 +6,8 @@ Schemas are used for input validation, response modeling, and converting data be
 - CommandeCreate: Schema for creating new Commande records (inherits from CommandeBase).
 - CommandeOut: Schema for Commande output with an ID included (inherits from CommandeBase).
 - CommandeUpdate: Schema for updating Commande records with optional fields.
+- CommandeBulkItem: Schema for a single record of a bulk create/upsert request.
+- CommandeDeleteOut: Number of records removed by a commande deletion.
 """
 
 from pydantic import BaseModel
@@ -70,4 +72,25 @@ class CommandeUpdate(BaseModel):
     produit_commande: Optional[str]= None
     quantite: Optional[int]= None
     statut: Optional[str]= None
-    date_commande: Optional[date]= None
\ No newline at end of file
+    date_commande: Optional[date]= None
+
+class CommandeBulkItem(CommandeCreate):
+    """
+    Schema for a single record of a bulk create/upsert request. Inherits from CommandeCreate.
+    Records without an ID are inserted, records with the ID of an existing commande update it.
+
+    Attributes:
+    - id_commande (Optional[int]): The ID of the commande to update (optional).
+    """
+    id_commande: Optional[int]= None
+
+class CommandeDeleteOut(BaseModel):
+    """
+    Schema for the result of a commande deletion, which also deletes the related productions.
+
+    Attributes:
+    - commandes (int): Number of deleted commandes.
+    - productions (int): Number of deleted productions.
+    """
+    commandes: int
+    productions: int
@@ -0,0 +1,45 @@
+"""
+Pydantic schemas shared by several resources.
+
+- BulkWriteOut: Summary returned by the bulk create/upsert endpoints.
+- PoolStatusOut: Database connection pool statistics.
+"""
+
+from pydantic import BaseModel
+from typing import Optional
+
+class BulkWriteOut(BaseModel):
+    """
+    Summary of a bulk create/upsert operation.
+
+    Attributes:
+    - created (int): Number of inserted records.
+    - updated (int): Number of existing records updated in place.
+    """
+    created: int
+    updated: int
+
+class PoolStatusOut(BaseModel):
+    """
+    Configuration and current usage of the database connection pool.
+
+    Attributes:
+    - pool_class (str): Name of the SQLAlchemy pool implementation.
+    - size (Optional[int]): Number of connections kept in the pool.
+    - checked_in (Optional[int]): Idle connections available in the pool.
+    - checked_out (Optional[int]): Connections currently in use.
+    - overflow (Optional[int]): Connections opened beyond `size`.
+    - max_overflow (int): Maximum number of overflow connections.
+    - timeout (int): Seconds to wait for a free connection.
+    - recycle (int): Seconds before a connection is replaced.
+    - pre_ping (bool): Whether connections are checked before use.
+    """
+    pool_class: str
+    size: Optional[int]= None
+    checked_in: Optional[int]= None
+    checked_out: Optional[int]= None
+    overflow: Optional[int]= None
+    max_overflow: int
+    timeout: int
+    recycle: int
+    pre_ping: bool
@@ -0,0 +1,167 @@
+"""
+Pydantic schemas for the KPI endpoints.
+
+These schemas describe pre-aggregated results computed in the database,
+so the dashboard receives a few rows instead of the full tables.
+
+- ProductionSummaryOut: Global production totals and averages.
+- ProductionStatusCountOut: Number of production records per status.
+- ProductionProductTotalsOut: Quantity, cost, revenue and gain per product.
+- CommandeClientTotalsOut: Number of commandes and ordered quantity per client and status.
+- StockLocationTotalsOut: Number of stock records and available quantity per location and material.
+- HeatmapLegendBucketOut: One bucket of a heatmap legend.
+- HeatmapMatrixOut: Values of one team heatmap (team x day), with their range and legend.
+- TeamHeatmapOut: Availability, work hours and staff heatmaps of the teams.
+"""
+
+from pydantic import BaseModel
+from typing import Optional
+
+class ProductionSummaryOut(BaseModel):
+    """
+    Global production totals and averages.
+
+    Attributes:
+    - prod_count (int): Number of production records.
+    - total_quantite (int): Total produced quantity.
+    - total_cout (float): Total production cost.
+    - total_revenu (float): Total revenue (unit price x quantity).
+    - total_temps (float): Total production time.
+    - prix_unitaire_moyen (float): Average unit price over all records.
+    - temps_moyen_par_unite (float): Production time per produced unit.
+    - cout_moyen_par_unite (float): Production cost per produced unit.
+    - produit_plus_produit (Optional[str]): Product with the highest produced quantity.
+    """
+    prod_count: int
+    total_quantite: int
+    total_cout: float
+    total_revenu: float
+    total_temps: float
+    prix_unitaire_moyen: float
+    temps_moyen_par_unite: float
+    cout_moyen_par_unite: float
+    produit_plus_produit: Optional[str]= None
+
+class ProductionStatusCountOut(BaseModel):
+    """
+    Number of production records sharing the same status.
+
+    Attributes:
+    - statut (Optional[str]): The production status.
+    - count (int): Number of production records with this status.
+    """
+    statut: Optional[str]= None
+    count: int
+
+    class Config:
+        # Allows building the schema from SQLAlchemy result rows
+        from_attributes = True
+
+class ProductionProductTotalsOut(BaseModel):
+    """
+    Aggregated figures for a single product.
+
+    Attributes:
+    - produit (Optional[str]): The product name.
+    - quantite (int): Total produced quantity.
+    - cout (float): Total production cost.
+    - revenu (float): Total revenue (unit price x quantity).
+    - gain (float): Revenue minus cost.
+    """
+    produit: Optional[str]= None
+    quantite: int
+    cout: float
+    revenu: float
+    gain: float
+
+    class Config:
+        # Allows building the schema from SQLAlchemy result rows
+        from_attributes = True
+
+class CommandeClientTotalsOut(BaseModel):
+    """
+    Aggregated figures for the commandes of a client with the same status.
+
+    Attributes:
+    - client (Optional[str]): The client name.
+    - statut (Optional[str]): The commande status.
+    - count (int): Number of commandes.
+    - quantite (int): Total ordered quantity.
+    """
+    client: Optional[str]= None
+    statut: Optional[str]= None
+    count: int
+    quantite: int
+
+    class Config:
+        # Allows building the schema from SQLAlchemy objects
+        from_attributes = True
+
+class StockLocationTotalsOut(BaseModel):
+    """
+    Aggregated figures for the stock of a material type in a storage location.
+
+    Attributes:
+    - lieu_stockage (Optional[str]): The storage location.
+    - type_matiere (Optional[str]): The material type.
+    - count (int): Number of stock records.
+    - quantite_disponible (int): Total available quantity.
+    """
+    lieu_stockage: Optional[str]= None
+    type_matiere: Optional[str]= None
+    count: int
+    quantite_disponible: int
+
+    class Config:
+        # Allows building the schema from SQLAlchemy objects
+        from_attributes = True
+
+class HeatmapLegendBucketOut(BaseModel):
+    """
+    One bucket of a heatmap legend, covering the values from `lower` to `upper` (inclusive).
+
+    Attributes:
+    - label (str): Text of the bucket (e.g. "Disponible", "40–50").
+    - lower (int): Smallest value of the bucket.
+    - upper (int): Largest value of the bucket.
+    """
+    label: str
+    lower: int
+    upper: int
+
+class HeatmapMatrixOut(BaseModel):
+    """
+    Values of one team heatmap, pivoted as one row per team and one column per day.
+
+    Attributes:
+    - values (list[list[Optional[int]]]): One row per team (same order as `TeamHeatmapOut.teams`), one value
+      per day (same order as `TeamHeatmapOut.days`), None where the team has no record for the day.
+    - min (Optional[int]): Smallest value of the matrix (None if it is empty).
+    - max (Optional[int]): Largest value of the matrix (None if it is empty).
+    - range_min (int): Lower bound of the color scale.
+    - range_max (int): Upper bound of the color scale.
+    - legend (list[HeatmapLegendBucketOut]): Legend buckets, from the lowest to the highest values.
+    """
+    values: list[list[Optional[int]]]
+    min: Optional[int]= None
+    max: Optional[int]= None
+    range_min: int
+    range_max: int
+    legend: list[HeatmapLegendBucketOut]
+
+class TeamHeatmapOut(BaseModel):
+    """
+    Availability, work hours and staff heatmaps of the teams, ready to be rendered.
+
+    Attributes:
+    - days (list[int]): Column labels, in increasing order.
+    - teams (list[Optional[str]]): Row labels (team names), in order of first appearance by team record ID.
+    - availability (HeatmapMatrixOut): Availability score (Occupée 0, Partielle 1, Disponible 2).
+    - work_hours (HeatmapMatrixOut): Number of hours worked.
+    - staff (HeatmapMatrixOut): Number of team members.
+    """
+    days: list[int]
+    teams: list[Optional[str]]
+    availability: HeatmapMatrixOut
+    work_hours: HeatmapMatrixOut
+    staff: HeatmapMatrixOut
@@ -37,6 +37,16 @@ class ProductionCreate(ProductionBase):
     """
     pass
 
+class ProductionBulkItem(ProductionCreate):
+    """
+    Schema for a single record of a bulk create/upsert request. Inherits from ProductionCreate.
+    Records without an ID are inserted, records with the ID of an existing production update it.
+
+    Attributes:
+    - id_production (Optional[int]): The ID of the production to update (optional).
+    """
+    id_production: Optional[int]= None
+
 # create production without ID
 class ProductionOut(ProductionBase):
     """
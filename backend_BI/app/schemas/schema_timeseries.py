@@ -0,0 +1,55 @@
+"""
+Pydantic schemas for the time series endpoints.
+
+Each record is one time bucket (day, week or month), optionally for one group
+(product or status) when the series is split.
+
+- ProductionBucketOut: Production count, quantity, cost and revenue of a bucket.
+- CommandeBucketOut: Commande count and quantity of a bucket.
+"""
+
+from datetime import date
+from pydantic import BaseModel
+from typing import Optional
+
+class ProductionBucketOut(BaseModel):
+    """
+    Production figures of a time bucket.
+
+    Attributes:
+    - bucket (date): First day of the bucket (Monday for weeks).
+    - group (Optional[str]): Product or status of the series, None when the series is not split.
+    - count (int): Number of production records.
+    - quantite (int): Total produced quantity.
+    - cout (float): Total production cost.
+    - revenu (float): Total revenue (unit price x quantity).
+    """
+    bucket: date
+    group: Optional[str]= None
+    count: int
+    quantite: int
+    cout: float
+    revenu: float
+
+    class Config:
+        # Allows building the schema from SQLAlchemy result rows
+        from_attributes = True
+
+class CommandeBucketOut(BaseModel):
+    """
+    Commande figures of a time bucket.
+
+    Attributes:
+    - bucket (date): First day of the bucket (Monday for weeks).
+    - group (Optional[str]): Ordered product or status of the series, None when the series is not split.
+    - count (int): Number of commandes.
+    - quantite (int): Total ordered quantity.
+    """
+    bucket: date
+    group: Optional[str]= None
+    count: int
+    quantite: int
+
+    class Config:
+        # Allows building the schema from SQLAlchemy result rows
+        from_attributes = True
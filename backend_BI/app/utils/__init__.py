@@ -0,0 +1,11 @@
+"""
+This package contains helpers shared by the route modules.
+
+- pagination: Keyset pagination parameters and NDJSON streaming responses for list endpoints.
+- filters: Filter and sort parameters of the production and commande lists.
+- cache: In-process response cache (LRU with TTL, ETag support) invalidated by the CRUD writes.
+- serialization: Fast-path JSON encoding of plain column rows (orjson).
+- arrow_export: Arrow IPC / Parquet encoding of row batches for the export endpoints.
+- query_counter: Counting of the SQL statements emitted by a code path (N+1 detection).
+- metrics: Request timing and SQL profiling middleware, rendered in the Prometheus text format.
+"""
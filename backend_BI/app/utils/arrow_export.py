@@ -0,0 +1,123 @@
+"""
+Arrow IPC and Parquet streaming for the export endpoints.
+
+Row batches read from the database are converted column by column into Arrow
+record batches and written to a sink that hands the produced bytes over to the
+HTTP response as soon as each batch is encoded.
+"""
+
+from typing import Callable, Iterable, Iterator
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Date, DateTime, Float, Integer, String
+from sqlalchemy.orm import Session
+from app.database import database
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+def _arrow_type(sql_type) -> pa.DataType:
+    # Map the SQLAlchemy column types used by the models to Arrow types
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, Float):
+        return pa.float64()
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(sql_type, Date):
+        return pa.date32()
+    if isinstance(sql_type, String):
+        return pa.string()
+    raise TypeError(f"Unsupported column type for export: {sql_type!r}")
+
+def arrow_schema(columns: list) -> pa.Schema:
+    """
+    Build the Arrow schema of a list of SQLAlchemy table columns.
+
+    Args:
+        columns (list[Column]): The exported table columns.
+
+    Returns:
+        pa.Schema: One nullable field per column, named as in the database.
+    """
+    return pa.schema([pa.field(col.name, _arrow_type(col.type)) for col in columns])
+
+def to_record_batch(rows: list, schema: pa.Schema) -> pa.RecordBatch:
+    """
+    Convert a list of column tuples into an Arrow record batch.
+
+    Args:
+        rows (list[Row]): Rows whose values follow the schema field order.
+        schema (pa.Schema): The target schema.
+
+    Returns:
+        pa.RecordBatch: The typed columnar batch.
+    """
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    return pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+class _ChunkSink:
+    """Write-only file object buffering the bytes produced by pyarrow until they are drained."""
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def stream_table(
+    fetch_batches: Callable[[Session], Iterable[list]],
+    columns: list,
+    file_format: str,
+) -> Iterator[bytes]:
+    """
+    Encode database row batches as an Arrow IPC stream or a Parquet file, chunk by chunk.
+
+    The generator opens its own read session (see `database.read_session`): the request-scoped one is
+    closed before the response body is sent.
+
+    Args:
+        fetch_batches (Callable[[Session], Iterable[list]]): Returns the row batches for a given session.
+        columns (list[Column]): The exported table columns.
+        file_format (str): "arrow" or "parquet".
+
+    Yields:
+        bytes: Encoded chunks, ready to be sent to the client.
+    """
+    schema = arrow_schema(columns)
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema) if file_format == "arrow" else pq.ParquetWriter(sink, schema)
+    db = database.read_session()
+    try:
+        for rows in fetch_batches(db):
+            batch = to_record_batch(rows, schema)
+            if file_format == "arrow":
+                writer.write_batch(batch)
+            else:
+                writer.write_table(pa.Table.from_batches([batch]))  # one row group per batch
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+    finally:
+        db.close()
@@ -0,0 +1,212 @@
+"""
+In-process response cache for read endpoints, with write-driven invalidation.
+
+Read routes serialize their result once, store the JSON body with its ETag and serve
+later identical requests (same path and query parameters) straight from the cache.
+A request whose `If-None-Match` header matches the current ETag gets a 304 without body.
+
+Entries are grouped by namespace (e.g. "commandes", "productions"): the CRUD write
+functions call `invalidate()` on the namespaces they affect, so cached data never
+outlives a write made through the API. Each namespace also has a generation, bumped by
+`invalidate()`: a read that started before a write does not store its result once the write
+has invalidated the namespace. A response read from the read replica (see `database.get_read_db`)
+is not stored either for `database.replica_staleness_window` seconds after a write to its namespace,
+as the replica may not have replayed the write yet. Entries also expire after a TTL, which bounds
+staleness after external loads (`save_sqldb.py`); `DELETE /cache` clears everything at once.
+
+The default backend is a thread-safe LRU with TTL. Another backend (e.g. Redis-backed)
+can be plugged in with `set_cache_backend()` as long as it implements `CacheBackend`.
+
+Settings (optional, from .env):
+- CACHE_ENABLED: set to "false" to bypass the cache (default true).
+- CACHE_MAX_ENTRIES: maximum number of cached responses (default 256).
+- CACHE_TTL_SECONDS: lifetime of a cached response (default 300).
+"""
+
+import hashlib
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple, Optional
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from app.database import database
+from app.utils.serialization import dump_json
+
+class CachedResponse(NamedTuple):
+    """A serialized response body with its ETag and extra headers."""
+    body: bytes
+    etag: str
+    headers: dict
+
+class CacheBackend(ABC):
+    """
+    Interface of a cache backend. Keys are strings prefixed with their namespace ("<namespace>:...").
+    """
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: CachedResponse) -> None:
+        ...
+
+    @abstractmethod
+    def delete_prefix(self, prefix: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+class LRUTTLCache(CacheBackend):
+    """
+    Thread-safe LRU cache whose entries expire after `ttl` seconds.
+
+    Args:
+        max_entries (int): Maximum number of entries, the least recently used one is evicted first.
+        ttl (float): Lifetime of an entry in seconds.
+    """
+    def __init__(self, max_entries: int = 256, ttl: float = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, CachedResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+# ----------------------------- Configuration -----------------------------
+
+_enabled = os.getenv('CACHE_ENABLED', 'true').strip().lower() not in ("0", "false", "no", "off")
+_backend: CacheBackend = LRUTTLCache(
+    max_entries=int(os.getenv('CACHE_MAX_ENTRIES', 256)),
+    ttl=float(os.getenv('CACHE_TTL_SECONDS', 300)),
+)
+
+# Generation of each namespace, bumped by every invalidation, and of the whole cache, bumped by `clear_cache()`.
+# Checking a generation and storing an entry happen under `_generation_lock`, as do bumping it and deleting the entries.
+_generations: dict[str, int] = {}
+_invalidated_at: dict[str, float] = {}
+_clear_generation = 0
+_generation_lock = threading.Lock()
+
+def _generation(namespace: str) -> tuple[int, int]:
+    return _clear_generation, _generations.get(namespace, 0)
+
+def set_cache_backend(backend: CacheBackend):
+    """
+    Replace the cache backend used by all read endpoints.
+
+    Args:
+        backend (CacheBackend): The new backend.
+    """
+    global _backend
+    _backend = backend
+
+def invalidate(*namespaces: str):
+    """
+    Drop every cached response of the given namespaces.
+
+    Args:
+        *namespaces (str): Namespaces affected by a write (e.g. "commandes", "productions").
+    """
+    with _generation_lock:
+        for namespace in namespaces:
+            _generations[namespace] = _generations.get(namespace, 0) + 1
+            _invalidated_at[namespace] = time.monotonic()
+            _backend.delete_prefix(f"{namespace}:")
+
+def clear_cache():
+    """
+    Drop every cached response.
+    """
+    global _clear_generation
+    with _generation_lock:
+        _clear_generation += 1
+        _backend.clear()
+
+# ----------------------------- Response helper -----------------------------
+
+def _recently_written(namespace: str) -> bool:
+    invalidated_at = _invalidated_at.get(namespace)
+    return invalidated_at is not None and time.monotonic() - invalidated_at < database.replica_staleness_window
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+
+def cached_json_response(
+    request: Request,
+    namespace: str,
+    load: Callable[[], Any],
+    adapter: Optional[TypeAdapter],
+    headers_for: Optional[Callable[[Any], dict]] = None,
+) -> Response:
+    """
+    Serve a JSON response from the cache, computing and storing it on a miss.
+
+    The computed response is not stored when the namespace was invalidated while `load()` ran,
+    since it may have read the data from before the write, nor when it was read from the read
+    replica shortly after a write to the namespace, which the replica may not have replayed yet.
+
+    Args:
+        request (Request): The incoming request, its path and query parameters form the cache key.
+        namespace (str): Namespace of the entry, used for invalidation.
+        load (Callable[[], Any]): Reads the data (usually a CRUD read function) on a cache miss.
+        adapter (Optional[TypeAdapter]): Adapter of the route's response model, used to validate and serialize the data.
+            None when `load` already returns plain JSON-compatible data (fast path), which is encoded as is.
+        headers_for (Optional[Callable[[Any], dict]]): Extra headers computed from the loaded data.
+
+    Returns:
+        Response: The JSON response with its `ETag`, or an empty 304 when `If-None-Match` matches.
+    """
+    key = f"{namespace}:{request.url.path}?{sorted(request.query_params.multi_items())}"
+    entry = _backend.get(key) if _enabled else None
+    if entry is None:
+        generation = _generation(namespace)
+        data = load()
+        if adapter is None:
+            body = dump_json(data)
+        else:
+            body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        entry = CachedResponse(body, etag, headers_for(data) if headers_for else {})
+        if _enabled and not (getattr(request.state, "read_replica", False) and _recently_written(namespace)):
+            with _generation_lock:
+                if _generation(namespace) == generation:
+                    _backend.set(key, entry)
+
+    headers = {"ETag": entry.etag, **entry.headers}
+    if _etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
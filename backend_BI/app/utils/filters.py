@@ -0,0 +1,111 @@
+"""
+Query parameters filtering and sorting the production and commande lists.
+
+The parameters are gathered by the `ProductionFilters` and `CommandeFilters` dependencies
+and translated into SQL WHERE / ORDER BY clauses by `crud_production` and `crud_commande`,
+so only the matching records leave the database.
+
+- `date_from` / `date_to`: inclusive date range (production or commande date).
+- `statut`, `produit`, `client`: exact values, repeat the parameter to match several values.
+- `quantite_min` / `quantite_max`: inclusive quantity range.
+- `sort`: field to order by, prefixed with `-` for descending order (e.g. `sort=-quantite`).
+  Ties are ordered by ID. Sorted lists support `limit` but not the `after` cursor,
+  which follows the ID order.
+"""
+
+from datetime import date
+from typing import Optional
+from fastapi import Query
+
+# Fields accepted by the `sort` parameter of each list
+PRODUCTION_SORT_FIELDS = ("id_production", "date_production", "produit", "quantite", "statut",
+                          "prix_unitaire", "cout_production", "temps_production", "id_commande")
+COMMANDE_SORT_FIELDS = ("id_commande", "date_commande", "client", "produit_commande", "quantite", "statut")
+
+def _sort_pattern(fields: tuple) -> str:
+    return f"^-?({'|'.join(fields)})$"
+
+class ProductionFilters:
+    """
+    FastAPI dependency gathering the filters of the production lists.
+
+    Usage in FastAPI routes:
+        filters: ProductionFilters = Depends()
+    """
+    def __init__(
+        self,
+        date_from: Optional[date] = Query(None, description="Only productions on or after this date"),
+        date_to: Optional[date] = Query(None, description="Only productions on or before this date"),
+        statut: Optional[list[str]] = Query(None, description="Production status, repeat to match several"),
+        produit: Optional[list[str]] = Query(None, description="Product name, repeat to match several"),
+        client: Optional[list[str]] = Query(None, description="Client of the related commande, repeat to match several"),
+        quantite_min: Optional[int] = Query(None, description="Minimum produced quantity"),
+        quantite_max: Optional[int] = Query(None, description="Maximum produced quantity"),
+        sort: Optional[str] = Query(None, pattern=_sort_pattern(PRODUCTION_SORT_FIELDS), description="Field to sort by, '-' prefix for descending"),
+    ):
+        self.date_from = date_from
+        self.date_to = date_to
+        self.statut = statut
+        self.produit = produit
+        self.client = client
+        self.quantite_min = quantite_min
+        self.quantite_max = quantite_max
+        self.sort = sort
+
+class CommandeFilters:
+    """
+    FastAPI dependency gathering the filters of the commande list.
+
+    Usage in FastAPI routes:
+        filters: CommandeFilters = Depends()
+    """
+    def __init__(
+        self,
+        date_from: Optional[date] = Query(None, description="Only commandes placed on or after this date"),
+        date_to: Optional[date] = Query(None, description="Only commandes placed on or before this date"),
+        statut: Optional[list[str]] = Query(None, description="Commande status, repeat to match several"),
+        produit: Optional[list[str]] = Query(None, description="Ordered product, repeat to match several"),
+        client: Optional[list[str]] = Query(None, description="Client name, repeat to match several"),
+        quantite_min: Optional[int] = Query(None, description="Minimum ordered quantity"),
+        quantite_max: Optional[int] = Query(None, description="Maximum ordered quantity"),
+        sort: Optional[str] = Query(None, pattern=_sort_pattern(COMMANDE_SORT_FIELDS), description="Field to sort by, '-' prefix for descending"),
+    ):
+        self.date_from = date_from
+        self.date_to = date_to
+        self.statut = statut
+        self.produit = produit
+        self.client = client
+        self.quantite_min = quantite_min
+        self.quantite_max = quantite_max
+        self.sort = sort
+
+def range_conditions(column, low=None, high=None) -> list:
+    """
+    Build the inclusive range conditions on a column, skipping the missing bounds.
+    """
+    conditions = []
+    if low is not None:
+        conditions.append(column >= low)
+    if high is not None:
+        conditions.append(column <= high)
+    return conditions
+
+def in_condition(column, values: Optional[list]) -> list:
+    """
+    Build an equality (one value) or IN (several values) condition, none if no value is given.
+    """
+    if not values:
+        return []
+    return [column == values[0]] if len(values) == 1 else [column.in_(values)]
+
+def order_by_sort(query, model, sort: Optional[str]):
+    """
+    Order a query by the `sort` parameter (`field` or `-field`), leaving it unchanged if None.
+
+    Works with both legacy `Query` objects and `select()` statements. The ID order added by
+    `keyset_page` afterwards breaks the ties.
+    """
+    if sort is None:
+        return query
+    column = getattr(model, sort.lstrip("-"))
+    return query.order_by(column.desc() if sort.startswith("-") else column.asc())
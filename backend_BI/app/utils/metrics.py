@@ -0,0 +1,192 @@
+"""
+Request and SQL metrics, exposed in the Prometheus text format at `GET /metrics`.
+
+`MetricsMiddleware` times every request and measures its response size, labelled with the
+route template (e.g. `/productions/{production_id}`) rather than the raw path, so the number
+of series stays bounded. `instrument_engine()` attaches SQLAlchemy engine events counting the
+statements sent during a request and the time spent in them; the per-request figures are
+carried by a context variable, which follows the request into the threadpool running the
+sync routes and streaming bodies.
+
+Recorded histograms (labels `method`, `route`, `status`):
+- http_request_duration_seconds: Time until the last byte of the response is sent.
+- http_response_size_bytes: Size of the response body.
+- http_request_db_statements: Number of SQL statements executed by the request.
+- http_request_db_duration_seconds: Time spent executing SQL statements during the request.
+
+The metrics are kept in process: with several workers, each one reports its own.
+
+Settings (optional, from .env):
+- METRICS_ENABLED: set to "false" to disable the middleware recording (default true).
+"""
+
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_enabled = os.getenv("METRICS_ENABLED", "true").strip().lower() not in ("0", "false", "no", "off")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_LABELS = ("method", "route", "status")
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Histogram:
+    """
+    Thread-safe histogram with cumulative buckets, one series per label combination.
+
+    Args:
+        name (str): Metric name.
+        documentation (str): HELP text.
+        buckets (tuple): Upper bounds of the buckets, in increasing order (+Inf is implicit).
+        labelnames (tuple): Names of the labels of each series.
+    """
+    def __init__(self, name: str, documentation: str, buckets: tuple, labelnames: tuple = _LABELS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labelnames = labelnames
+        self._series = {}   # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(values)) for labels, values in self._series.items())
+        for labels, values in series:
+            label_text = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels))
+            prefix = f"{label_text}," if label_text else ""
+            for bound, count in zip(self.buckets, values):
+                lines.append(f'{self.name}_bucket{{{prefix}le="{_format_value(bound)}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {values[len(self.buckets)]}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {_format_value(values[-1])}")
+            lines.append(f"{self.name}_count{{{label_text}}} {values[len(self.buckets)]}")
+        return lines
+
+REQUEST_DURATION = Histogram("http_request_duration_seconds", "Time to process a request, until the last byte of the response.", LATENCY_BUCKETS)
+RESPONSE_SIZE = Histogram("http_response_size_bytes", "Size of the response body in bytes.", SIZE_BUCKETS)
+REQUEST_STATEMENTS = Histogram("http_request_db_statements", "Number of SQL statements executed by a request.", STATEMENT_BUCKETS)
+REQUEST_DB_DURATION = Histogram("http_request_db_duration_seconds", "Time spent executing SQL statements during a request.", LATENCY_BUCKETS)
+
+HISTOGRAMS = (REQUEST_DURATION, RESPONSE_SIZE, REQUEST_STATEMENTS, REQUEST_DB_DURATION)
+
+#----------------------------- SQL EVENTS ---------------------------------
+class RequestStats:
+    """SQL figures of the request being processed."""
+    __slots__ = ("statements", "db_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("metrics_request_stats", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_request.get()
+    if stats is None:
+        return
+    stats.statements += 1
+    start = getattr(context, "_metrics_start", None)
+    if start is not None:
+        stats.db_seconds += time.perf_counter() - start
+
+def instrument_engine(engine) -> None:
+    """
+    Count the statements and SQL time of each request on an engine (idempotent).
+
+    Args:
+        engine (Engine): The engine to listen to (the sync engine of an `AsyncEngine`).
+    """
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+#----------------------------- MIDDLEWARE ---------------------------------
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the latency, response size and SQL figures of every HTTP request.
+
+    Written as a plain ASGI middleware (not `BaseHTTPMiddleware`), so streamed responses
+    (NDJSON lists, exports) are measured until their last chunk is sent.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _enabled:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_request.reset(token)
+            # The router stores the matched route in the scope; unmatched paths share one label
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "<unmatched>"), str(status))
+            REQUEST_DURATION.observe(labels, time.perf_counter() - start)
+            RESPONSE_SIZE.observe(labels, size)
+            REQUEST_STATEMENTS.observe(labels, stats.statements)
+            REQUEST_DB_DURATION.observe(labels, stats.db_seconds)
+
+#----------------------------- EXPOSITION ---------------------------------
+def render_metrics(gauges: Optional[dict] = None) -> str:
+    """
+    Render the recorded histograms, and optional gauges, in the Prometheus text format.
+
+    Args:
+        gauges (dict | None): Extra gauges as `{name: (help text, value)}`, None values are skipped.
+
+    Returns:
+        str: The metrics document.
+    """
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    for name, (documentation, value) in (gauges or {}).items():
+        if value is None:
+            continue
+        lines.extend([f"# HELP {name} {documentation}", f"# TYPE {name} gauge", f"{name} {_format_value(value)}"])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,123 @@
+"""
+Keyset pagination and NDJSON streaming helpers for list endpoints.
+
+List endpoints accept two optional query parameters:
+- `limit`: maximum number of records to return.
+- `after`: only return records whose primary key is greater than this value.
+
+Records are always ordered by primary key, so the last ID of a page is the cursor
+of the next one. It is exposed in the `X-Next-Cursor` response header whenever
+the page is full.
+
+With `format=ndjson`, records are streamed one JSON object per line from a
+server-side cursor instead of being collected into a single list.
+
+With `fast=true`, JSON lists are built from plain column rows (see `serialization`).
+"""
+
+from typing import Callable, Iterable, Optional
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.orm import Query as OrmQuery, Session
+from app.database import database
+
+# Upper bound for a single page, protects workers against unbounded requests
+MAX_PAGE_SIZE = 10_000
+
+# Number of rows fetched per round trip when streaming
+STREAM_BATCH_SIZE = 1_000
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class PageParams:
+    """
+    FastAPI dependency gathering the keyset pagination and output format parameters.
+
+    Usage in FastAPI routes:
+        page: PageParams = Depends()
+    """
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of records to return"),
+        after: Optional[int] = Query(None, description="Only return records whose ID is greater than this cursor"),
+        output_format: str = Query("json", alias="format", pattern="^(json|ndjson)$", description="Set to 'ndjson' to stream records line by line"),
+        fast: bool = Query(False, description="Serialize plain column rows directly, skipping per-record schema validation"),
+    ):
+        self.limit = limit
+        self.after = after
+        self.stream = output_format == "ndjson"
+        self.fast = fast
+
+def keyset_page(query: OrmQuery | Select, id_column, limit: Optional[int] = None, after: Optional[int] = None):
+    """
+    Restrict a query to a single keyset page ordered by `id_column`.
+
+    Works with both legacy `Query` objects (sync CRUD) and `select()` statements (async CRUD).
+
+    Args:
+        query (Query | Select): The base SQLAlchemy query.
+        id_column: The primary key column used as cursor.
+        limit (Optional[int]): Maximum number of records, no limit if None.
+        after (Optional[int]): Cursor, only IDs greater than this value are kept.
+
+    Returns:
+        Query | Select: The ordered and bounded query.
+    """
+    if after is not None:
+        query = query.filter(id_column > after)
+    query = query.order_by(id_column)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+def next_cursor_headers(records: list, id_attr: str, limit: Optional[int]) -> dict:
+    """
+    Build the `X-Next-Cursor` header exposing the cursor of the next page.
+
+    The header is only set when the page is full, an absent header means the last page was reached.
+
+    Args:
+        records (list): The records of the current page.
+        id_attr (str): Name of the primary key attribute (or key, for dict records).
+        limit (Optional[int]): The requested page size.
+
+    Returns:
+        dict: The header to add to the response, empty on the last page.
+    """
+    if limit is not None and records and len(records) == limit:
+        last = records[-1]
+        return {NEXT_CURSOR_HEADER: str(last[id_attr] if isinstance(last, dict) else getattr(last, id_attr))}
+    return {}
+
+def ndjson_response(fetch_rows: Callable[[Session], Iterable], schema: type[BaseModel]) -> StreamingResponse:
+    """
+    Stream records as newline-delimited JSON.
+
+    The stream opens its own read session (see `database.read_session`): the request-scoped one is
+    closed before the response body is sent.
+
+    Args:
+        fetch_rows (Callable[[Session], Iterable]): Returns the records to stream for a given session.
+        schema (type[BaseModel]): Output schema used to serialize each record.
+
+    Returns:
+        StreamingResponse: The NDJSON response.
+    """
+    def _generate():
+        db = database.read_session()
+        try:
+            lines = []
+            for row in fetch_rows(db):
+                lines.append(schema.model_validate(row).model_dump_json())
+                if len(lines) >= STREAM_BATCH_SIZE:
+                    yield "\n".join(lines) + "\n"
+                    lines = []
+            if lines:
+                yield "\n".join(lines) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(_generate(), media_type=NDJSON_MEDIA_TYPE)
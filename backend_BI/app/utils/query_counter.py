@@ -0,0 +1,39 @@
+"""
+Counting of the SQL statements sent to the database.
+
+Used to check how many queries a code path (e.g. an endpoint) emits, so lazy loads
+firing one query per serialized record (N+1) show up as a count growing with the data.
+
+Usage:
+    with count_statements(engine) as statements:
+        ...
+    print(len(statements), statements)
+"""
+
+from contextlib import contextmanager
+from sqlalchemy import event
+
+@contextmanager
+def count_statements(engine):
+    """
+    Record the SQL statements executed on an engine while the block runs.
+
+    An `executemany` batch counts as a single statement, as it is a single round trip
+    with drivers supporting it.
+
+    Args:
+        engine (Engine): The engine to listen to (the sync engine of an `AsyncEngine`).
+
+    Yields:
+        list[str]: The executed statements, filled as they are sent.
+    """
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
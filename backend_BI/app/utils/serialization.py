@@ -0,0 +1,52 @@
+"""
+Fast-path serialization for list endpoints.
+
+The regular path loads ORM entities and validates each of them through the route's
+Pydantic response model before encoding. With `fast=true`, list endpoints instead
+select plain column rows and encode them directly with orjson: no ORM identity map,
+no per-row validation. The JSON shape is the same as the response model, so the
+OpenAPI schema does not change.
+"""
+
+from typing import Iterable
+import orjson
+from sqlalchemy import inspect
+
+def model_columns(model) -> list:
+    """
+    List the mapped column attributes of an ORM model, in declaration order.
+
+    Selecting these attributes yields rows keyed by attribute name, i.e. by the
+    field names of the output schemas.
+
+    Args:
+        model: The SQLAlchemy ORM model class.
+
+    Returns:
+        list: The InstrumentedAttribute of each mapped column.
+    """
+    return [getattr(model, attr.key) for attr in inspect(model).column_attrs]
+
+def rows_to_dicts(rows: Iterable) -> list[dict]:
+    """
+    Convert SQLAlchemy result rows to plain dictionaries.
+
+    Args:
+        rows (Iterable[Row]): Rows selected from column attributes.
+
+    Returns:
+        list[dict]: One dictionary per row, keyed by column label.
+    """
+    return [row._asdict() for row in rows]
+
+def dump_json(data) -> bytes:
+    """
+    Encode plain Python data (dicts, lists, dates, numbers) to JSON bytes with orjson.
+
+    Args:
+        data: The data to encode.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    return orjson.dumps(data)
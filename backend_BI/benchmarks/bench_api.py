@@ -0,0 +1,372 @@
+"""
+Load test of the API routes on a seeded SQLite database.
+
+The database is seeded with `benchmarks/seed.py` (configurable Commande / Production / Stock / Équipe
+volumes), the application is served by uvicorn in a background thread and every route
+registered by `routes_main.include_routes` is driven by concurrent HTTP clients. For each
+route the p50 / p95 / p99 latency, the throughput and the errors are reported, with the
+peak RSS of the process.
+
+Reads run first, then the writes: creations and updates with generated payloads, then the
+single-record deletes, each request deleting a different record. Routes deleting whole
+tables are skipped (they would empty the dataset of the other scenarios).
+
+Each run is saved as JSON under `benchmarks/results/` with the current git commit, and compared
+with the previous run on the same volumes and load (or `--baseline`): routes whose p95 grew
+by more than `--threshold` are flagged as regressions.
+
+Usage (from the backend directory):
+    python benchmarks/bench_api.py [--commandes 2000] [--per-commande 5] [--stocks 2000] [--equipes 200]
+                                   [--concurrency 8] [--requests 200] [--routes kpis] [--cache]
+
+Exits with status 1 on a regression when `--fail-on-regression` is given.
+"""
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import os
+import platform
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from tabulate import tabulate
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+sys.path.insert(0, BACKEND_DIR)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks.seed import CLIENTS, PRODUCTS, STATUSES, make_database, seed_database
+
+# Routes deleting whole tables: never driven, they would empty the dataset
+SKIPPED_ROUTES = {
+    ("DELETE", "/everything"),
+    ("DELETE", "/productions"),
+    ("DELETE", "/commandes"),
+    ("DELETE", "/commandes/without-production"),
+}
+
+# Values of the enum path parameters, one scenario per value
+PATH_VALUES = {"table": ["production", "commande", "stock", "equipe"]}
+
+# Query strings of the routes benchmarked with more than their defaults
+EXTRA_QUERIES = {
+    "/productions": ["fast=true", "client=Airbus"],
+    "/timeseries/productions": ["interval=month", "interval=week&split=statut"],
+    "/timeseries/commandes": ["interval=month"],
+}
+
+def peak_rss() -> int | None:
+    """Peak resident set size of the process in bytes, None where it cannot be read."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, round(fraction * len(values) + 0.5) - 1))]
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+#----------------------------- SCENARIOS ---------------------------------
+class Scenario:
+    """
+    Requests sent to one route.
+
+    Args:
+        method (str): HTTP method.
+        route (str): Route template, as registered in the application.
+        name (str): Label of the scenario (the route with its fixed query or path values).
+        build (callable): Called with a random generator, returns `(url, json body or None)` of one request.
+        expected (tuple): Status codes counted as successes.
+    """
+    def __init__(self, method: str, route: str, name: str, build, expected: tuple = (200,)):
+        self.method = method
+        self.route = route
+        self.name = name
+        self.build = build
+        self.expected = expected
+
+def _production_payload(rng: random.Random, volumes: dict) -> dict:
+    return {
+        "date_production": str(datetime.date(2024, 1, 1) + datetime.timedelta(days=rng.randrange(365))),
+        "id_commande": rng.randint(1, volumes["Commande"]), "produit": rng.choice(PRODUCTS),
+        "quantite": rng.randint(1, 500), "statut": rng.choice(STATUSES), "prix_unitaire": round(rng.uniform(10, 200), 2),
+        "cout_production": round(rng.uniform(100, 50_000), 2), "temps_production": rng.randint(1, 100),
+    }
+
+def _commande_payload(rng: random.Random) -> dict:
+    return {
+        "client": rng.choice(CLIENTS), "produit_commande": rng.choice(PRODUCTS), "quantite": rng.randint(1, 1_000),
+        "statut": rng.choice(STATUSES), "date_commande": str(datetime.date(2024, 1, 1) + datetime.timedelta(days=rng.randrange(365))),
+    }
+
+def build_scenarios(app, volumes: dict, bulk_size: int) -> tuple[list[Scenario], list[Scenario], list[tuple]]:
+    """
+    Scenarios of every API route of the application.
+
+    Returns:
+        tuple: (read scenarios, write scenarios, skipped (method, route) pairs).
+    """
+    from fastapi.routing import APIRoute
+
+    id_ranges = {
+        "production_id": volumes["Production"], "commande_id": volumes["Commande"],
+        "stock_id": volumes["Stock"], "equipe_id": volumes["Équipe"],
+    }
+    # Deletes walk the ids down from the last one, so each request deletes an existing record
+    delete_ids = {name: itertools.count(count, -1) for name, count in id_ranges.items()}
+    write_payloads = {
+        ("POST", "/productions"): lambda rng: _production_payload(rng, volumes),
+        ("POST", "/productions/bulk"): lambda rng: [_production_payload(rng, volumes) for _ in range(bulk_size)],
+        ("PUT", "/production/{production_id}"): lambda rng: {"quantite": rng.randint(1, 500)},
+        ("POST", "/commandes"): _commande_payload,
+        ("POST", "/commandes/bulk"): lambda rng: [_commande_payload(rng) for _ in range(bulk_size)],
+        ("PUT", "/commande/{commande_id}"): lambda rng: {"quantite": rng.randint(1, 1_000)},
+    }
+
+    reads, writes, skipped = [], [], []
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        params = re.findall(r"{(\w+)}", route.path)
+        for method in sorted(route.methods):
+            if (method, route.path) in SKIPPED_ROUTES:
+                skipped.append((method, route.path))
+                continue
+            fixed = [dict(zip(params, values)) for values in itertools.product(*(PATH_VALUES.get(p, [None]) for p in params))]
+            for values in fixed:
+                path = route.path.format(**{p: v if v is not None else f"{{{p}}}" for p, v in values.items()})
+
+                def url_for(rng, path=path, method=method):
+                    def value(match):
+                        name = match.group(1)
+                        if method == "DELETE":
+                            return str(next(delete_ids[name]))
+                        return str(rng.randint(1, id_ranges[name]))
+                    return re.sub(r"{(\w+)}", value, path)
+
+                if method == "GET":
+                    for query in [None] + EXTRA_QUERIES.get(route.path, []):
+                        name = f"{path}?{query}" if query else path
+                        reads.append(Scenario(method, route.path, name,
+                                              lambda rng, url_for=url_for, query=query: (f"{url_for(rng)}?{query}" if query else url_for(rng), None)))
+                elif method == "DELETE":
+                    writes.append(Scenario(method, route.path, path, lambda rng, url_for=url_for: (url_for(rng), None), expected=(200, 204)))
+                else:
+                    payload = write_payloads.get((method, route.path))
+                    if payload is None:
+                        skipped.append((method, route.path))
+                        continue
+                    writes.append(Scenario(method, route.path, path, lambda rng, url_for=url_for, payload=payload: (url_for(rng), payload(rng))))
+    # Record deletes last, productions before commandes (a commande delete also deletes its productions)
+    writes.sort(key=lambda s: (s.method == "DELETE", "commande" in s.route))
+    return reads, writes, skipped
+
+#----------------------------- LOAD ---------------------------------
+async def _drive(base_url: str, scenario: Scenario, requests: int, concurrency: int, warmup: int, seed: int) -> dict:
+    import httpx
+
+    rng = random.Random(seed)
+    latencies, errors = [], 0
+    # The requests are built upfront, so generating them is not timed
+    calls = [scenario.build(rng) for _ in range(warmup + requests)]
+    queue = iter(enumerate(calls))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120,
+                                 limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)) as client:
+        async def worker():
+            nonlocal errors
+            for index, (url, body) in queue:
+                start = time.perf_counter()
+                response = await client.request(scenario.method, url, json=body)
+                await response.aread()
+                elapsed = time.perf_counter() - start
+                if index < warmup:
+                    continue
+                latencies.append(elapsed)
+                if response.status_code not in scenario.expected:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "method": scenario.method, "route": scenario.route, "requests": len(latencies), "errors": errors,
+        "p50_ms": percentile(latencies, 0.50) * 1000, "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000, "throughput_rps": len(latencies) / wall if wall else 0.0,
+    }
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def serve(app) -> tuple:
+    """Start uvicorn in a background thread, returns (server, thread, base url)."""
+    import uvicorn
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise SystemExit("uvicorn failed to start")
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+#----------------------------- RESULTS ---------------------------------
+def _comparable(result: dict, other: dict) -> bool:
+    # Latencies only compare between runs on the same data, load and cache setting
+    keys = ("concurrency", "cache", "bulk_size")
+    return other.get("volumes") == result["volumes"] and all(
+        other.get("parameters", {}).get(key) == result["parameters"][key] for key in keys)
+
+def previous_result(result: dict, path: str | None) -> dict | None:
+    """
+    Result to compare a run with: the given file, else the latest saved run with the same
+    volumes, concurrency and cache setting.
+    """
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+    for name in sorted(os.listdir(RESULTS_DIR), reverse=True):
+        if not (name.startswith("api-") and name.endswith(".json")):
+            continue
+        with open(os.path.join(RESULTS_DIR, name), encoding="utf-8") as f:
+            other = json.load(f)
+        if _comparable(result, other):
+            return other
+    return None
+
+def save_result(result: dict) -> str:
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = result["timestamp"].replace(":", "").replace("-", "")
+    path = os.path.join(RESULTS_DIR, f"api-{stamp}-{result['commit'] or 'nogit'}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    return path
+
+def _mb(value: int | None) -> str:
+    return "n/a" if value is None else f"{value / 1_048_576:.1f} MB"
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the API routes on a seeded SQLite database.")
+    parser.add_argument("--commandes", type=int, default=2_000, help="number of commandes")
+    parser.add_argument("--per-commande", type=int, default=5, help="number of productions per commande")
+    parser.add_argument("--stocks", type=int, default=2_000, help="number of stock records")
+    parser.add_argument("--equipes", type=int, default=200, help="number of team records")
+    parser.add_argument("--concurrency", type=int, default=8, help="number of concurrent clients")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per route")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured requests sent first to each route")
+    parser.add_argument("--bulk-size", type=int, default=50, help="records per bulk write request")
+    parser.add_argument("--routes", help="only drive the routes matching this regular expression")
+    parser.add_argument("--no-writes", action="store_true", help="only drive the read routes")
+    parser.add_argument("--cache", action="store_true", help="keep the read response cache enabled")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated data and requests")
+    parser.add_argument("--baseline", help="result file to compare with (default: the latest saved result)")
+    parser.add_argument("--threshold", type=float, default=0.20, help="relative p95 increase flagged as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on a regression")
+    parser.add_argument("--no-save", action="store_true", help="do not save the result")
+    args = parser.parse_args(argv)
+
+    # Must be set before the application modules read their settings
+    os.environ["CACHE_ENABLED"] = "true" if args.cache else "false"
+    from app.main import app
+    from app.database import database
+    from app.utils.metrics import instrument_engine
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_database(os.path.join(tmp, "bench.db"))
+        started = time.perf_counter()
+        volumes = seed_database(engine, args.commandes, args.per_commande, args.stocks, args.equipes, seed=args.seed)
+        print(f"Seeded {volumes} in {time.perf_counter() - started:.1f}s")
+        rss_seeded = peak_rss()
+
+        database.SessionLocal.configure(bind=engine)
+        instrument_engine(engine)
+        reads, writes, skipped = build_scenarios(app, volumes, args.bulk_size)
+        scenarios = reads + ([] if args.no_writes else writes)
+        if args.routes:
+            scenarios = [s for s in scenarios if re.search(args.routes, s.name)]
+        deletes = {s.route: 0 for s in scenarios if s.method == "DELETE"}
+        for s in scenarios:
+            if s.method == "DELETE":
+                deletes[s.route] += args.warmup + args.requests
+        if any(count > volumes["Commande"] for count in deletes.values()):
+            raise SystemExit("--requests is larger than the seeded records the delete scenarios can remove")
+
+        server, thread, base_url = serve(app)
+        routes = {}
+        try:
+            for index, scenario in enumerate(scenarios):
+                stats = asyncio.run(_drive(base_url, scenario, args.requests, args.concurrency, args.warmup, args.seed + index))
+                routes[f"{scenario.method} {scenario.name}"] = stats
+        finally:
+            server.should_exit = True
+            thread.join()
+            engine.dispose()
+
+    result = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "commit": git_commit(),
+        "python": platform.python_version(), "platform": platform.platform(),
+        "parameters": {key: value for key, value in vars(args).items() if key not in ("baseline", "fail_on_regression", "no_save")},
+        "volumes": volumes,
+        "peak_rss_bytes": peak_rss(), "peak_rss_after_seed_bytes": rss_seeded,
+        "routes": routes,
+        "skipped": [f"{method} {path}" for method, path in skipped],
+    }
+    baseline = previous_result(result, args.baseline)
+    baseline_routes = (baseline or {}).get("routes", {})
+
+    rows, regressions = [], 0
+    for name, stats in routes.items():
+        before = baseline_routes.get(name)
+        change = ""
+        if before and before["p95_ms"]:
+            ratio = stats["p95_ms"] / before["p95_ms"] - 1
+            change = f"{ratio:+.0%}"
+            if ratio > args.threshold:
+                change += " REGRESSION"
+                regressions += 1
+        rows.append([name, stats["requests"], stats["errors"], f"{stats['p50_ms']:.1f}", f"{stats['p95_ms']:.1f}",
+                     f"{stats['p99_ms']:.1f}", f"{stats['throughput_rps']:.0f}", change])
+    headers = ["Route", "Requests", "Errors", "p50 ms", "p95 ms", "p99 ms", "req/s",
+               f"p95 vs {baseline.get('commit') or 'baseline'}" if baseline else "p95 change"]
+    print(tabulate(rows, headers=headers, tablefmt="pretty", colalign=("left",)))
+    print(f"Peak RSS: {_mb(result['peak_rss_bytes'])} (after seeding: {_mb(rss_seeded)}), concurrency {args.concurrency}")
+    if skipped:
+        print("Skipped:", ", ".join(result["skipped"]))
+    if not args.no_save:
+        print("Saved", save_result(result))
+    return 1 if regressions and args.fail_on_regression else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Benchmark of the cleaning rules of `clean_excel_file.py` on synthetic sheets.
+
+Compares the vectorized rules (`clean_frame`) with the previous per-cell implementation
+(`Series.apply(lambda x: abs(int(float(x))))` and string-based foreign key filter),
+on generated Commande, Production and Équipe sheets, and checks both give the same rows.
+
+Usage (from the backend directory):
+    python benchmarks/bench_cleaning.py [--rows 1000000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from clean_excel_file import CLEANING_RULES, _key, clean_frame
+
+def make_sheets(rows: int, seed: int = 0) -> dict:
+    """
+    Generate Commande, Production and Équipe sheets with `rows` rows each.
+
+    Quantities are signed floats, about 5% of the productions reference a missing commande
+    and about 10% of the teams have at most one member.
+    """
+    rng = np.random.default_rng(seed)
+    commande = pd.DataFrame({
+        "ID_Commande": np.arange(1, rows + 1),
+        "Client": rng.choice(["Airbus", "Boeing", "Dassault", "Safran"], rows),
+        "Quantité": rng.normal(500, 300, rows).round(2),
+    })
+    production = pd.DataFrame({
+        "ID_Production": np.arange(1, rows + 1),
+        "ID_Commande": rng.integers(1, int(rows * 1.05) + 1, rows),
+        "Quantité": rng.normal(500, 300, rows).round(2),
+        "Prix_Unitaire": rng.uniform(10, 200, rows).round(2),
+    })
+    equipe = pd.DataFrame({
+        "ID_Équipe": np.arange(1, rows + 1),
+        "Effectif": rng.integers(-2, 15, rows).astype(float),
+        "Nombre_Heures_Travaillées": rng.normal(30, 10, rows).round(1),
+        "Disponibilité": rng.choice(["Disponible", "Partielle", "Occupée"], rows),
+    })
+    return {"Commande": commande, "Production": production, "Équipe": equipe}
+
+def _clean_column_per_cell(series):
+    return series.apply(lambda x: abs(int(float(x))) if pd.notnull(x) else x)
+
+def clean_per_cell(sheet: str, df: pd.DataFrame, commande: pd.DataFrame) -> pd.DataFrame:
+    # Previous implementation (clean_excel_file.py + save_sqldb.py), kept as the reference
+    df = df.copy()
+    if sheet == "Production":
+        valid_ids = set(commande["ID_Commande"].dropna().astype(str))
+        df = df[df["ID_Commande"].astype(str).isin(valid_ids)]
+    for column in CLEANING_RULES[sheet].numeric:
+        if column in df.columns:
+            df[column] = _clean_column_per_cell(df[column])
+    if sheet == "Équipe":
+        df.loc[df['Effectif'] <= 1, ['Nombre_Heures_Travaillées', 'Effectif']] = 0
+        df.loc[df['Effectif'] <= 1, 'Disponibilité'] = 'Occupé'
+    return df
+
+def timed(function, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the cleaning rules on synthetic sheets.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows per generated sheet")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measure, the best one is kept")
+    args = parser.parse_args(argv)
+
+    sheets = make_sheets(args.rows)
+    keys = {("Commande", "ID_Commande"): _key(sheets["Commande"]["ID_Commande"])}
+
+    results = []
+    for sheet, df in sheets.items():
+        per_cell_seconds, expected = timed(lambda: clean_per_cell(sheet, df, sheets["Commande"]), args.repeat)
+        vector_seconds, cleaned = timed(lambda: clean_frame(df, CLEANING_RULES[sheet], keys), args.repeat)
+        pd.testing.assert_frame_equal(expected.reset_index(drop=True), cleaned.reset_index(drop=True), check_dtype=False)
+        results.append([sheet, len(df), len(cleaned), f"{per_cell_seconds:.3f}", f"{vector_seconds:.3f}",
+                        f"{per_cell_seconds / vector_seconds:.1f}x"])
+
+    print(tabulate(results, headers=["Sheet", "Rows", "Kept", "Per-cell (s)", "Vectorized (s)", "Speedup"], tablefmt="pretty"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Check that the response cache does not keep data read from a lagging read replica after a write.
+
+The primary and the replica are two SQLite files seeded with the same rows; the replica
+"replicates" only when the check applies the write to it. The check:
+1. caches `GET /productions` (read from the replica),
+2. updates a production through `PUT /production/{id}` (written to the primary),
+3. reads `GET /productions` again while the replica still lags (the old value is expected),
+4. applies the write to the replica, then expects `GET /productions` to return the new value:
+   the response read in 3. must not have been cached,
+5. once the staleness window has passed, expects replica reads to be cached again.
+
+Usage (from the backend directory):
+    python benchmarks/check_replica_cache.py
+
+Exits with status 1 when a step fails.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from sqlalchemy import update
+
+# Set before the application reads its settings
+_directory = tempfile.mkdtemp()
+os.environ["DB_URL"] = f"sqlite:///{os.path.join(_directory, 'primary.db')}"
+os.environ["DB_READ_URL"] = f"sqlite:///{os.path.join(_directory, 'replica.db')}"
+os.environ["DB_READ_MAX_LAG_SECONDS"] = "1"
+os.environ["DB_READ_CHECK_INTERVAL"] = "0.5"
+os.environ["CACHE_ENABLED"] = "true"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import database
+from app.models.models_production import ProductionModel
+from app.utils.query_counter import count_statements
+from benchmarks.seed import seed_database
+
+PRODUCTION_ID = 1
+NEW_STATUS = "Contrôle qualité"
+
+def statut(client: TestClient) -> str:
+    response = client.get("/productions")
+    response.raise_for_status()
+    return next(prod["statut"] for prod in response.json() if prod["id_production"] == PRODUCTION_ID)
+
+def main() -> int:
+    for engine in (database.engine, database.read_engine):
+        seed_database(engine, commandes=20, per_commande=2, stocks=1, equipes=1)
+    deadline = time.monotonic() + 10
+    while not database.replica_monitor.check():
+        if time.monotonic() > deadline:
+            raise SystemExit("The read replica never became usable")
+        time.sleep(0.1)
+
+    client = TestClient(app)
+    failures = []
+    def expect(step: str, ok: bool):
+        print(f"{'ok' if ok else 'FAILED':>6}  {step}")
+        failures.extend([] if ok else [step])
+
+    old = statut(client)
+    with count_statements(database.read_engine) as statements:
+        expect("a replica read is cached", statut(client) == old and len(statements) == 0)
+
+    client.put(f"/production/{PRODUCTION_ID}", json={"statut": NEW_STATUS}).raise_for_status()
+    expect("the lagging replica still returns the old value", statut(client) == old)
+
+    # The replica catches up
+    with database.read_engine.begin() as connection:
+        connection.execute(update(ProductionModel).where(ProductionModel.id_production == PRODUCTION_ID).values(statut=NEW_STATUS))
+    expect("the new value is read once the replica caught up", statut(client) == NEW_STATUS)
+
+    time.sleep(database.replica_staleness_window)
+    statut(client)
+    with count_statements(database.read_engine) as statements:
+        expect("replica reads are cached again after the staleness window", statut(client) == NEW_STATUS and len(statements) == 0)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Check of the number of SQL statements emitted by the read endpoints.
+
+Each endpoint is called on two in-memory SQLite databases seeded with a small and a larger
+number of commandes (each with several productions), with the response cache disabled.
+The number of statements must stay within the endpoint's budget and must not grow with
+the number of records: a nested relationship loaded lazily for each serialized record
+(N+1) fails the check.
+
+Usage (from the backend directory):
+    python benchmarks/check_statement_counts.py [--small 3] [--large 30] [--per-commande 3]
+
+Exits with status 1 when an endpoint exceeds its budget or regresses to N+1.
+"""
+
+import argparse
+import os
+import sys
+from tabulate import tabulate
+
+# The cache would answer the second call of each endpoint without any query
+os.environ["CACHE_ENABLED"] = "false"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import database
+from app.utils.query_counter import count_statements
+from benchmarks.seed import make_database, seed_database
+
+# GET endpoints and the maximum number of statements each one may emit
+ENDPOINTS = [
+    ("/productions", 1),
+    ("/productions?fast=true", 1),
+    ("/productions?client=Airbus", 1),
+    ("/productions/flat", 1),
+    ("/productions/1", 1),
+    ("/productions/flat/1", 1),
+    ("/productions/by_command_id/1", 1),
+    ("/productions/by_command_id/flat/1", 1),
+    ("/commandes", 1),
+    ("/commandes/1", 1),
+    ("/commandes/filter/without-production", 1),
+    ("/stocks", 1),
+    ("/equipes", 1),
+    ("/kpis/production", 2),
+    ("/kpis/production/status", 1),
+    ("/kpis/production/products", 1),
+    ("/kpis/commandes/clients", 1),
+    ("/kpis/stock/locations", 1),
+    ("/kpis/equipes/heatmap", 1),
+    ("/timeseries/productions?interval=month", 1),
+    ("/timeseries/commandes?interval=month", 1),
+]
+
+def make_seeded_database(commandes: int, per_commande: int):
+    """
+    Create an in-memory SQLite database with `commandes` commandes of `per_commande` productions,
+    as many stock and team records, and the summary tables.
+    """
+    engine = make_database()
+    seed_database(engine, commandes, per_commande, stocks=commandes, equipes=commandes)
+    return engine
+
+def measure(engine) -> dict:
+    """
+    Call every endpoint once against the given database and count the statements it emits.
+
+    Returns:
+        dict[str, int]: Number of statements per endpoint.
+    """
+    database.SessionLocal.configure(bind=engine)
+    client = TestClient(app)
+    counts = {}
+    for path, _ in ENDPOINTS:
+        with count_statements(engine) as statements:
+            response = client.get(path)
+        if response.status_code != 200:
+            raise SystemExit(f"GET {path} returned {response.status_code}: {response.text}")
+        counts[path] = len(statements)
+    return counts
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Count the SQL statements emitted by the read endpoints.")
+    parser.add_argument("--small", type=int, default=3, help="number of commandes of the small dataset")
+    parser.add_argument("--large", type=int, default=30, help="number of commandes of the larger dataset")
+    parser.add_argument("--per-commande", type=int, default=3, help="number of productions per commande")
+    args = parser.parse_args(argv)
+
+    small = measure(make_seeded_database(args.small, args.per_commande))
+    large = measure(make_seeded_database(args.large, args.per_commande))
+
+    rows, failures = [], 0
+    for path, budget in ENDPOINTS:
+        if large[path] > small[path]:
+            status = "N+1"
+        elif large[path] > budget:
+            status = "OVER BUDGET"
+        else:
+            status = "ok"
+        failures += status != "ok"
+        rows.append([f"GET {path}", small[path], large[path], budget, status])
+    print(tabulate(rows, headers=["Endpoint", f"{args.small} commandes", f"{args.large} commandes", "Budget", "Status"],
+                   tablefmt="pretty", colalign=("left",)))
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Synthetic data shared by the API benchmarks.
+
+`make_database()` creates a SQLite database (in memory or in a file) with the application
+schema, fills it with reproducible Commande, Production, Stock and Équipe rows and builds
+the KPI summary tables, so the routes can be exercised without SQL Server.
+"""
+
+import datetime
+import random
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.database.database import Base, make_engine
+from app.models.model_commande import CommandeModel
+from app.models.models_production import ProductionModel
+from app.models.model_stock import StockModel
+from app.models.model_equipe import ÉquipeModel
+from app.crud.crud_summary import rebuild_summaries
+
+# Rows sent per ORM bulk INSERT
+SEED_BATCH_SIZE = 5_000
+
+CLIENTS = ["Airbus", "Boeing", "Dassault", "Safran", "Thales", "Embraer", "Bombardier", "Leonardo"]
+PRODUCTS = ["Câblage Boeing 737", "Câblage A320", "Harnais moteur", "Faisceau cockpit", "Connecteur train", "Panneau avionique"]
+STATUSES = ["En cours", "En attente", "Terminé", "Annulé"]
+LOCATIONS = ["Entrepôt A", "Entrepôt B", "Entrepôt C", "Atelier"]
+MATERIALS = ["Cuivre", "Aluminium", "Composite", "Plastique"]
+AVAILABILITIES = ["Disponible", "Partielle", "Occupée"]
+
+def _insert(session: Session, model, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == SEED_BATCH_SIZE:
+            session.execute(insert(model), batch)
+            batch = []
+    if batch:
+        session.execute(insert(model), batch)
+
+def seed_database(engine, commandes: int, per_commande: int, stocks: int, equipes: int, seed: int = 0) -> dict:
+    """
+    Create the application tables and fill them with reproducible synthetic rows.
+
+    Args:
+        engine (Engine): Engine of the (empty) target database.
+        commandes (int): Number of commandes.
+        per_commande (int): Number of productions per commande.
+        stocks (int): Number of stock records.
+        equipes (int): Number of team records.
+        seed (int): Seed of the random generator, the same seed gives the same rows.
+
+    Returns:
+        dict[str, int]: Number of rows per table.
+    """
+    rng = random.Random(seed)
+    start = datetime.date(2024, 1, 1)
+    Base.metadata.create_all(engine)
+    # ORM bulk inserts, so the rows are keyed by attribute name
+    with Session(engine) as session:
+        _insert(session, CommandeModel, (
+            {"id_commande": i, "client": rng.choice(CLIENTS), "produit_commande": rng.choice(PRODUCTS),
+             "quantite": rng.randint(1, 1_000), "statut": rng.choice(STATUSES),
+             "date_commande": start + datetime.timedelta(days=rng.randrange(365))}
+            for i in range(1, commandes + 1)
+        ))
+        _insert(session, ProductionModel, (
+            {"id_production": (i - 1) * per_commande + j, "id_commande": i, "produit": rng.choice(PRODUCTS),
+             "quantite": rng.randint(1, 500), "statut": rng.choice(STATUSES),
+             "prix_unitaire": round(rng.uniform(10, 200), 2), "cout_production": round(rng.uniform(100, 50_000), 2),
+             "temps_production": rng.randint(1, 100), "date_production": start + datetime.timedelta(days=rng.randrange(365))}
+            for i in range(1, commandes + 1) for j in range(1, per_commande + 1)
+        ))
+        _insert(session, StockModel, (
+            {"ID_Stock": i, "Produit": rng.choice(PRODUCTS), "Quantité_Disponible": rng.randint(0, 5_000),
+             "Lieu_Stockage": rng.choice(LOCATIONS), "Type_Matière": rng.choice(MATERIALS),
+             "Mise_à_Jour": start + datetime.timedelta(days=rng.randrange(365))}
+            for i in range(1, stocks + 1)
+        ))
+        _insert(session, ÉquipeModel, (
+            {"ID_Équipe": i, "Nom_Équipe": f"Équipe {i}", "Chef_Équipe": f"Chef {i}", "Effectif": rng.randint(0, 12),
+             "Nombre_Heures_Travaillées": rng.randint(0, 80), "Disponibilité": rng.choice(AVAILABILITIES)}
+            for i in range(1, equipes + 1)
+        ))
+        session.commit()
+    rebuild_summaries(engine)
+    return {"Commande": commandes, "Production": commandes * per_commande, "Stock": stocks, "Équipe": equipes}
+
+def make_database(path: str | None = None):
+    """
+    Create an empty SQLite engine: in memory (shared by all threads) if `path` is None, else a file.
+    """
+    if path is None:
+        return make_engine("sqlite://")
+    # Concurrent writers wait for the lock instead of failing immediately
+    return make_engine(f"sqlite:///{path}", connect_args={"timeout": 30})
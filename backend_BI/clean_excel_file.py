@@ -1,68 +1,196 @@
+"""
+Clean the raw workbook before it is loaded into the database.
+
+The cleaning is described declaratively, per sheet, in `CLEANING_RULES`:
+- `numeric`: columns coerced to numbers, made positive and truncated to integers (or rounded),
+- `foreign_keys`: rows whose key is missing from the parent sheet are dropped,
+- `overrides`: values assigned to the rows matching a condition (e.g. teams with at most one member).
+
+Rules are applied with pandas/NumPy vector operations on each chunk streamed by `excel_stream.py`.
+Sheets without rules are copied as is.
+
+The cleaned sheets are stored as Parquet in the sheet cache (see `sheet_cache.py`), which
+`save_sqldb.py` and `read_excel.py` read directly. Sheets whose content, rules and parent
+sheets did not change since the last run are skipped.
+
+Usage:
+    python clean_excel_file.py [--input Matis_Aerospace_complet.xlsx] [--cache-dir cleaned] [--xlsx] [--force]
+"""
+
+import argparse
+from typing import NamedTuple, Optional
+import numpy as np
 import pandas as pd
+import sheet_cache
+from excel_stream import iter_sheet, read_column, sheet_names, write_sheets
 
 # Input and output file paths
 input_file = "Matis_Aerospace_complet.xlsx"
 output_file = "Matis_Aerospace_cleaned.xlsx"
 
-# Load Excel file
-xls = pd.ExcelFile(input_file)
-
-# To store cleaned sheets
-cleaned_sheets = {}
-
-# Helper function to transform numeric fields
-def clean_column(series):
-    return series.apply(lambda x: abs(int(float(x))) if pd.notnull(x) else x)
-
-# Clean Ressources
-if "Ressources" in xls.sheet_names:
-    df = xls.parse("Ressources")
-    if "Stock_Disponible" in df.columns:
-        df["Stock_Disponible"] = clean_column(df["Stock_Disponible"])
-    cleaned_sheets["Ressources"] = df
-
-# Clean Stock
-if "Stock" in xls.sheet_names:
-    df = xls.parse("Stock")
-    if "Quantité_Disponible" in df.columns:
-        df["Quantité_Disponible"] = clean_column(df["Quantité_Disponible"])
-    cleaned_sheets["Stock"] = df
-
-# Clean Commande
-commande_df = None
-if "Commande" in xls.sheet_names:
-    commande_df = xls.parse("Commande")
-    if "Quantité" in commande_df.columns:
-        commande_df["Quantité"] = clean_column(commande_df["Quantité"])
-    cleaned_sheets["Commande"] = commande_df
-    
-# Clean Équipe
-if "Équipe" in xls.sheet_names:
-    df = xls.parse("Équipe")
-    for col in ["Effectif", "Nombre_Heures_Travaillées"]:
-        if col in df.columns:
-            df[col] = clean_column(df[col])
-    cleaned_sheets["Équipe"] = df
-
-# Clean Production
-if "Production" in xls.sheet_names:
-    df = xls.parse("Production")
-    if "ID_Commande" in df.columns and commande_df is not None and "ID_Commande" in commande_df.columns:
-        valid_ids = set(commande_df["ID_Commande"].dropna().astype(str))
-        df = df[df["ID_Commande"].astype(str).isin(valid_ids)]
-    
-    if "Quantité" in df.columns:
-        df["Quantité"] = clean_column(df["Quantité"])
-    cleaned_sheets["Production"] = df
-
-# Preserve other sheets
-for sheet in xls.sheet_names:
-    if sheet not in cleaned_sheets:
-        cleaned_sheets[sheet] = xls.parse(sheet)
-
-# Write to new Excel file
-with pd.ExcelWriter(output_file) as writer:
-    for sheet, df in cleaned_sheets.items():
-        df.to_excel(writer, sheet_name=sheet, index=False)
-
-print(f"✅ Cleaned data saved to {output_file}")
+class NumericRule(NamedTuple):
+    """Numeric coercion of a column: absolute value, then truncation to an integer or rounding to `decimals`."""
+    absolute: bool = True
+    decimals: Optional[int] = None
+
+class Override(NamedTuple):
+    """Values assigned to the rows where `column <= max_value`."""
+    column: str
+    max_value: float
+    values: dict
+
+class SheetRules(NamedTuple):
+    """Cleaning rules of a sheet: numeric columns, foreign keys (column -> (parent sheet, parent column)) and overrides."""
+    numeric: dict = {}
+    foreign_keys: dict = {}
+    overrides: tuple = ()
+
+CLEANING_RULES = {
+    "Ressources": SheetRules(numeric={"Stock_Disponible": NumericRule()}),
+    "Stock": SheetRules(numeric={"Quantité_Disponible": NumericRule()}),
+    "Commande": SheetRules(numeric={"Quantité": NumericRule()}),
+    "Équipe": SheetRules(
+        numeric={"Effectif": NumericRule(), "Nombre_Heures_Travaillées": NumericRule()},
+        # Teams with at most one member are not available
+        overrides=(Override("Effectif", 1, {"Nombre_Heures_Travaillées": 0, "Effectif": 0, "Disponibilité": "Occupé"}),),
+    ),
+    "Production": SheetRules(
+        numeric={"Quantité": NumericRule()},
+        foreign_keys={"ID_Commande": ("Commande", "ID_Commande")},
+    ),
+}
+
+def clean_numeric(series: pd.Series, rule: NumericRule) -> pd.Series:
+    """
+    Coerce a column to numbers and apply the rule, in vector operations.
+
+    Values that are not numbers become missing. Integer columns stay `int64`
+    when they have no missing value, `float64` otherwise.
+    """
+    values = pd.to_numeric(series, errors="coerce").astype("float64")
+    if rule.absolute:
+        values = values.abs()
+    if rule.decimals is not None:
+        return values.round(rule.decimals)
+    values = np.trunc(values)
+    return values if values.isna().any() else values.astype("int64")
+
+def _key(values) -> pd.Series:
+    # Compare IDs as numbers when possible, so 101, 101.0 and "101" match
+    values = pd.Series(values)
+    numbers = pd.to_numeric(values, errors="coerce")
+    return numbers if numbers.notna().sum() == values.notna().sum() else values.astype(str)
+
+def parent_keys(path: str, rules: dict = CLEANING_RULES) -> dict:
+    """
+    Read the parent key columns referenced by the foreign key rules.
+
+    Returns:
+        dict[tuple[str, str], pd.Series]: The distinct keys, per (parent sheet, parent column).
+    """
+    names = set(sheet_names(path))
+    keys = {}
+    for sheet_rules in rules.values():
+        for parent in sheet_rules.foreign_keys.values():
+            if parent[0] in names and parent not in keys:
+                try:
+                    keys[parent] = _key(list(read_column(path, *parent)))
+                except KeyError:
+                    pass
+    return keys
+
+def clean_frame(df: pd.DataFrame, rules: SheetRules, keys: dict) -> pd.DataFrame:
+    """
+    Apply the cleaning rules of a sheet to a DataFrame (or a chunk of it).
+
+    Args:
+        df (pd.DataFrame): Rows to clean.
+        rules (SheetRules): Rules of the sheet.
+        keys (dict): Parent keys returned by `parent_keys`; missing parents disable their foreign key rule.
+
+    Returns:
+        pd.DataFrame: The cleaned rows.
+    """
+    for column, parent in rules.foreign_keys.items():
+        if column in df.columns and parent in keys:
+            df = df[_key(df[column]).isin(keys[parent]).to_numpy()]
+    df = df.copy()
+
+    for column, rule in rules.numeric.items():
+        if column in df.columns:
+            df[column] = clean_numeric(df[column], rule)
+
+    for override in rules.overrides:
+        if override.column in df.columns:
+            mask = (df[override.column] <= override.max_value).to_numpy()
+            for column, value in override.values.items():
+                if column in df.columns:
+                    df.loc[mask, column] = value
+    return df
+
+def input_contents(path: str, manifest: dict) -> dict:
+    """
+    Content hash of each sheet of the raw workbook, reusing the manifest when the raw sheet did not change.
+
+    Returns:
+        dict[str, dict]: `raw` and `content` hashes per sheet, in workbook order.
+    """
+    inputs = {}
+    for sheet, raw in sheet_cache.workbook_fingerprints(path).items():
+        known = manifest.get("inputs", {}).get(sheet)
+        content = known["content"] if known and known["raw"] == raw else sheet_cache.content_fingerprint(path, sheet)
+        inputs[sheet] = {"raw": raw, "content": content}
+    return inputs
+
+def sheet_fingerprint(sheet: str, inputs: dict, rules: dict = CLEANING_RULES) -> str:
+    """
+    Fingerprint of a cleaned sheet: its input content, its rules and the content of its parent sheets.
+    """
+    sheet_rules = rules.get(sheet)
+    parents = [inputs[parent[0]]["content"] for parent in sheet_rules.foreign_keys.values()
+               if parent[0] in inputs] if sheet_rules else []
+    return sheet_cache.combine(inputs[sheet]["content"], repr(sheet_rules), *parents)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clean the raw workbook into the Parquet sheet cache.")
+    parser.add_argument("--input", default=input_file, help="Raw Excel workbook")
+    parser.add_argument("--cache-dir", default=sheet_cache.CACHE_DIR, help="Directory of the cleaned Parquet sheets")
+    parser.add_argument("--xlsx", action="store_true", help=f"Also write the cleaned workbook to {output_file}")
+    parser.add_argument("--force", action="store_true", help="Clean every sheet, even the unchanged ones")
+    args = parser.parse_args(argv)
+
+    manifest = sheet_cache.load_manifest(args.cache_dir)
+    inputs = input_contents(args.input, manifest)
+    sheets = list(inputs)
+    fingerprints = {sheet: sheet_fingerprint(sheet, inputs) for sheet in sheets}
+    stale = [sheet for sheet in sheets
+             if args.force or not sheet_cache.is_fresh(manifest, sheet, fingerprints[sheet], args.cache_dir)]
+
+    # Parent keys are only read when a sheet that needs them is cleaned
+    keys = parent_keys(args.input, {sheet: CLEANING_RULES[sheet] for sheet in stale if sheet in CLEANING_RULES})
+
+    def clean_sheet(sheet):
+        rules = CLEANING_RULES.get(sheet)
+        for df in iter_sheet(args.input, sheet):
+            yield df if rules is None else clean_frame(df, rules, keys)
+
+    for sheet in sheets:
+        if sheet in stale:
+            rows = sheet_cache.write_sheet(sheet, clean_sheet(sheet), args.cache_dir)
+            manifest["fingerprints"][sheet] = fingerprints[sheet]
+            print(f"Sheet '{sheet}' cleaned ({rows} rows)")
+        else:
+            print(f"Sheet '{sheet}' unchanged, skipped")
+    manifest["sheets"] = sheets
+    manifest["inputs"] = inputs
+    manifest["fingerprints"] = {sheet: manifest["fingerprints"][sheet] for sheet in sheets}
+    sheet_cache.save_manifest(manifest, args.cache_dir)
+    print(f"✅ Cleaned data saved to {args.cache_dir}")
+
+    # Optional Excel export, other sheets are preserved as is
+    if args.xlsx:
+        write_sheets(output_file, {sheet: sheet_cache.iter_sheet(args.cache_dir, sheet) for sheet in sheets})
+        print(f"✅ Cleaned data saved to {output_file}")
+
+if __name__ == "__main__":
+    main()
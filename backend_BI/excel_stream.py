@@ -0,0 +1,133 @@
+"""
+Streaming access to the Excel workbooks, shared by the cleaning, loading and summary scripts.
+
+`pd.ExcelFile(...).parse(sheet)` materializes a whole sheet at once. The functions below
+open the workbook with openpyxl in read-only mode and iterate over the rows, so only one
+chunk of `chunksize` rows is held in memory at a time:
+- `sheet_names`: List the sheets of a workbook.
+- `iter_sheet`: Yield a sheet as typed DataFrame chunks.
+- `read_column`: Collect the distinct values of one column (e.g. the IDs used by a foreign key filter).
+- `write_sheets`: Write chunked sheets to a new workbook in write-only mode.
+"""
+
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+# Number of rows per chunk yielded by `iter_sheet`
+CHUNK_ROWS = 50_000
+
+def sheet_names(path: str) -> list[str]:
+    """
+    List the sheets of a workbook without loading their rows.
+
+    Args:
+        path (str): Path of the Excel workbook.
+
+    Returns:
+        list[str]: The sheet names, in workbook order.
+    """
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+def iter_sheet(path: str, sheet: str, chunksize: int = CHUNK_ROWS, usecols: Optional[list[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Iterate over a sheet as DataFrame chunks.
+
+    The first row is used as header and fully empty rows are skipped. Column types are
+    inferred per chunk (int, float, datetime or object), like `pd.read_excel` does.
+    At least one chunk is always yielded, empty if the sheet has no data rows.
+
+    Args:
+        path (str): Path of the Excel workbook.
+        sheet (str): Name of the sheet to read.
+        chunksize (int): Maximum number of rows per chunk.
+        usecols (Optional[list[str]]): Only keep these columns.
+
+    Yields:
+        pd.DataFrame: The next chunk of rows.
+
+    Raises:
+        KeyError: If the sheet or one of `usecols` does not exist.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet].iter_rows(values_only=True)
+        header = next(rows, ())
+        # Trailing cells without a header are dropped, as pandas does for empty columns
+        while header and header[-1] is None:
+            header = header[:-1]
+        columns = [str(name) if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+        positions = list(range(len(columns)))
+        if usecols is not None:
+            missing = [col for col in usecols if col not in columns]
+            if missing:
+                raise KeyError(f"Columns {missing} not found in sheet '{sheet}'")
+            positions = [columns.index(col) for col in usecols]
+            columns = list(usecols)
+
+        data_rows = (row for row in rows if any(value is not None for value in row))
+        yielded = False
+        while True:
+            batch = [tuple(row[i] if i < len(row) else None for i in positions) for row in islice(data_rows, chunksize)]
+            if not batch and yielded:
+                break
+            yield pd.DataFrame.from_records(batch, columns=columns).infer_objects()
+            yielded = True
+            if len(batch) < chunksize:
+                break
+    finally:
+        workbook.close()
+
+def read_column(path: str, sheet: str, column: str) -> set:
+    """
+    Collect the distinct non-null values of one column, reading the sheet in chunks.
+
+    Args:
+        path (str): Path of the Excel workbook.
+        sheet (str): Name of the sheet to read.
+        column (str): Column to collect.
+
+    Returns:
+        set: The distinct non-null values.
+    """
+    values = set()
+    for chunk in iter_sheet(path, sheet, usecols=[column]):
+        values.update(chunk[column].dropna().tolist())
+    return values
+
+def _cell(value):
+    # openpyxl only accepts native Python values, missing values are written as empty cells
+    if value is None or value is pd.NaT or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def write_sheets(path: str, sheets: dict[str, Iterable[pd.DataFrame]]) -> None:
+    """
+    Write chunked sheets to a new workbook, in write-only mode.
+
+    Each chunk is appended to the sheet as soon as it is produced, so the rows of a sheet
+    never need to be in memory all at once.
+
+    Args:
+        path (str): Path of the workbook to create (overwritten if it exists).
+        sheets (dict[str, Iterable[pd.DataFrame]]): Chunks to write, per sheet name, in output order.
+    """
+    workbook = Workbook(write_only=True)
+    for sheet, chunks in sheets.items():
+        worksheet = workbook.create_sheet(sheet)
+        header_written = False
+        for chunk in chunks:
+            if not header_written:
+                worksheet.append(list(chunk.columns))
+                header_written = True
+            for row in chunk.itertuples(index=False, name=None):
+                worksheet.append([_cell(value) for value in row])
+    workbook.save(path)
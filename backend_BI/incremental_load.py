@@ -0,0 +1,171 @@
+"""
+Incremental load of the cleaned workbook into existing tables.
+
+Instead of dropping and reloading every table, each sheet is written to a staging
+table and compared with the live table by primary key:
+- rows missing from the workbook are deleted,
+- rows whose values changed are updated (float columns within a relative tolerance, since
+  values read back from the Parquet cache or the workbook may differ in the last digits),
+- new rows are inserted.
+Unchanged rows are not touched, and the live tables stay readable during the import.
+
+Deletes run children first (Production before Commande) and inserts parents first,
+so foreign keys stay valid at every step. On SQL Server the updates and inserts of a
+table are applied with a single MERGE statement; other dialects (SQLite, PostgreSQL)
+use an equivalent UPDATE + INSERT pair, which keeps the loader testable on SQLite.
+On PostgreSQL the primary key sequences are moved past the loaded IDs.
+
+The whole import runs in one transaction: either every table is synchronized or none is.
+"""
+
+from typing import NamedTuple
+import pandas as pd
+from sqlalchemy import Date, DateTime, Float, inspect, text
+from app.database.schema import identity_insert
+
+class TableSpec(NamedTuple):
+    """Description of a loaded table: name (also the sheet name), primary key column and to_sql dtypes."""
+    name: str
+    primary_key: str
+    dtype: dict
+
+# Relative difference below which two float values are considered equal
+FLOAT_TOLERANCE = 1e-9
+
+def _staging_name(table: str) -> str:
+    return f"stg_{table}"
+
+def _differs(column: str, quote, target: str, source: str, is_float: bool) -> str:
+    t, s = f"{target}.{quote(column)}", f"{source}.{quote(column)}"
+    if is_float:
+        differs = f"ABS({t} - {s}) > {FLOAT_TOLERANCE!r} * (ABS({t}) + ABS({s}))"
+    else:
+        differs = f"{t} <> {s}"
+    return f"({differs} OR ({t} IS NULL AND {s} IS NOT NULL) OR ({t} IS NOT NULL AND {s} IS NULL))"
+
+def _changed(columns: list, quote, target: str, source: str, floats: set) -> str:
+    # NULL-safe "value differs" predicate, portable across dialects
+    return " OR ".join(_differs(col, quote, target, source, col.lower() in floats) for col in columns) or "1 = 0"
+
+def _float_columns(connection, spec: TableSpec) -> set:
+    # Lower-case names of the float columns of the target table
+    return {col['name'].lower() for col in inspect(connection).get_columns(spec.name) if isinstance(col['type'], Float)}
+
+def _align_types(connection, spec: TableSpec, df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+    # Stage each column with the type of the target column, so values are stored (and rounded)
+    # the same way on both sides and unchanged rows compare equal; DATE columns get dates, not timestamps
+    dtype = dict(spec.dtype)
+    target_types = {col['name'].lower(): col['type'] for col in inspect(connection).get_columns(spec.name)}
+    df = df.copy()
+    for col in df.columns:
+        target_type = target_types.get(col.lower())
+        if target_type is None:
+            continue
+        dtype[col] = target_type
+        if isinstance(target_type, Date) and not isinstance(target_type, DateTime):
+            df[col] = pd.to_datetime(df[col]).dt.date
+    return df, dtype
+
+def _delete_missing(connection, spec: TableSpec, quote) -> int:
+    table, staging, pk = quote(spec.name), quote(_staging_name(spec.name)), quote(spec.primary_key)
+    result = connection.execute(text(
+        f"DELETE FROM {table} WHERE NOT EXISTS (SELECT 1 FROM {staging} s WHERE s.{pk} = {table}.{pk})"
+    ))
+    return result.rowcount
+
+def _upsert_generic(connection, spec: TableSpec, columns: list, quote, floats: set) -> tuple[int, int]:
+    table, staging, pk = quote(spec.name), quote(_staging_name(spec.name)), quote(spec.primary_key)
+    data_columns = [col for col in columns if col != spec.primary_key]
+
+    # Update only the rows whose values differ (correlated subqueries: valid on every dialect)
+    updated = 0
+    if data_columns:
+        assignments = ", ".join(
+            f"{quote(col)} = (SELECT s.{quote(col)} FROM {staging} s WHERE s.{pk} = {table}.{pk})" for col in data_columns
+        )
+        updated = connection.execute(text(
+            f"UPDATE {table} SET {assignments} "
+            f"WHERE EXISTS (SELECT 1 FROM {staging} s WHERE s.{pk} = {table}.{pk} AND ({_changed(data_columns, quote, table, 's', floats)}))"
+        )).rowcount
+
+    column_list = ", ".join(quote(col) for col in columns)
+    inserted = connection.execute(text(
+        f"INSERT INTO {table} ({column_list}) "
+        f"SELECT {', '.join('s.' + quote(col) for col in columns)} FROM {staging} s "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE t.{pk} = s.{pk})"
+    )).rowcount
+    return inserted, updated
+
+def _upsert_mssql(connection, spec: TableSpec, columns: list, quote, floats: set) -> tuple[int, int]:
+    table, staging, pk = quote(spec.name), quote(_staging_name(spec.name)), quote(spec.primary_key)
+    data_columns = [col for col in columns if col != spec.primary_key]
+    column_list = ", ".join(quote(col) for col in columns)
+
+    when_matched = ""
+    if data_columns:
+        when_matched = (
+            f"WHEN MATCHED AND ({_changed(data_columns, quote, 't', 's', floats)}) THEN "
+            f"UPDATE SET {', '.join(f't.{quote(col)} = s.{quote(col)}' for col in data_columns)} "
+        )
+
+    actions = connection.execute(text(
+        f"MERGE {table} AS t USING {staging} AS s ON t.{pk} = s.{pk} "
+        f"{when_matched}"
+        f"WHEN NOT MATCHED BY TARGET THEN INSERT ({column_list}) VALUES ({', '.join('s.' + quote(col) for col in columns)}) "
+        f"OUTPUT $action;"
+    )).scalars().all()
+    return actions.count("INSERT"), actions.count("UPDATE")
+
+def incremental_load(engine, tables: list[TableSpec], sheets: dict) -> dict:
+    """
+    Synchronize existing tables with the workbook sheets, applying only the differences.
+
+    Args:
+        engine (Engine): SQLAlchemy engine of the target database.
+        tables (list[TableSpec]): Tables to synchronize, in foreign key order (parents first).
+        sheets (dict): One DataFrame, or an iterable of DataFrame chunks, per table name,
+            columns named as in the database.
+
+    Returns:
+        dict[str, dict]: Number of `inserted`, `updated` and `deleted` rows per table.
+
+    Raises:
+        RuntimeError: If a target table does not exist yet (run a full load first).
+    """
+    counts = {spec.name: {"inserted": 0, "updated": 0, "deleted": 0} for spec in tables}
+
+    with engine.begin() as connection: # begin() => single transaction, rolled back on failure
+        quote = connection.dialect.identifier_preparer.quote
+        existing_tables = set(inspect(connection).get_table_names())
+        missing = [spec.name for spec in tables if spec.name not in existing_tables]
+        if missing:
+            raise RuntimeError(f"Tables {missing} do not exist, run a full load first")
+
+        # 1. Stage every sheet
+        columns = {}
+        for spec in tables:
+            chunks = [sheets[spec.name]] if isinstance(sheets[spec.name], pd.DataFrame) else sheets[spec.name]
+            for i, chunk in enumerate(chunks):
+                df, dtype = _align_types(connection, spec, chunk)
+                df.to_sql(_staging_name(spec.name), con=connection, if_exists='replace' if i == 0 else 'append',
+                          index=False, dtype=dtype)
+                columns[spec.name] = list(df.columns)
+
+        # 2. Delete the rows that disappeared, children first
+        for spec in reversed(tables):
+            counts[spec.name]["deleted"] = _delete_missing(connection, spec, quote)
+
+        # 3. Update changed rows and insert new ones, parents first
+        upsert = _upsert_mssql if connection.dialect.name == "mssql" else _upsert_generic
+        for spec in tables:
+            # Explicit IDs must be allowed on identity primary keys (see `identity_insert`)
+            with identity_insert(connection, spec.name):
+                inserted, updated = upsert(connection, spec, columns[spec.name], quote, _float_columns(connection, spec))
+            counts[spec.name]["inserted"] = inserted
+            counts[spec.name]["updated"] = updated
+
+        # 4. Drop the staging tables
+        for spec in tables:
+            connection.execute(text(f"DROP TABLE {quote(_staging_name(spec.name))}"))
+
+    return counts
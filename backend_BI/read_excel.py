@@ -1,35 +1,47 @@
 import pandas as pd  # Importer pandas pour manipuler les données
 from colorama import  Fore, Back, Style, init
-import io
+import os
+from sheet_cache import CACHE_DIR, iter_sheet, sheet_names as list_sheets
 
 # read le fichier Excel
 fichier_excel = "Matis_Aerospace_cleaned.xlsx"
 
-# Chargement  toutes les feuilles du fichier Excel
-excel_file = pd.ExcelFile(fichier_excel)
+# Les feuilles nettoyées en Parquet (clean_excel_file.py) sont lues en priorité
+if os.path.isdir(CACHE_DIR):
+    fichier_excel = CACHE_DIR
 
 # Ouvrir un fichier texte pour y écrire les résultats
 with open(r"logs\output.txt", "w") as file:
     # Afficher les noms des feuilles
-    sheet_names= excel_file.sheet_names
+    sheet_names= list_sheets(fichier_excel)
 
     file.write("sheet names:"+", ".join(sheet_names) + "\n\n")
 
     # Lire et afficher les données de chaque feuille
     for nom_feuille in sheet_names:
-        df = excel_file.parse(nom_feuille)
+        # Lecture par blocs: seuls les compteurs sont gardés en mémoire
+        head = None
+        row_count = 0
+        non_null = None
+        dtypes = None
+        for df in iter_sheet(fichier_excel, nom_feuille):
+            if head is None:
+                head = df.head()
+            row_count += len(df)
+            non_null = df.notna().sum() if non_null is None else non_null + df.notna().sum()
+            if len(df) or dtypes is None:
+                dtypes = df.dtypes.astype(str) if dtypes is None else dtypes.where(dtypes == df.dtypes.astype(str), "object")
         
         file.write("================================================================")
         file.write(f"Info for sheet '{nom_feuille}':\n")
         
         #  Afficher les 5 premières lignes de la feuille
-        file.write(df.head().to_string() + "\n\n")
+        file.write(head.to_string() + "\n\n")
 
-        # Capture the DataFrame info into a string
-        buffer = io.StringIO()  # Create a buffer to hold the info output
-        df.info(buf=buffer)
-        
-        file.write(buffer.getvalue())  # Write the content of buffer to the file
+        # Equivalent of DataFrame.info(), aggregated over the chunks
+        info = pd.DataFrame({"Non-Null Count": non_null, "Dtype": dtypes})
+        file.write(f"{row_count} entries, {len(info)} columns\n")
+        file.write(info.to_string())
         file.write("\n\n")  # Separate outputs for each sheet
         
         # Confirmation de l'écriture dans le fichier
@@ -1,15 +1,40 @@
 """
 this script upload command eand production data into the sql database
 It considers the fk constraint
-make sure to run this script when both tables do not exist
+
+Two load modes are available:
+- full (default): drops and recreates the tables, then loads every row.
+  make sure to run this mode when both tables do not exist or can be replaced
+- incremental: diffs the workbook against the existing tables by primary key
+  and only applies the inserts/updates/deletes (see `incremental_load.py`),
+  the tables stay online during the import
+The tables are created from the ORM models of `app/models` and the identity primary keys are
+handled per dialect (see `app/database/schema.py`), so the loader runs on SQL Server,
+PostgreSQL and SQLite alike.
+In both modes the secondary indexes declared on the ORM models are created if missing,
+and the summary tables read by the KPI endpoints are rebuilt.
+
+Usage:
+    python save_sqldb.py [--mode full|incremental] [--file cleaned|Matis_Aerospace_cleaned.xlsx] [--db-url URL]
 """
 
+import argparse
+import time
+from typing import Iterable
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import select, text
 from sqlalchemy.exc import OperationalError
 from sqlalchemy import Integer
 from sqlalchemy import inspect
 from tabulate import tabulate
+from incremental_load import TableSpec, incremental_load
+import os
+from sheet_cache import CACHE_DIR, iter_sheet, read_column
+from app.database.database import make_engine
+from app.database.indexes import ensure_indexes
+from app.database.schema import align_frame, create_table, drop_tables, identity_insert, model_table
+from app.crud.crud_summary import rebuild_summaries
 
 # Paramètres de connexion SQL Server
 server = r'localhost\SQLEXPRESS'
@@ -19,6 +44,9 @@ password = '123456'
 
 fichier_excel = 'Matis_Aerospace_cleaned.xlsx'
 
+# Cleaned Parquet sheets written by clean_excel_file.py, loaded instead of the workbook when present
+default_source = CACHE_DIR if os.path.isdir(CACHE_DIR) else fichier_excel
+
 # Force ID_Commande to int in both DataFrames
 #df_commande['ID_Commande'] = df_commande['ID_Commande'].astype(int)
 #df_production['ID_Commande'] = df_production['ID_Commande'].astype(int)
@@ -29,250 +57,260 @@ connection_string = (
     "?driver=ODBC+Driver+17+for+SQL+Server"
 )
 
-# Création de l'engine SQLAlchemy
-engine = create_engine(connection_string)
-
-# Check if the table already exists
-inspector = inspect(engine)
-
-excel_file = pd.ExcelFile(fichier_excel)
-
-# Lecture des feuilles: Commande et Production
-df_commande = excel_file.parse('Commande')
-df_production = excel_file.parse('Production')
-df_equipe = excel_file.parse('Équipe')
-df_stock = excel_file.parse('Stock')
-
-# Keep only productions that have a valid commande
-valid_ids = set(df_commande['ID_Commande'])
-df_production = df_production[df_production['ID_Commande'].isin(valid_ids)]
-
-# Clean quantity and ID fields
-#df_production["ID_Production"] = df_production["ID_Production"].astype(int)
-#df_production["ID_Commande"] = df_production["ID_Commande"].astype(int)
-#df_production["Quantité"] = df_production["Quantité"].round().astype(int)
-#df_production["Temps_Production"] = df_production["Temps_Production"].round().astype(int)
-#df_commande["ID_Commande"] = df_commande["ID_Commande"].astype(int)
-#df_commande["Quantité"] = df_commande["Quantité"].round().astype(int)
-
-# Verify SQL connection before proceeding
-try:
-    with engine.connect() as connection:
-        # Try to execute a simple query (e.g., querying the list of tables)
-        result = connection.execute(text("SELECT 1"))
-        print("Connexion à la base de données SQL Server réussie.")
-except OperationalError as e:
-    print(f"Erreur de connexion: {e}")
-
-# Insertion dans l'ordre correct avec verification de l'existance (drop si c'est le cas)
-with engine.begin() as connection: #begin()=> auto-comit if success
-
-    # 0. drop table if exist
-    if 'Production' in inspector.get_table_names():
-        connection.execute(text("DROP TABLE Production"))
-        print("Table 'Production' dropped.")
-
-    if 'Commande' in inspector.get_table_names():
-        connection.execute(text("DROP TABLE Commande"))
-        print("Table 'Commande' dropped.")
-
-
-
-    # 1. Insérer les commandes d'abord (table "Commande")
-    # 1.1 Manually create the table with IDENTITY
-    connection.execute(text("""
-    CREATE TABLE Commande (
-        ID_Commande INT IDENTITY(1,1),
-        Client NVARCHAR(255),
-        Date_Commande DATE,
-        Produit_Commandé NVARCHAR(255),
-        Quantité INT,
-        Statut NVARCHAR(255)
-    )
-    """))
-    connection.execute(text("SET IDENTITY_INSERT Commande ON"))
-    df_commande.to_sql('Commande', con=connection, if_exists='append', index=False,
-                       dtype={'ID_Commande': Integer(),
-                              'Quantité': Integer()})
-    connection.execute(text("SET IDENTITY_INSERT Commande OFF"))
-    print(" Données insérées dans la table 'Connection' avec succès")
-
-    connection.execute(text("""
-    ALTER TABLE Commande
-    ALTER COLUMN ID_Commande INT NOT NULL
-    """))
-
-    # Add PRIMARY KEY on Commande
-    connection.execute(text("""
-        ALTER TABLE Commande
-        ADD CONSTRAINT pk_commande PRIMARY KEY (ID_Commande)
-    """))
-    print("Primary key constraint on Commande created.")
-
-    # 2. Puis insérer les productions (table "Production)")
-    # 2.1 Manually create the table with IDENTITY
-    connection.execute(text("""
-        CREATE TABLE Production (
-            ID_Production INT IDENTITY(1,1),
-            Date_Production DATE,
-            Produit NVARCHAR(255),
-            Quantité INT,
-            Statut NVARCHAR(255),
-            Prix_Unitaire FLOAT,
-            Coût_Production FLOAT,
-            Temps_Production FLOAT,
-            ID_Commande INT
-        )
-    """))
-    connection.execute(text("SET IDENTITY_INSERT Production ON"))
-    df_production.to_sql('Production', con= connection, if_exists='append', index=False,
-                         dtype={'ID_Commande': Integer(),
-                                'ID_Production': Integer(),
-                                'ID_Commande': Integer(),
-                                'Quantité': Integer(),
-                                'Temps_Production': Integer()})
-    connection.execute(text("SET IDENTITY_INSERT Production OFF"))
-    print(" Données insérées dans la table 'Production' avec succès")
-
-    connection.execute(text("""
-    ALTER TABLE Production
-    ALTER COLUMN ID_Production INT NOT NULL
-    """))
-
-    # Add PRIMARY KEY on Commande
-    connection.execute(text("""
-        ALTER TABLE Production
-        ADD CONSTRAINT pk_production PRIMARY KEY (ID_Production)
-    """))
-    print("Primary key constraint on Production created.")
-
-
-    # 3. Add the foreign key constraint
-    connection.execute(text("""
-        ALTER TABLE Production
-        ADD CONSTRAINT fk_production_commande
-        FOREIGN KEY (ID_Commande)
-        REFERENCES Commande(ID_Commande)
-    """))
-    print(" Foreign key constraint created.")
-
-    # 4. Fetch productions
-    result_prod = connection.execute(text("SELECT TOP 5 * FROM Production"))
-    productions = result_prod.fetchall()
-    print("\n=== Productions (TOP 5) ===")
-    production_columns= list(result_prod.keys())
-    prod_row_list=[]
-    for row in productions:
-        prod_row_list.append(list(row))
-    print(tabulate(prod_row_list, headers=production_columns, tablefmt='pretty'))
-
-    # 5. Fetch corresponding commandes for these productions
-    id_commande_index = production_columns.index('ID_Commande')
-    production_command_ids = [row[id_commande_index] for row in productions if row[id_commande_index] is not None]
-    
-    if production_command_ids:
-        placeholders = ", ".join([str(id) for id in production_command_ids])
-        query_commandes = text(f"""
-            SELECT * FROM Commande
-            WHERE ID_Commande IN ({placeholders})
-        """)
-        result_cmd = connection.execute(query_commandes)
-        commandes= result_cmd.fetchall()
-        commande_columns= list(result_cmd.keys())
-        
-        print("\n=== Corresponding Commandes ===")
-        cmd_row_list= []
-        for row in commandes:
-            cmd_row_list.append(list(row))
-        print(tabulate(cmd_row_list, headers=commande_columns, tablefmt='pretty'))   
+# Number of rows sent per insert batch
+CHUNK_SIZE = 10_000
+
+# Column types forced when writing each table
+TABLE_DTYPES = {
+    'Commande': {'ID_Commande': Integer(), 'Quantité': Integer()},
+    'Production': {'ID_Production': Integer(), 'ID_Commande': Integer(), 'Quantité': Integer(), 'Temps_Production': Integer()},
+    'Équipe': {'ID_Équipe': Integer(), 'Effectif': Integer(), 'Nombre_Heures_travaillées': Integer()},
+    'Stock': {'ID_Stock': Integer(), 'Quantité_Disponible': Integer()},
+}
+
+# Tables chargées, dans l'ordre des clés étrangères (parents d'abord)
+TABLES = [
+    TableSpec("Commande", "ID_Commande", TABLE_DTYPES['Commande']),
+    TableSpec("Production", "ID_Production", TABLE_DTYPES['Production']),
+    TableSpec("Équipe", "ID_Équipe", TABLE_DTYPES['Équipe']),
+    TableSpec("Stock", "ID_Stock", TABLE_DTYPES['Stock']),
+]
+
+def read_sheets(path: str) -> dict:
+    """
+    Read the Commande, Production, Équipe and Stock sheets and apply the loading rules.
+
+    The data cleaning (numeric fields, team availability) is done beforehand by `clean_excel_file.py`.
+    The columns are renamed to the column names of the models (see `align_frame`).
+
+    The sheets are streamed from the Parquet sheet cache or the workbook (see `sheet_cache.py`):
+    apart from the commande IDs used by the foreign key filter, rows are only read when the
+    chunks are consumed, one chunk per table at a time.
+
+    Args:
+        path (str): Sheet cache directory or path of the cleaned Excel workbook.
+
+    Returns:
+        dict[str, Iterator[pd.DataFrame]]: One iterator of DataFrame chunks per table name.
+    """
+    # Keep only productions that have a valid commande
+    valid_ids = read_column(path, 'Commande', 'ID_Commande')
+
+    def sheet(name: str):
+        table = model_table(name)
+        for df in iter_sheet(path, name):
+            yield align_frame(table, df)
+
+    def productions():
+        for df_production in sheet('Production'):
+            yield df_production[df_production['ID_Commande'].isin(valid_ids)]
+
+    # Clean quantity and ID fields
+    #df_production["ID_Production"] = df_production["ID_Production"].astype(int)
+    #df_production["ID_Commande"] = df_production["ID_Commande"].astype(int)
+    #df_production["Quantité"] = df_production["Quantité"].round().astype(int)
+    #df_production["Temps_Production"] = df_production["Temps_Production"].round().astype(int)
+    #df_commande["ID_Commande"] = df_commande["ID_Commande"].astype(int)
+    #df_commande["Quantité"] = df_commande["Quantité"].round().astype(int)
+
+    return {'Commande': sheet('Commande'), 'Production': productions(),
+            'Équipe': sheet('Équipe'), 'Stock': sheet('Stock')}
+
+def check_connection(engine):
+    """
+    Verify SQL connection before proceeding.
+    """
+    try:
+        with engine.connect() as connection:
+            # Try to execute a simple query (e.g., querying the list of tables)
+            result = connection.execute(text("SELECT 1"))
+            print(f"Connexion à la base de données ({engine.dialect.name}) réussie.")
+    except OperationalError as e:
+        print(f"Erreur de connexion: {e}")
+
+def insert_chunks(connection, table: str, chunks: Iterable[pd.DataFrame], dtype: dict) -> dict:
+    """
+    Append DataFrame chunks to a table in batches and measure the throughput.
+
+    On SQL Server the batches are sent with pyodbc `fast_executemany` (see `make_engine`),
+    other dialects use multi-row INSERT ... VALUES statements.
+
+    Args:
+        connection (Connection): Open connection, inside the loading transaction.
+        table (str): Target table name.
+        chunks (Iterable[pd.DataFrame]): Rows to insert, columns named as in the database.
+        dtype (dict): Column types passed to `DataFrame.to_sql`.
+
+    Returns:
+        dict: `rows` inserted, elapsed `seconds` and `rows_per_sec`.
+    """
+    method = None if connection.dialect.name == "mssql" else "multi"
+    rows = 0
+    start = time.perf_counter()
+    for df in chunks:
+        # SQLite accepts at most 999 bound parameters per statement with multi-row inserts
+        chunksize = CHUNK_SIZE if method is None else max(1, min(CHUNK_SIZE, 999 // max(1, len(df.columns))))
+        df.to_sql(table, con=connection, if_exists='append', index=False, dtype=dtype,
+                  chunksize=chunksize, method=method)
+        rows += len(df)
+    seconds = time.perf_counter() - start
+    return {"rows": rows, "seconds": seconds, "rows_per_sec": rows / seconds if seconds else float("inf")}
+
+def _recreate_tables(connection, names: list[str]):
+    """
+    Drop the given tables if they exist and create them again from the ORM models,
+    without their secondary indexes (built by `ensure_indexes` once the rows are loaded).
+    """
+    tables = [model_table(name) for name in names]
+    for name in drop_tables(connection, tables):
+        print(f"Table '{name}' dropped.")
+    for table in tables:
+        create_table(connection, table)
+
+def _preview(connection, table_name: str, *conditions, limit: int = 5):
+    """
+    Print the first rows of a table (TOP / LIMIT depending on the dialect) and return them with their columns.
+    """
+    table = model_table(table_name)
+    result = connection.execute(select(table).where(*conditions).limit(limit))
+    rows = result.fetchall()
+    columns = list(result.keys())
+    print(tabulate([list(row) for row in rows], headers=columns, tablefmt='pretty'))
+    return rows, columns
+
+def load_commande_production(engine, df_commande: Iterable[pd.DataFrame], df_production: Iterable[pd.DataFrame]) -> dict:
+    """
+    Drop, recreate and reload the Commande and Production tables, in foreign key order.
+
+    Returns:
+        dict[str, dict]: Insert statistics per table (see `insert_chunks`).
+    """
+    stats = {}
+    with engine.begin() as connection: #begin()=> auto-comit if success
+
+        # 0. drop the tables if they exist (Production first) and recreate them from the models,
+        # with their primary keys and the Production -> Commande foreign key
+        _recreate_tables(connection, ['Commande', 'Production'])
+
+        # 1. Insérer les commandes d'abord (table "Commande")
+        with identity_insert(connection, 'Commande'):
+            stats['Commande'] = insert_chunks(connection, 'Commande', df_commande, TABLE_DTYPES['Commande'])
+        print(" Données insérées dans la table 'Commande' avec succès")
+
+        # 2. Puis insérer les productions (table "Production)")
+        with identity_insert(connection, 'Production'):
+            stats['Production'] = insert_chunks(connection, 'Production', df_production, TABLE_DTYPES['Production'])
+        print(" Données insérées dans la table 'Production' avec succès")
+
+        # 3. Fetch productions
+        print("\n=== Productions (TOP 5) ===")
+        productions, production_columns = _preview(connection, 'Production')
+
+        # 4. Fetch corresponding commandes for these productions
+        id_commande_index = production_columns.index('ID_Commande')
+        production_command_ids = [row[id_commande_index] for row in productions if row[id_commande_index] is not None]
+
+        if production_command_ids:
+            print("\n=== Corresponding Commandes ===")
+            _preview(connection, 'Commande', model_table('Commande').c.ID_Commande.in_(production_command_ids))
+        else:
+            print("\n No corresponding Commande IDs found in productions.")
+    return stats
+
+def load_equipe(engine, df_equipe: Iterable[pd.DataFrame]) -> dict:
+    """
+    Drop, recreate and reload the Équipe table.
+
+    Returns:
+        dict[str, dict]: Insert statistics for the table (see `insert_chunks`).
+    """
+    with engine.begin() as connection:
+        _recreate_tables(connection, ['Équipe'])
+        with identity_insert(connection, 'Équipe'):
+            stats = insert_chunks(connection, 'Équipe', df_equipe, TABLE_DTYPES['Équipe'])
+        print("Données insérées dans la table 'Équipe' avec succès.")
+
+        # Optional: Preview top 5 équipes
+        print("\n=== Équipe (TOP 5) ===")
+        _preview(connection, 'Équipe')
+    return {'Équipe': stats}
+
+def load_stock(engine, df_stock: Iterable[pd.DataFrame]) -> dict:
+    """
+    Drop, recreate and reload the Stock table.
+
+    Returns:
+        dict[str, dict]: Insert statistics for the table (see `insert_chunks`).
+    """
+    with engine.begin() as connection:
+        _recreate_tables(connection, ['Stock'])
+        with identity_insert(connection, 'Stock'):
+            stats = insert_chunks(connection, 'Stock', df_stock, TABLE_DTYPES['Stock'])
+        print("Données insérées dans la table 'Stock' avec succès.")
+
+        # Optional: Preview top 5 stock entries
+        print("\n=== Stock (TOP 5) ===")
+        _preview(connection, 'Stock')
+    return {'Stock': stats}
+
+def full_load(engine, sheets: dict) -> dict:
+    """
+    Drop, recreate and fully reload the Commande, Production, Équipe and Stock tables.
+
+    The independent tables (Équipe, Stock) are loaded concurrently with the
+    Commande -> Production chain, each group in its own connection and transaction.
+    On SQLite, which allows a single writer, the groups are loaded one after the other.
+
+    Args:
+        engine (Engine): SQLAlchemy engine of the target database.
+        sheets (dict[str, Iterator[pd.DataFrame]]): DataFrame chunks returned by `read_sheets`.
+
+    Returns:
+        dict[str, dict]: Insert statistics per table (see `insert_chunks`).
+    """
+    with ThreadPoolExecutor(max_workers=1 if engine.dialect.name == "sqlite" else 3) as executor:
+        futures = [
+            executor.submit(load_commande_production, engine, sheets['Commande'], sheets['Production']),
+            executor.submit(load_equipe, engine, sheets['Équipe']),
+            executor.submit(load_stock, engine, sheets['Stock']),
+        ]
+        stats = {}
+        for future in futures:
+            stats.update(future.result())
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load the cleaned Excel workbook into the SQL database.")
+    parser.add_argument("--mode", choices=["full", "incremental"], default="full",
+                        help="full: drop and reload every table (default), incremental: only apply the differences")
+    parser.add_argument("--file", default=default_source,
+                        help="cleaned sheet cache directory or Excel workbook to load (default: the cache if it exists)")
+    parser.add_argument("--db-url", default=os.getenv("DB_URL") or connection_string,
+                        help="SQLAlchemy URL of the target database (default: DB_URL, else the SQL Server instance above)")
+    args = parser.parse_args(argv)
+
+    # Création de l'engine SQLAlchemy
+    engine = make_engine(args.db_url)
+    check_connection(engine)
+
+    sheets = read_sheets(args.file)
+
+    if args.mode == "incremental":
+        counts = incremental_load(engine, TABLES, sheets)
+        print(tabulate([[table, c['inserted'], c['updated'], c['deleted']] for table, c in counts.items()],
+                       headers=['Table', 'Inserted', 'Updated', 'Deleted'], tablefmt='pretty'))
     else:
-        print("\n No corresponding Commande IDs found in productions.")
-
-######################## équipe
-    if 'Équipe' in inspector.get_table_names():
-        connection.execute(text("DROP TABLE Équipe"))
-        print("Table 'Équipe' dropped.")
-
-        df_equipe.loc[df_equipe['Effectif'] <= 1, ['Nombre_Heures_Travaillées', 'Effectif']] = 0
-        df_equipe.loc[df_equipe['Effectif'] <= 1, 'Disponibilité'] = 'Occupé'
-
-    connection.execute(text("""
-        CREATE TABLE Équipe (
-            ID_Équipe INT IDENTITY(1,1),
-            Nom_Équipe NVARCHAR(255),
-            Chef_Équipe NVARCHAR(255),
-            Effectif INT,
-            Nombre_Heures_Travaillées INT,
-            Disponibilité NVARCHAR(50)
-        )
-    """))
-    connection.execute(text("SET IDENTITY_INSERT Équipe ON"))
-    df_equipe.to_sql('Équipe', con=connection, if_exists='append', index=False,
-                     dtype={
-                         'ID_Équipe': Integer(),
-                         'Effectif': Integer(),
-                         'Nombre_Heures_Travaillées': Integer()
-                     })
-    connection.execute(text("SET IDENTITY_INSERT Équipe OFF"))
-    print("Données insérées dans la table 'Équipe' avec succès.")
-
-    connection.execute(text("""
-        ALTER TABLE Équipe
-        ALTER COLUMN ID_Équipe INT NOT NULL
-    """))
-
-    connection.execute(text("""
-        ALTER TABLE Équipe
-        ADD CONSTRAINT pk_equipe PRIMARY KEY (ID_Équipe)
-    """))
-    print("Primary key constraint on Équipe created.")
-
-    ######################## Stock
-    if 'Stock' in inspector.get_table_names():
-        connection.execute(text("DROP TABLE Stock"))
-        print("Table 'Stock' dropped.")
-
-    connection.execute(text("""
-        CREATE TABLE Stock (
-            ID_Stock INT IDENTITY(1,1),
-            Produit NVARCHAR(255),
-            Quantité_Disponible INT,
-            Lieu_Stockage NVARCHAR(255),
-            Type_Matière NVARCHAR(255),
-            Mise_à_Jour DATETIME
-        )
-    """))
-    connection.execute(text("SET IDENTITY_INSERT Stock ON"))
-    df_stock.to_sql('Stock', con=connection, if_exists='append', index=False,
-                    dtype={
-                        'ID_Stock': Integer(),
-                        'Quantité_Disponible': Integer()
-                    })
-    connection.execute(text("SET IDENTITY_INSERT Stock OFF"))
-    print("Données insérées dans la table 'Stock' avec succès.")
-
-    connection.execute(text("""
-        ALTER TABLE Stock
-        ALTER COLUMN ID_Stock INT NOT NULL
-    """))
-
-    connection.execute(text("""
-        ALTER TABLE Stock
-        ADD CONSTRAINT pk_stock PRIMARY KEY (ID_Stock)
-    """))
-    print("Primary key constraint on Stock created.")
-
-    # Optional: Preview top entries
-    # Preview top 5 équipes
-    result_eq = connection.execute(text("SELECT TOP 5 * FROM Équipe"))
-    equipes = result_eq.fetchall()
-    equipe_columns = list(result_eq.keys())
-    print("\n=== Équipe (TOP 5) ===")
-    print(tabulate([list(row) for row in equipes], headers=equipe_columns, tablefmt='pretty'))
-
-    # Preview top 5 stock entries
-    result_stock = connection.execute(text("SELECT TOP 5 * FROM Stock"))
-    stocks = result_stock.fetchall()
-    stock_columns = list(result_stock.keys())
-    print("\n=== Stock (TOP 5) ===")
-    print(tabulate([list(row) for row in stocks], headers=stock_columns, tablefmt='pretty'))
+        stats = full_load(engine, sheets)
+        print(tabulate([[table, s['rows'], f"{s['seconds']:.2f}", f"{s['rows_per_sec']:.0f}"] for table, s in stats.items()],
+                       headers=['Table', 'Rows', 'Seconds', 'Rows/sec'], tablefmt='pretty'))
+
+    # Secondary indexes declared on the models, built once the rows are loaded
+    created = ensure_indexes(engine)
+    print(f"Index créés: {', '.join(created)}" if created else "Tous les index existent déjà.")
+
+    # Summary tables read by the KPI endpoints, recomputed from the loaded rows
+    summary_counts = rebuild_summaries(engine)
+    print(tabulate(list(summary_counts.items()), headers=['Summary table', 'Rows'], tablefmt='pretty'))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Parquet cache of the cleaned sheets, written by `clean_excel_file.py` and read by `save_sqldb.py` and `read_excel.py`.
+
+Each cleaned sheet is stored under `<cache_dir>/<sheet>/` as one Parquet file per chunk,
+and `<cache_dir>/manifest.json` records the sheet order and the fingerprint of the input
+each sheet was cleaned from. A sheet whose fingerprint did not change is not cleaned again.
+
+Unchanged input sheets are detected in two steps: first a hash of the raw XML parts of the
+workbook (the sheet itself, the shared strings and the styles), which needs no parsing; when
+it changed, a hash of the parsed values, as saving a workbook again rewrites the shared parts.
+
+`iter_sheet`, `sheet_names` and `read_column` accept either a cache directory or an Excel
+workbook, so the consumers can read both sources through the same calls.
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import shutil
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Iterable, Iterator, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import excel_stream
+
+# Default location of the cleaned sheets
+CACHE_DIR = "cleaned"
+
+MANIFEST_FILE = "manifest.json"
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+#----------------------------- FINGERPRINTS ---------------------------------
+def workbook_fingerprints(path: str) -> dict:
+    """
+    Compute a content hash per sheet of an Excel workbook, without parsing the rows.
+
+    Args:
+        path (str): Path of the Excel workbook.
+
+    Returns:
+        dict[str, str]: Hex digest per sheet name, in workbook order.
+    """
+    with zipfile.ZipFile(path) as archive:
+        names = set(archive.namelist())
+        workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+        rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{_PKG_REL_NS}Relationship")}
+
+        # Cell values may reference shared strings and number formats (dates)
+        common = hashlib.blake2b(digest_size=16)
+        for part in ("xl/sharedStrings.xml", "xl/styles.xml"):
+            if part in names:
+                common.update(archive.read(part))
+
+        fingerprints = {}
+        for sheet in workbook.iter(f"{_MAIN_NS}sheet"):
+            target = targets[sheet.get(_REL_ID)]
+            part = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+            digest = common.copy()
+            with archive.open(part) as stream:
+                for block in iter(lambda: stream.read(1 << 20), b""):
+                    digest.update(block)
+            fingerprints[sheet.get("name")] = digest.hexdigest()
+    return fingerprints
+
+def content_fingerprint(path: str, sheet: str) -> str:
+    """
+    Compute a hash of the values of a sheet, reading its rows in chunks.
+
+    Unlike `workbook_fingerprints`, the result does not change when the workbook is saved
+    again without changing the values of this sheet.
+
+    Args:
+        path (str): Path of the Excel workbook.
+        sheet (str): Sheet name.
+
+    Returns:
+        str: Hex digest of the column names and values.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in excel_stream.iter_sheet(path, sheet):
+        digest.update("\0".join(map(str, chunk.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(chunk, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def combine(*parts: str) -> str:
+    """
+    Combine several fingerprints (or any strings) into one.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+#----------------------------- MANIFEST ---------------------------------
+def load_manifest(cache_dir: str = CACHE_DIR) -> dict:
+    """
+    Read the cache manifest.
+
+    Returns:
+        dict: `sheets` (ordered sheet names), `inputs` (raw and content hashes of each input sheet)
+        and `fingerprints` (of each cleaned sheet), empty if the cache does not exist.
+    """
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_FILE), encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {"sheets": [], "inputs": {}, "fingerprints": {}}
+
+def save_manifest(manifest: dict, cache_dir: str = CACHE_DIR) -> None:
+    """
+    Write the cache manifest atomically.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = os.path.join(cache_dir, MANIFEST_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(cache_dir, MANIFEST_FILE))
+
+def is_fresh(manifest: dict, sheet: str, fingerprint: str, cache_dir: str = CACHE_DIR) -> bool:
+    """
+    Tell whether the cached sheet was produced from the input with this fingerprint.
+    """
+    return manifest["fingerprints"].get(sheet) == fingerprint and os.path.isdir(_sheet_dir(cache_dir, sheet))
+
+#----------------------------- WRITE ---------------------------------
+def _sheet_dir(cache_dir: str, sheet: str) -> str:
+    return os.path.join(cache_dir, sheet)
+
+def write_sheet(sheet: str, chunks: Iterable[pd.DataFrame], cache_dir: str = CACHE_DIR) -> int:
+    """
+    Store the chunks of a cleaned sheet, replacing the previous version once every chunk is written.
+
+    Args:
+        sheet (str): Sheet name.
+        chunks (Iterable[pd.DataFrame]): Cleaned rows.
+        cache_dir (str): Cache directory.
+
+    Returns:
+        int: Number of rows written.
+    """
+    target = _sheet_dir(cache_dir, sheet)
+    tmp_dir = target + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    rows = 0
+    for i, chunk in enumerate(chunks):
+        pq.write_table(pa.Table.from_pandas(chunk, preserve_index=False), os.path.join(tmp_dir, f"part-{i:05d}.parquet"))
+        rows += len(chunk)
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp_dir, target)
+    return rows
+
+#----------------------------- READ ---------------------------------
+def _is_cache(source: str) -> bool:
+    return os.path.isdir(source)
+
+def sheet_names(source: str) -> list[str]:
+    """
+    List the sheets of a cache directory or of an Excel workbook.
+    """
+    if _is_cache(source):
+        return list(load_manifest(source)["sheets"])
+    return excel_stream.sheet_names(source)
+
+def iter_sheet(source: str, sheet: str, usecols: Optional[list[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Iterate over a sheet as DataFrame chunks, from a cache directory or an Excel workbook.
+
+    Args:
+        source (str): Cache directory or Excel workbook path.
+        sheet (str): Name of the sheet to read.
+        usecols (Optional[list[str]]): Only keep these columns.
+
+    Yields:
+        pd.DataFrame: The next chunk of rows.
+
+    Raises:
+        KeyError: If the sheet is not in the source.
+    """
+    if not _is_cache(source):
+        yield from excel_stream.iter_sheet(source, sheet, usecols=usecols)
+        return
+
+    sheet_dir = _sheet_dir(source, sheet)
+    if sheet not in load_manifest(source)["sheets"] or not os.path.isdir(sheet_dir):
+        raise KeyError(f"Sheet '{sheet}' not found in cache '{source}'")
+    for part in sorted(os.listdir(sheet_dir)):
+        yield pq.read_table(os.path.join(sheet_dir, part), columns=usecols).to_pandas()
+
+def read_column(source: str, sheet: str, column: str) -> set:
+    """
+    Collect the distinct non-null values of one column, from a cache directory or an Excel workbook.
+    """
+    if not _is_cache(source):
+        return excel_stream.read_column(source, sheet, column)
+    values = set()
+    for chunk in iter_sheet(source, sheet, usecols=[column]):
+        values.update(chunk[column].dropna().tolist())
+    return values